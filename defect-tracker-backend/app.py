@@ -3,7 +3,6 @@ import datetime
 
 from flask import Flask, g, request, redirect
 from flask_cors import CORS
-from flask_migrate import Migrate
 from dotenv import load_dotenv  
 from flask_jwt_extended import (
     JWTManager,
@@ -12,30 +11,35 @@ from flask_jwt_extended import (
 )
 from sqlalchemy.orm import joinedload  
 
-from models import User, db, bcrypt, mail  
-
-# Blueprints
-from endpoints.user import user_bp  
-from endpoints.customers import customer_bp  
-from endpoints.products import product_bp  
-from endpoints.services import service_bp
-from endpoints.returns import return_case_bp  
-from endpoints.admin import admin_bp  
-from endpoints.reports import reports_bp  
-from endpoints.user_action_logs import user_action_logs_bp
-
-# Seed functions
-from seed import seed_roles_permissions, seed_services
-from seed import seed_users
+from models import User, db  
+from services.password_service import password_service, login_rate_limiter
+from services.report_jobs import report_job_runner
+from services.request_coalescer import request_coalescer
+from services.permission_cache import role_permission_cache
+from services.catalog import reference_catalog
+from services.customer_index import customer_index
+from services.case_detail_cache import case_detail_cache
+from services.event_bus import event_bus
+from services.invalidation import invalidation_bus
+from services.case_events import CaseEventService, case_event_streams
+from db_routing import REPLICA_BIND, replica_router
+from compression import response_compressor
+from serializers import FastJSONProvider
 
 load_dotenv()
 
 def create_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Database Config
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URI')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Optional read replica for reports and list endpoints (see db_routing.py)
+    if os.getenv('DATABASE_REPLICA_URI'):
+        app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: os.getenv('DATABASE_REPLICA_URI')}
+    app.config['REPLICA_READ_YOUR_WRITES_SECONDS'] = int(os.getenv('REPLICA_READ_YOUR_WRITES_SECONDS', 60))
+    app.config['REPLICA_HEALTH_CHECK_SECONDS'] = int(os.getenv('REPLICA_HEALTH_CHECK_SECONDS', 5))
 
     # JWT Config
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')  
@@ -52,6 +56,44 @@ def create_app():
     app.config['JWT_COOKIE_CSRF_PROTECT'] = os.getenv('JWT_COOKIE_CSRF_PROTECT', 'False').lower() == 'true'
     app.config['JWT_COOKIE_DOMAIN'] = os.getenv('JWT_COOKIE_DOMAIN', None)
 
+    # Password hashing / login throttling
+    app.config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    app.config['BCRYPT_POOL_SIZE'] = int(os.getenv('BCRYPT_POOL_SIZE', 2))  # 0 = hash on the request thread
+    app.config['LOGIN_MAX_FAILED_ATTEMPTS'] = int(os.getenv('LOGIN_MAX_FAILED_ATTEMPTS', 5))
+    app.config['LOGIN_LOCKOUT_SECONDS'] = int(os.getenv('LOGIN_LOCKOUT_SECONDS', 300))
+    app.config['PERMISSION_CACHE_SECONDS'] = int(os.getenv('PERMISSION_CACHE_SECONDS', 300))
+    app.config['CATALOG_CACHE_SECONDS'] = int(os.getenv('CATALOG_CACHE_SECONDS', 300))
+    app.config['CATALOG_MISS_RELOAD_SECONDS'] = int(os.getenv('CATALOG_MISS_RELOAD_SECONDS', 5))
+    app.config['CASE_DETAIL_CACHE_SIZE'] = int(os.getenv('CASE_DETAIL_CACHE_SIZE', 512))  # cases per worker, 0 = off
+
+    # Long-range reports run as background jobs (see services/report_jobs.py)
+    app.config['REPORT_INLINE_MAX_DAYS'] = int(os.getenv('REPORT_INLINE_MAX_DAYS', 366))
+    app.config['REPORT_INLINE_STATEMENT_TIMEOUT_MS'] = int(os.getenv('REPORT_INLINE_STATEMENT_TIMEOUT_MS', 30000))
+    app.config['REPORT_JOB_WORKERS'] = int(os.getenv('REPORT_JOB_WORKERS', 2))
+    app.config['REPORT_JOB_STATEMENT_TIMEOUT_MS'] = int(os.getenv('REPORT_JOB_STATEMENT_TIMEOUT_MS', 120000))
+    app.config['REPORT_JOB_TTL_SECONDS'] = int(os.getenv('REPORT_JOB_TTL_SECONDS', 3600))
+    app.config['REPORT_JOB_HEARTBEAT_SECONDS'] = int(os.getenv('REPORT_JOB_HEARTBEAT_SECONDS', 10))
+    app.config['REPORT_JOB_DIR'] = os.getenv('REPORT_JOB_DIR')
+    # Identical concurrent report requests share one execution (services/request_coalescer.py)
+    app.config['REPORT_COALESCE_WAIT_SECONDS'] = int(os.getenv('REPORT_COALESCE_WAIT_SECONDS', 30))
+    app.config['REPORT_COALESCE_RESULT_SECONDS'] = int(os.getenv('REPORT_COALESCE_RESULT_SECONDS', 30))
+
+    # Live case events (GET /returns/events); NOTIFY on Postgres, in-process otherwise
+    app.config['EVENT_QUEUE_SIZE'] = int(os.getenv('EVENT_QUEUE_SIZE', 256))
+    app.config['SSE_HEARTBEAT_SECONDS'] = int(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+    app.config['SSE_MAX_STREAM_SECONDS'] = int(os.getenv('SSE_MAX_STREAM_SECONDS', 300))
+    # Each stream holds a gthread thread; keep this well below GUNICORN_THREADS (Procfile)
+    app.config['SSE_MAX_STREAMS'] = int(os.getenv('SSE_MAX_STREAMS', 8))
+    app.config['SSE_RETRY_AFTER_SECONDS'] = int(os.getenv('SSE_RETRY_AFTER_SECONDS', 30))
+
+    # Per-worker caches are dropped everywhere on invalidate (services/invalidation.py);
+    # the stored versions are re-checked this often in case a notification was lost
+    app.config['INVALIDATION_CHECK_SECONDS'] = int(os.getenv('INVALIDATION_CHECK_SECONDS', 30))
+
+    # gzip/brotli for JSON, CSV and the SSE stream; see compression.py
+    app.config['COMPRESS_RESPONSES'] = os.getenv('COMPRESS_RESPONSES', 'True').lower() == 'true'
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+
     # Email Config
     app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER')
     app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', '465'))
@@ -63,10 +105,29 @@ def create_app():
 
     # Init extensions
     db.init_app(app)
-    bcrypt.init_app(app)
+    password_service.init_app(app)
+    login_rate_limiter.init_app(app)
+    role_permission_cache.init_app(app)
+    reference_catalog.init_app(app)
+    customer_index.init_app(app)
+    case_detail_cache.init_app(app)
+    report_job_runner.init_app(app)
+    request_coalescer.init_app(app)
+    replica_router.init_app(app)
+    event_bus.init_app(app)
+    invalidation_bus.init_app(app)
+    response_compressor.init_app(app)
+    CaseEventService.init_app(app)
+    case_event_streams.init_app(app)
+    from flask_migrate import Migrate  # pulls in alembic, only needed by `flask db`
     Migrate(app, db) 
     JWTManager(app)  
-    mail.init_app(app)        
+
+    # Flask-Mail is only needed when an SMTP server is configured; transactional
+    # emails go through ReSend (see services/email_service.py)
+    if app.config['MAIL_SERVER']:
+        from flask_mail import Mail
+        Mail(app)
 
     frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
     allowed_origins = [
@@ -78,8 +139,8 @@ def create_app():
         supports_credentials=True,
         resources={r"/*": {"origins": allowed_origins}},
         methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'],
-        allowed_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
-        expose_headers=['Set-Cookie'],
+        allowed_headers=['Content-Type', 'Authorization', 'X-Requested-With', 'If-Match'],
+        expose_headers=['Set-Cookie', 'ETag'],
         allow_credentials=True
     )
 
@@ -107,6 +168,18 @@ def create_app():
         except Exception:
             g.user = None
     
+    # Blueprints are imported here rather than at module level so that
+    # importing this module (gunicorn, flask CLI, scripts) stays cheap
+    from endpoints.user import user_bp  
+    from endpoints.customers import customer_bp  
+    from endpoints.products import product_bp  
+    from endpoints.services import service_bp
+    from endpoints.returns import return_case_bp  
+    from endpoints.admin import admin_bp  
+    from endpoints.reports import reports_bp  
+    from endpoints.user_action_logs import user_action_logs_bp
+    from endpoints.catalog import catalog_bp
+
     # Register blueprints
     app.register_blueprint(user_bp)
     app.register_blueprint(customer_bp)
@@ -116,26 +189,46 @@ def create_app():
     app.register_blueprint(admin_bp)
     app.register_blueprint(reports_bp)
     app.register_blueprint(user_action_logs_bp)
+    app.register_blueprint(catalog_bp)
     
     app.url_map.strict_slashes = False
 
 
     return app
 
-app = create_app()
 
-# Auto-seed on startup (optional - remove if you prefer manual seeding)
-with app.app_context():
-    try:
-        seed_roles_permissions()
-        seed_users()
-        seed_services()
-        print("✅ Database seeded successfully")
-    except Exception as e:
-        print(f"⚠️  Seeding failed (this is normal if data already exists): {e}")
+def seed_database(app):
+    """Auto-seed on startup (optional - remove if you prefer manual seeding)"""
+    from seed import seed_roles_permissions, seed_services, seed_users
+
+    with app.app_context():
+        try:
+            seed_roles_permissions()
+            seed_users()
+            seed_services()
+            print("✅ Database seeded successfully")
+        except Exception as e:
+            print(f"⚠️  Seeding failed (this is normal if data already exists): {e}")
+
+
+_app = None
+
+def get_app():
+    """Build and seed the application once per process."""
+    global _app
+    if _app is None:
+        _app = create_app()
+        seed_database(_app)
+    return _app
+
+def __getattr__(name):
+    # Module-level `app` for the Procfile entry point (`gunicorn app:app`).
+    # It is built on first access instead of at import time.
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
+    app = get_app()
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     app.run(host="0.0.0.0", port=int(os.getenv('PORT', 5000)), debug=debug_mode)
-
-
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark: payload size and CPU time of response compression.
+
+Encodes three typical large payloads the way the app does (serializers +
+FastJSONProvider) and compresses each with gzip and brotli (when
+installed) at several levels, one request at a time:
+
+- /returns           50 cases per page, 2 items with 3 services each
+- returns-breakdown  a year by week x product type x customer (dense)
+- /user-action-logs  100 log rows per page
+
+The levels in compression.COMPRESS_LEVELS should sit at the knee of the
+size/time curve. Objects are transient; no database needed.
+
+Usage:
+    python benchmarks/compression.py --repeat 20
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from compression import ResponseCompressor, brotli
+from serializers import FastJSONProvider, serialize_return_case
+from serialize_cases import build_cases
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6)
+
+
+def returns_page():
+    return {"cases": [serialize_return_case(c) for c in build_cases(50)], "totalPages": 20, "currentPage": 1}
+
+
+def breakdown_year():
+    weeks = [(datetime(2025, 1, 6) + timedelta(weeks=i)).strftime("%Y-%m-%d") for i in range(52)]
+    product_types = ["Aşırı Yük Sensörü", "Fotosel", "Kontrol Ünitesi"]
+    customers = [(i, f"Müşteri {i} Asansör San. Tic. Ltd. Şti.") for i in range(40)]
+    return {
+        "group_unit": "week",
+        "data": [
+            {"period": week, "product_type": pt, "customer_id": cid, "customer_name": name,
+             "item_count": (i * 7 + cid) % 5, "case_count": (i + cid) % 3}
+            for i, week in enumerate(weeks) for pt in product_types for cid, name in customers
+        ],
+    }
+
+
+def action_log_page():
+    started = datetime(2025, 3, 1, 9, 0)
+    return {
+        "logs": [
+            {"id": i, "user_email": f"user{i % 7}@centa.com.tr", "user_name": f"Kullanıcı {i % 7}",
+             "return_case_id": 1000 + i // 3, "action_type": "Teknik İnceleme Tamamlandı",
+             "additional_info": f"Vaka #{1000 + i // 3} teknik inceleme aşaması tamamlandı",
+             "created_at": (started + timedelta(minutes=17 * i)).isoformat() + "Z"}
+            for i in range(100)
+        ],
+        "totalPages": 50, "currentPage": 1,
+    }
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    provider = FastJSONProvider(Flask(__name__))
+    payloads = {
+        "/returns (50 cases)": returns_page(),
+        "returns-breakdown (dense year)": breakdown_year(),
+        "/user-action-logs (100 rows)": action_log_page(),
+    }
+
+    settings = [("gzip", level, (level, 0)) for level in GZIP_LEVELS]
+    if brotli is not None:
+        settings += [("br", quality, (0, quality)) for quality in BROTLI_QUALITIES]
+    else:
+        print("brotli not installed, gzip only")
+
+    for name, payload in payloads.items():
+        body = provider.dumps(payload).encode("utf-8")
+        print(f"\n{name}: {len(body) / 1024:.0f} KiB uncompressed")
+        for encoding, level, levels in settings:
+            elapsed, compressed = best_of(lambda: ResponseCompressor.compress(body, encoding, levels), args.repeat)
+            print(f"  {encoding:<4} {level:>2}   {len(compressed) / 1024:>7.1f} KiB  "
+                  f"{len(body) / len(compressed):>5.1f}x   {elapsed * 1000:>6.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark: format 10,000 admin-table rows (three timestamps each).
+
+Compares the old strftime("%d %b %Y %H:%M") + 12 x str.replace chain with
+date_format.format_tr_datetime, checks both agree under the C locale, and
+shows what the old chain produced under a Turkish locale when one is
+installed.
+
+Usage:
+    python benchmarks/date_format.py --rows 10000 --repeat 5
+"""
+import argparse
+import locale
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from date_format import format_iso_utc, format_tr_datetime
+
+
+def legacy_format(value):
+    if not value:
+        return None
+    return (
+        value.strftime("%d %b %Y %H:%M")
+        .replace("Jan", "Oca")
+        .replace("Feb", "Şub")
+        .replace("Mar", "Mar")
+        .replace("Apr", "Nis")
+        .replace("May", "May")
+        .replace("Jun", "Haz")
+        .replace("Jul", "Tem")
+        .replace("Aug", "Ağu")
+        .replace("Sep", "Eyl")
+        .replace("Oct", "Eki")
+        .replace("Nov", "Kas")
+        .replace("Dec", "Ara")
+    )
+
+
+def build_rows(n):
+    random.seed(7)
+    start = datetime(2023, 1, 1)
+    return [
+        tuple(start + timedelta(minutes=random.randint(0, 3 * 365 * 24 * 60)) for _ in range(3))
+        for _ in range(n)
+    ]
+
+
+def best_of(fn, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = [(fn(a), fn(b), fn(c)) for a, b, c in rows]
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    locale.setlocale(locale.LC_TIME, "C")
+
+    legacy_time, legacy_result = best_of(legacy_format, rows, args.repeat)
+    table_time, table_result = best_of(format_tr_datetime, rows, args.repeat)
+    iso_time, _ = best_of(format_iso_utc, rows, args.repeat)
+    assert legacy_result == table_result, "formatters disagree under the C locale"
+
+    fields = args.rows * 3
+    print(f"{args.rows} rows x 3 timestamps, best of {args.repeat}")
+    print(f"strftime + replace chain   {legacy_time * 1000:>7.1f} ms   {legacy_time / fields * 1e9:>6.0f} ns/field")
+    print(f"month table, one pass      {table_time * 1000:>7.1f} ms   {table_time / fields * 1e9:>6.0f} ns/field")
+    print(f"ISO 8601 (...Z)            {iso_time * 1000:>7.1f} ms   {iso_time / fields * 1e9:>6.0f} ns/field")
+
+    for name in ("tr_TR.UTF-8", "tr_TR.utf8"):
+        try:
+            locale.setlocale(locale.LC_TIME, name)
+        except locale.Error:
+            continue
+        sample = rows[0][0].replace(month=2)
+        print(f"under {name}: legacy {legacy_format(sample)!r} vs table {format_tr_datetime(sample)!r}")
+        break
+    else:
+        print("no Turkish locale installed; skipped the locale comparison")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Load test for the email endpoints against a local fake ReSend server that
+answers slowly.
+
+Runs the real /auth/forgot-password view through the Flask test client on a
+fixed pool of request threads (the gthread worker's --threads) against a
+throwaway SQLite database, in two modes:
+
+- queued    the view as it is: the send is handed to the shared transport
+            (services/email_transport.py) and the request returns at once
+- blocking  the previous behaviour, the view waiting for the provider on
+            the request thread (CentaEmailService.send_password_reset)
+
+Reports request throughput and latency, and how long until the fake
+server had received every email.
+
+Usage:
+    python benchmarks/email_load.py --requests 200 --delay 0.5 --threads 32
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USERS = 50
+
+
+def start_fake_resend(delay):
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(delay)
+            received.append(time.perf_counter())
+            body = json.dumps({"id": "fake"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 256
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", received
+
+
+def build_app(url, connections):
+    db_path = os.path.join(tempfile.mkdtemp(), "email_load.db")
+    os.environ["DATABASE_URI"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("JWT_SECRET_KEY", "email-load-test-secret-key-0123456789")
+    os.environ["RESEND_API_URL"] = url
+    os.environ["RESEND_API_KEY"] = "test"
+    os.environ["EMAIL_HTTP_TIMEOUT"] = "60"
+    os.environ["EMAIL_HTTP_MAX_CONNECTIONS"] = str(connections)
+
+    from app import create_app
+    from models import Role, User, UserRole, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        role = Role(name=UserRole.SUPPORT)
+        db.session.add(role)
+        db.session.flush()
+        for i in range(USERS):
+            db.session.add(User(email=f"user{i}@example.com", role_id=role.id, first_name="Load", last_name="Test"))
+        db.session.commit()
+    return app
+
+
+def run(app, requests, threads, received):
+    local = threading.local()
+
+    def one(i):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        started = time.perf_counter()
+        response = client.post("/auth/forgot-password", json={"email": f"user{i % USERS}@example.com"})
+        return response.status_code, time.perf_counter() - started
+
+    received.clear()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(one, range(requests)))
+    answered = time.perf_counter() - started
+    while len(received) < requests and time.perf_counter() - started < 600:
+        time.sleep(0.01)
+    delivered = (max(received) - started) if len(received) >= requests else None
+    return results, answered, delivered
+
+
+def report(name, results, answered, delivered):
+    latencies = sorted(elapsed for status, elapsed in results if status == 200)
+    errors = sum(1 for status, _ in results if status != 200)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+    delivered = f"{delivered:.2f} s" if delivered is not None else "incomplete"
+    print(
+        f"{name:<10} {len(results) / answered:>8.1f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000 if latencies else 0:>7.0f} ms   p95 {p95 * 1000:>7.0f} ms   "
+        f"answered {answered:.2f} s   all emails delivered {delivered}   errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.5, help="upstream response delay in seconds")
+    parser.add_argument("--threads", type=int, default=32, help="request threads (gunicorn --threads)")
+    parser.add_argument("--connections", type=int, default=20, help="email transport connection pool size")
+    args = parser.parse_args()
+
+    server, url, received = start_fake_resend(args.delay)
+    app = build_app(url, args.connections)
+    print(f"{args.requests} POST /auth/forgot-password, {args.threads} threads, upstream delay {args.delay * 1000:.0f} ms")
+
+    from services.email_service import CentaEmailService
+
+    report("queued", *run(app, args.requests, args.threads, received))
+
+    queue_password_reset = CentaEmailService.queue_password_reset
+    CentaEmailService.queue_password_reset = staticmethod(CentaEmailService.send_password_reset)
+    try:
+        report("blocking", *run(app, args.requests, args.threads, received))
+    finally:
+        CentaEmailService.queue_password_reset = queue_password_reset
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure cold-start import cost of the backend with `python -X importtime`.
+
+Usage:
+    python benchmarks/import_time.py            # import app module only
+    python benchmarks/import_time.py --build    # also call create_app()
+    python benchmarks/import_time.py --code "import app; app.app"   # eager app (Procfile path)
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_importtime(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr.splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self [us] | cumulative | imported package"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--build", action="store_true", help="also build the app with create_app()")
+    parser.add_argument("--code", default="import app", help="statement to time (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    code = args.code
+    if args.build:
+        code += "; app.create_app()"
+
+    rows = run_importtime(code)
+    top_level = [r for r in rows if not r[2][1:].startswith(" ")]
+    total_us = sum(r[0] for r in top_level)
+
+    print(f"{code!r}: {total_us / 1000:.1f} ms total import time")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Login throughput with N concurrent clients, bcrypt inline vs. in the
+bounded process pool (services/password_service.py).
+
+Runs the real /auth/login view through the Flask test client against a
+throwaway SQLite database.
+
+Usage:
+    python benchmarks/login_load.py --clients 16 --seconds 10 --pool-sizes 0,2,4
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+EMAIL = "load-test@example.com"
+PASSWORD = "LoadTest123!"
+
+
+def build_app(pool_size, rounds):
+    db_path = os.path.join(tempfile.mkdtemp(), "login_load.db")
+    os.environ["DATABASE_URI"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("JWT_SECRET_KEY", "login-load-test-secret-key-0123456789")
+    os.environ["BCRYPT_POOL_SIZE"] = str(pool_size)
+    os.environ["BCRYPT_LOG_ROUNDS"] = str(rounds)
+    os.environ["LOGIN_MAX_FAILED_ATTEMPTS"] = "1000000"
+
+    from app import create_app
+    from models import Role, User, UserRole, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        role = Role(name=UserRole.SUPPORT)
+        db.session.add(role)
+        db.session.flush()
+        user = User(email=EMAIL, role_id=role.id, first_name="Load", last_name="Test")
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def run(app, clients, seconds):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client_loop():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            elapsed = time.perf_counter() - started
+            with lock:
+                if response.status_code == 200:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(response.status_code)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--pool-sizes", default="0,2,4", help="comma separated BCRYPT_POOL_SIZE values (0 = inline)")
+    args = parser.parse_args()
+
+    print(f"{args.clients} concurrent clients, {args.seconds:.0f} s, bcrypt cost {args.rounds}, {os.cpu_count()} CPUs")
+    for pool_size in [int(p) for p in args.pool_sizes.split(",")]:
+        app = build_app(pool_size, args.rounds)
+        latencies, errors, elapsed = run(app, args.clients, args.seconds)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        label = "inline" if pool_size == 0 else f"pool={pool_size}"
+        print(
+            f"{label:<8} {len(latencies) / elapsed:>7.1f} logins/s   "
+            f"p50 {statistics.median(latencies) * 1000 if latencies else 0:>7.0f} ms   "
+            f"p95 {p95 * 1000:>7.0f} ms   errors {len(errors)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
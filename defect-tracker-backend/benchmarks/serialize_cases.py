@@ -0,0 +1,153 @@
+"""
+Micro-benchmark: serialize 1,000 return cases (2 items, 3 services each).
+
+Compares the previous inline dict building + stdlib json with the schema
+functions in serializers.py encoded by FastJSONProvider (orjson when
+installed). Objects are transient model instances; no database needed.
+
+Usage:
+    python benchmarks/serialize_cases.py --cases 1000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from models import (
+    CaseStatusEnum, Customers, FaultResponsibilityEnum, PaymentStatusEnum, ProductModel,
+    ProductTypeEnum, ReceiptMethodEnum, ResolutionMethodEnum, ReturnCase, ReturnCaseItem,
+    ReturnCaseItemService, ServiceDefinition, WarrantyStatusEnum,
+)
+from serializers import FastJSONProvider, orjson, serialize_return_case
+from services.catalog import reference_catalog
+
+
+def build_cases(n):
+    customer = Customers(id=1, name="Örnek Asansör", contact_info="info@example.com", address="İstanbul")
+    model = ProductModel(id=1, name="DT21", product_type=ProductTypeEnum.door_detector)
+    definitions = [ServiceDefinition(id=i, product_type=ProductTypeEnum.door_detector, service_name=f"Arıza {i}") for i in range(3)]
+    # serializers.py resolves names through the reference catalog
+    reference_catalog.prime([model], definitions)
+    cases = []
+    for case_id in range(n):
+        items = []
+        for item_id in range(2):
+            item = ReturnCaseItem(
+                id=case_id * 2 + item_id, product_model_id=model.id, product_model=model, product_count=3, production_date="2024-05",
+                has_control_unit=False, warranty_status=WarrantyStatusEnum.in_warranty,
+                fault_responsibility=FaultResponsibilityEnum.technical_issue,
+                resolution_method=ResolutionMethodEnum.repair,
+                cable_check=True, profile_check=False, packaging=True,
+            )
+            item.services = [
+                ReturnCaseItemService(id=j, service_definition_id=d.id, service_definition=d, is_performed=j == 0)
+                for j, d in enumerate(definitions)
+            ]
+            items.append(item)
+        cases.append(ReturnCase(
+            id=case_id, customer=customer, arrival_date=date(2025, 3, 14),
+            receipt_method=ReceiptMethodEnum.shipment, notes="Kablo kopuk geldi",
+            shipping_info="Yurtiçi", tracking_number="123456789", shipping_date=date(2025, 3, 20),
+            payment_status=PaymentStatusEnum.paid, yedek_parca=Decimal("120.50"), bakim=Decimal("0"),
+            iscilik=Decimal("75.00"), cost=Decimal("195.50"), performed_services="Kablo değişti",
+            workflow_status=CaseStatusEnum.SHIPPING, items=items,
+        ))
+    return cases
+
+
+def legacy_serialize(c):
+    # Inline dict building as get_return_cases did before serializers.py
+    def serialize_item(item):
+        services = []
+        for service in item.services:
+            services.append({
+                "id": service.id,
+                "service_definition_id": service.service_definition_id,
+                "service_name": service.service_definition.service_name,
+                "is_performed": service.is_performed
+            })
+        return {
+            "id": item.id,
+            "product_model": {
+                "id": item.product_model.id if item.product_model else None,
+                "name": item.product_model.name if item.product_model else "Bilinmeyen Ürün",
+                "product_type": item.product_model.product_type.value if item.product_model else None
+            },
+            "product_count": item.product_count,
+            "production_date": item.production_date,
+            "has_control_unit": item.has_control_unit,
+            "warranty_status": item.warranty_status.value if item.warranty_status else None,
+            "fault_responsibility": item.fault_responsibility.value if item.fault_responsibility else None,
+            "resolution_method": item.resolution_method.value if item.resolution_method else None,
+            "cable_check": item.cable_check,
+            "profile_check": item.profile_check,
+            "packaging": item.packaging,
+            "services": services
+        }
+
+    return {
+        "id": c.id,
+        "version": c.version,
+        "status": c.workflow_status.value if c.workflow_status else None,
+        "customer": {
+            "id": c.customer.id if c.customer else None,
+            "name": c.customer.name if c.customer else "Bilinmeyen Müşteri",
+            "contact_info": c.customer.contact_info if c.customer else None,
+            "address": c.customer.address if c.customer else None
+        },
+        "arrival_date": c.arrival_date.isoformat() if c.arrival_date else None,
+        "receipt_method": c.receipt_method.value if c.receipt_method else None,
+        "notes": c.notes,
+        "shipping_info": c.shipping_info,
+        "tracking_number": c.tracking_number,
+        "shipping_date": c.shipping_date.isoformat() if c.shipping_date else None,
+        "payment_status": c.payment_status.value if c.payment_status else None,
+        "yedek_parca": float(c.yedek_parca) if c.yedek_parca is not None else 0,
+        "bakim": float(c.bakim) if c.bakim is not None else 0,
+        "iscilik": float(c.iscilik) if c.iscilik is not None else 0,
+        "cost": float(c.cost) if c.cost is not None else 0,
+        "performed_services": c.performed_services,
+        "items": [serialize_item(i) for i in c.items]
+    }
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = build_cases(args.cases)
+    provider = FastJSONProvider(Flask(__name__))
+
+    legacy_time, legacy_body = best_of(
+        lambda: json.dumps({"cases": [legacy_serialize(c) for c in cases]}, sort_keys=True), args.repeat
+    )
+    fast_time, fast_body = best_of(
+        lambda: provider.dumps({"cases": [serialize_return_case(c) for c in cases]}), args.repeat
+    )
+    assert json.loads(legacy_body) == json.loads(fast_body), "payloads differ"
+
+    print(f"{args.cases} cases, best of {args.repeat}, encoder: {'orjson' if orjson else 'stdlib json'}")
+    print(f"legacy dicts + json.dumps   {legacy_time * 1000:>8.1f} ms   {len(legacy_body) / 1024:>7.0f} KiB")
+    print(f"serializers + provider      {fast_time * 1000:>8.1f} ms   {len(fast_body.encode()) / 1024:>7.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
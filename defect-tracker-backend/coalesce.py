@@ -0,0 +1,18 @@
+from functools import wraps
+
+from flask import current_app
+
+from services.request_coalescer import request_coalescer
+
+
+def coalesced(fn):
+    """
+    Identical concurrent GETs of the view share one execution (see
+    services/request_coalescer.py). Place it under conditional_get, whose
+    table validator becomes part of the key. Keyed by the view's name, so
+    it also works when another view calls it (POST /reports/<report>/jobs).
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return request_coalescer.run(fn.__name__, lambda: current_app.make_response(current_app.ensure_sync(fn)(*args, **kwargs)))
+    return wrapper
@@ -0,0 +1,127 @@
+"""
+Response compression.
+
+Responses of the types in COMPRESS_LEVELS are sent with Content-Encoding
+br (when the brotli package is installed and the client accepts it) or
+gzip. Buffered bodies under COMPRESS_MIN_SIZE bytes are left alone, since
+the headers would cost more than the bytes saved. Streamed responses
+(e.g. the SSE feed) are compressed chunk by chunk with a sync flush after
+each one, so every event still reaches the client as soon as it is
+yielded. ETags are left as they are; Vary: Accept-Encoding keeps caches
+from mixing up the encodings.
+"""
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip only
+    brotli = None
+
+# (gzip level, brotli quality) per mimetype; measured with
+# benchmarks/compression.py on /returns and report payloads
+COMPRESS_LEVELS = {
+    'application/json': (6, 4),
+    'text/csv': (6, 4),
+    'text/html': (6, 4),
+    'text/plain': (6, 4),
+    # Many tiny chunks, each flushed on its own: the cheapest settings do as well
+    'text/event-stream': (1, 1),
+}
+
+
+def gzip_compressor(level):
+    # wbits 16 + MAX_WBITS: gzip container instead of a raw zlib stream
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class ResponseCompressor:
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+
+    def init_app(self, app):
+        self.enabled = app.config.get('COMPRESS_RESPONSES', self.enabled)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        app.after_request(self._compress)
+
+    @staticmethod
+    def choose_encoding(accept_encodings):
+        if brotli is not None and accept_encodings.quality('br') > 0:
+            return 'br'
+        if accept_encodings.quality('gzip') > 0:
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def compress(data, encoding, levels):
+        gzip_level, brotli_quality = levels
+        if encoding == 'br':
+            return brotli.compress(data, quality=brotli_quality)
+        compressor = gzip_compressor(gzip_level)
+        return compressor.compress(data) + compressor.flush()
+
+    @staticmethod
+    def compress_stream(response, encoding, levels):
+        """Compress the body as it is produced, flushing after every chunk"""
+        gzip_level, brotli_quality = levels
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=brotli_quality)
+            step = lambda chunk: compressor.process(chunk) + compressor.flush()
+            finish = compressor.finish
+        else:
+            compressor = gzip_compressor(gzip_level)
+            step = lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            finish = compressor.flush
+
+        chunks = response.iter_encoded()
+        original = response.response
+
+        def generate():
+            try:
+                for chunk in chunks:
+                    data = step(chunk)
+                    if data:
+                        yield data
+                yield finish()
+            finally:
+                # Closing our generator must still run the view's cleanup
+                close = getattr(original, 'close', None)
+                if close is not None:
+                    close()
+
+        return generate()
+
+    def _compress(self, response):
+        levels = COMPRESS_LEVELS.get(response.mimetype)
+        if (
+            not self.enabled
+            or levels is None
+            or request.method == 'HEAD'
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or 'no-transform' in response.headers.get('Cache-Control', '')
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self.compress_stream(response, encoding, levels)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self.compress(data, encoding, levels))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+response_compressor = ResponseCompressor()
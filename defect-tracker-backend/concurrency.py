@@ -0,0 +1,69 @@
+"""
+Optimistic concurrency for return case edits.
+
+ReturnCase.version is the mapper's version_id_col: every UPDATE of the row
+is guarded by and bumps it, so a write based on a stale read fails with
+StaleDataError instead of silently overwriting someone else's change, and
+no row lock is held while the user has the form open. Clients receive
+"<id>-<version>" as the case's ETag and send it back in If-Match. The
+detail endpoint (GET /returns/<id>) tags its representation
+"<id>-<version>.<hash>", which is accepted as well: If-Match only compares
+the part before the dot.
+"""
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+
+from models import ReturnCase, db
+
+
+def case_etag(return_case):
+    return f"{return_case.id}-{return_case.version}"
+
+
+def matches_case(if_match, return_case):
+    """Whether If-Match names the case's current version (or is *)"""
+    current = case_etag(return_case)
+    return if_match.star_tag or any(tag.split('.', 1)[0] == current for tag in if_match)
+
+
+def case_conflict(return_case_id):
+    """409 with the case as it is now, for the client to merge or reload"""
+    from serializers import serialize_return_case
+
+    db.session.rollback()
+    current = db.session.get(ReturnCase, return_case_id)
+    if current is None:
+        return jsonify({"error": "Vaka bulunamadı"}), 404
+    response = jsonify({
+        "error": "Bu vaka siz düzenlerken başka bir kullanıcı tarafından güncellendi. Lütfen güncel bilgileri kontrol edip tekrar deneyin.",
+        "case": serialize_return_case(current),
+    })
+    response.status_code = 409
+    response.set_etag(case_etag(current))
+    return response
+
+
+def if_match_required(fn):
+    """
+    For PUT /returns/<return_case_id>/...: 428 without If-Match, 409 when it
+    names an older version of the case, the new ETag on success. The view
+    itself turns a StaleDataError (lost the race after this check) into a
+    409 with case_conflict().
+    """
+    @wraps(fn)
+    def wrapper(return_case_id, *args, **kwargs):
+        if not request.if_match:
+            return jsonify({"error": "If-Match başlığı gereklidir. Lütfen vakayı yeniden yükleyip tekrar deneyin."}), 428
+
+        return_case = db.session.get(ReturnCase, return_case_id)
+        if return_case is None:
+            return jsonify({"error": "Vaka bulunamadı"}), 404
+        if not matches_case(request.if_match, return_case):
+            return case_conflict(return_case_id)
+
+        response = make_response(current_app.ensure_sync(fn)(return_case_id, *args, **kwargs))
+        if response.status_code == 200:
+            response.set_etag(case_etag(db.session.get(ReturnCase, return_case_id)))
+        return response
+    return wrapper
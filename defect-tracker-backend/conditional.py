@@ -0,0 +1,46 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+from models import table_versions
+
+
+def table_validators(*models):
+    """
+    Change validator for the given tables: their versions from
+    change_counters (models.table_versions), which every committed insert,
+    update or delete bumps. One primary key lookup instead of scanning the
+    tables, and it also sees in-place updates that leave max(updated_at)
+    alone (e.g. a user rename for the action log list).
+    """
+    versions = table_versions(*(model.__table__ for model in models))
+    return "|".join(f"{name}:{version}" for name, version in versions.items())
+
+
+def conditional_get(*models):
+    """
+    ETag support for GET endpoints whose payload only depends on the given
+    tables and the query string. A matching If-None-Match gets a 304 before
+    the view (and its main query) runs.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            validator = table_validators(*models)
+            g.table_validator = validator  # also keys request coalescing (coalesce.py)
+            etag = hashlib.sha1(f"{request.full_path}|{validator}".encode()).hexdigest()
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(current_app.ensure_sync(fn)(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                # Let the browser keep the payload but revalidate on every poll
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,33 @@
+"""
+Locale-independent date formatting for API responses.
+
+The list pages show timestamps as "05 Şub 2025 14:30". Formatting with
+strftime("%b") depends on the process locale (and the old English ->
+Turkish replace chain only worked under an English one), so month names
+come from a fixed table and each value is formatted in one pass. Every
+formatted field is also available as ISO 8601 so the frontend can
+localize on its own.
+"""
+from datetime import timezone
+
+TR_MONTH_ABBR = ("Oca", "Şub", "Mar", "Nis", "May", "Haz", "Tem", "Ağu", "Eyl", "Eki", "Kas", "Ara")
+
+
+def format_tr_datetime(value):
+    """'05 Şub 2025 14:30'; None for empty values"""
+    if not value:
+        return None
+    return f"{value.day:02d} {TR_MONTH_ABBR[value.month - 1]} {value.year} {value.hour:02d}:{value.minute:02d}"
+
+
+def format_iso_utc(value):
+    """
+    ISO 8601 in UTC, e.g. '2025-02-05T14:30:00Z'; None for empty values.
+    Naive values are taken as UTC; aware ones (timezone=True columns such as
+    User.last_login) are converted first.
+    """
+    if not value:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat() + 'Z'
@@ -0,0 +1,136 @@
+"""
+Read-replica routing.
+
+GET/HEAD requests to the read-only blueprints run their queries on the
+replica engine (SQLALCHEMY_BINDS['replica'], from DATABASE_REPLICA_URI);
+everything else, and every flush, stays on the primary.
+
+Read-your-writes: after a successful write the primary's WAL position is
+stored in a short-lived cookie. While it is present, a read only goes to
+the replica once the replica has replayed past that position. Databases
+without WAL positions (e.g. two SQLite files locally) fall back to reading
+from the primary until the cookie expires. An unreachable replica is
+skipped for REPLICA_HEALTH_CHECK_SECONDS.
+"""
+import time
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+
+REPLICA_BIND = 'replica'
+REPLICA_BLUEPRINTS = {'reports', 'returns', 'customer', 'product', 'user_action_logs'}
+READ_METHODS = {'GET', 'HEAD'}
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica when the request allows it"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and not getattr(clause, 'is_dml', False)
+            and has_app_context()
+            and g.get('db_replica')
+        ):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.cookie_name = 'db_position'
+        self.ryw_seconds = 60
+        self.health_check_seconds = 5
+        self.enabled = False
+        self._healthy_until = 0
+        self._down_until = 0
+
+    def init_app(self, app):
+        self.ryw_seconds = app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', self.ryw_seconds)
+        self.health_check_seconds = app.config.get('REPLICA_HEALTH_CHECK_SECONDS', self.health_check_seconds)
+        if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+            return
+        self.enabled = True
+        app.before_request(self._route_request)
+        app.after_request(self._remember_write)
+
+    # --- Replica state -----------------------------------------------------
+
+    def _engines(self):
+        engines = current_app.extensions['sqlalchemy'].engines
+        return engines[None], engines[REPLICA_BIND]
+
+    def available(self):
+        """Cheap, cached reachability check of the replica"""
+        now = time.monotonic()
+        if now < self._healthy_until:
+            return True
+        if now < self._down_until:
+            return False
+        try:
+            with self._engines()[1].connect() as conn:
+                conn.execute(text('SELECT 1'))
+        except Exception:
+            self._down_until = now + self.health_check_seconds
+            return False
+        self._healthy_until = now + self.health_check_seconds
+        return True
+
+    def _caught_up(self, position):
+        replica = self._engines()[1]
+        if replica.dialect.name != 'postgresql' or not position.startswith('lsn:'):
+            # No way to compare positions: the cookie's lifetime is the guard
+            return False
+        try:
+            with replica.connect() as conn:
+                replayed = conn.execute(
+                    text('SELECT pg_wal_lsn_diff(pg_last_wal_replay_lsn(), CAST(:lsn AS pg_lsn)) >= 0'),
+                    {'lsn': position[len('lsn:'):]},
+                ).scalar()
+        except Exception:
+            return False
+        # NULL when the replica is not in recovery; we cannot tell, use the primary
+        return bool(replayed)
+
+    def _current_position(self):
+        primary = self._engines()[0]
+        if primary.dialect.name != 'postgresql':
+            return f'ts:{int(time.time())}'
+        with primary.connect() as conn:
+            return f"lsn:{conn.execute(text('SELECT pg_current_wal_lsn()')).scalar()}"
+
+    # --- Request hooks -----------------------------------------------------
+
+    def _route_request(self):
+        g.db_replica = False
+        if request.method not in READ_METHODS or request.blueprint not in REPLICA_BLUEPRINTS:
+            return
+        position = request.cookies.get(self.cookie_name)
+        if position and not self._caught_up(position):
+            return
+        g.db_replica = self.available()
+
+    def _remember_write(self, response):
+        if request.method not in WRITE_METHODS or response.status_code >= 400:
+            return response
+        try:
+            position = self._current_position()
+        except Exception:
+            return response
+        response.set_cookie(
+            self.cookie_name,
+            position,
+            max_age=self.ryw_seconds,
+            httponly=True,
+            # Same cross-site rules as the auth cookie it follows around
+            secure=current_app.config.get('JWT_COOKIE_SECURE', False),
+            samesite=current_app.config.get('JWT_COOKIE_SAMESITE'),
+            domain=current_app.config.get('JWT_COOKIE_DOMAIN'),
+        )
+        return response
+
+
+replica_router = ReplicaRouter()
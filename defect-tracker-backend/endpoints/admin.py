@@ -8,6 +8,7 @@ import os
 import secrets
 from datetime import datetime, timedelta
 from services.email_service import CentaEmailService
+from serializers import serialize_admin_user
 from flask_jwt_extended import get_jwt_identity
 import datetime
 
@@ -89,14 +90,16 @@ def invite_user():
         # Send invitation email
         invitation_url = f"https://centa-returns-frontend-production.up.railway.app/accept-invitation?token={invitation_token}"        
         
-        if CentaEmailService.send_user_invitation(
+        # Queued on the shared email transport; the invitation can be sent
+        # again from the same form if it never arrives
+        if CentaEmailService.queue_user_invitation(
             email, 
             role_enum.value,
             invitation_url,
             current_user_email
         ):
             return jsonify({
-                "msg": f"{email} adresine davet e-postası gönderildi",
+                "msg": f"{email} adresine davet e-postası gönderiliyor",
                 "user": user.to_dict()
             }), 200
         else:
@@ -225,67 +228,10 @@ def retrieve_users():
         error_out=False
     )
 
-    # Serialize the users
-    def serialize_user(user):
-       return {
-        "email": user.email,
-        "firstName": user.first_name,
-        "lastName": user.last_name,
-        "role": user.role.name.value,
-        "createdAt": (
-            user.accepted_at.strftime("%d %b %Y %H:%M")
-            .replace("Jan", "Oca")
-            .replace("Feb", "Şub")
-            .replace("Mar", "Mar")
-            .replace("Apr", "Nis")
-            .replace("May", "May")
-            .replace("Jun", "Haz")
-            .replace("Jul", "Tem")
-            .replace("Aug", "Ağu")
-            .replace("Sep", "Eyl")
-            .replace("Oct", "Eki")
-            .replace("Nov", "Kas")
-            .replace("Dec", "Ara")
-        ) if user.accepted_at else None,
-        "invitedAt": (
-            user.invited_at.strftime("%d %b %Y %H:%M")
-            .replace("Jan", "Oca")
-            .replace("Feb", "Şub")
-            .replace("Mar", "Mar")
-            .replace("Apr", "Nis")
-            .replace("May", "May")
-            .replace("Jun", "Haz")
-            .replace("Jul", "Tem")
-            .replace("Aug", "Ağu")
-            .replace("Sep", "Eyl")
-            .replace("Oct", "Eki")
-            .replace("Nov", "Kas")
-            .replace("Dec", "Ara")
-        ) if user.invited_at else None,
-        "lastLogin": (
-            user.last_login.strftime("%d %b %Y %H:%M")
-            .replace("Jan", "Oca")
-            .replace("Feb", "Şub")
-            .replace("Mar", "Mar")
-            .replace("Apr", "Nis")
-            .replace("May", "May")
-            .replace("Jun", "Haz")
-            .replace("Jul", "Tem")
-            .replace("Aug", "Ağu")
-            .replace("Sep", "Eyl")
-            .replace("Oct", "Eki")
-            .replace("Nov", "Kas")
-            .replace("Dec", "Ara")
-        ) if user.last_login else None,
-        "invitedBy": user.invited_by,
-        "isInvited": bool(user.invitation_token and user.invitation_expiry and user.invitation_expiry > datetime.datetime.utcnow()),
-        "isActive": bool(user.password_hash),
-        "emailNotificationsEnabled": user.email_notifications_enabled
-       }
-
     # Return the serialized users
+    now = datetime.datetime.utcnow()
     return jsonify({
-        "users": [serialize_user(u) for u in paginated_users.items],
+        "users": [serialize_admin_user(u, now) for u in paginated_users.items],
         "totalPages": paginated_users.pages,
         "currentPage": paginated_users.page,
         "totalUsers": paginated_users.total
@@ -0,0 +1,25 @@
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from services.catalog import reference_catalog
+
+catalog_bp = Blueprint('catalog', __name__, url_prefix='/catalog')
+
+
+@catalog_bp.route('', methods=['GET'])
+@jwt_required()
+def get_catalog():
+    """
+    Product models and service definitions per product type, plus the enum
+    value lists, in one payload. The ETag is the catalog version, so clients
+    can keep it and revalidate with If-None-Match on every page load.
+    """
+    etag = reference_catalog.version
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(reference_catalog.payload())
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -1,16 +1,23 @@
 
 import logging
 import re
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, current_app, request, jsonify, g
 from flask_jwt_extended import jwt_required 
 from sqlalchemy import or_
-from models import db, Customers, AppPermissions, ActionType
+from models import db, Customers, AppPermissions, ActionType, ReturnCase
 from permissions import permission_required
+from conditional import conditional_get
+from serializers import serialize_customer
 from services.log_service import LogService
+from services.usage_service import UsageService
+from services.customer_index import customer_index, turkish_fold, turkish_fold_sql
 
 
 customer_bp = Blueprint("customer", __name__, url_prefix="/customers")
 
+# Upper bound for /customers/suggest?limit=
+SUGGEST_MAX_LIMIT = 50
+
 EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 def is_valid_email(email_string):
@@ -66,6 +73,7 @@ def create_customer():
     try:
         db.session.add(new_customer)
         db.session.commit()
+        customer_index.upsert(new_customer)
 
         try:
             email = g.user.email
@@ -103,10 +111,10 @@ def delete_customer(customer_id):
         return jsonify({"msg": "Müşteri bulunamadı."}), 404
 
     # Check if customer has associated return cases
-    if customer.return_cases:
+    if UsageService.customer_in_use(customer.id):
         return jsonify({
             "msg": "Bu müşteri silinemez çünkü arıza vakaları bulunmaktadır. Önce tüm arıza vakalarını silin.",
-            "return_case_count": len(customer.return_cases)
+            "return_case_count": UsageService.customer_case_count(customer.id)
         }), 400
 
     try:
@@ -120,6 +128,7 @@ def delete_customer(customer_id):
         
         db.session.delete(customer)
         db.session.commit()
+        customer_index.remove(customer_id)
         return jsonify({"msg": "Müşteri başarıyla silindi."}), 200
     except Exception as e:
         db.session.rollback()
@@ -154,6 +163,7 @@ def update_customer(customer_id):
     
     try:
         db.session.commit()
+        customer_index.upsert(customer)
         return jsonify({ "msg": "Müşteri başarıyla güncellendi." }), 200
     
     except Exception as e:
@@ -162,6 +172,7 @@ def update_customer(customer_id):
     
 @customer_bp.route('',methods=['GET'])
 @jwt_required()
+@conditional_get(Customers, ReturnCase)
 def get_customers():
     """
     Retrieve a paginated and searchable list of customers.
@@ -192,29 +203,9 @@ def get_customers():
     paginated_customers = query.paginate(page=page, per_page=limit, error_out=False)
     
     # Format the customers into a list of dictionaries
+    case_counts = UsageService.customer_case_counts(c.id for c in paginated_customers.items)
     customers_list = [
-        {
-            'id': customer.id,
-            'name': customer.name,
-            'representative': customer.representative,
-            'contact_info': customer.contact_info,
-            'address': customer.address,
-            'created_at': (
-                customer.created_at.strftime("%d %b %Y %H:%M")
-                .replace("Jan", "Oca")
-                .replace("Feb", "Şub")
-                .replace("Mar", "Mar")
-                .replace("Apr", "Nis")
-                .replace("May", "May")
-                .replace("Jun", "Haz")
-                .replace("Jul", "Tem")
-                .replace("Aug", "Ağu")
-                .replace("Sep", "Eyl")
-                .replace("Oct", "Eki")
-                .replace("Nov", "Kas")
-                .replace("Dec", "Ara")
-            ) if customer.created_at else None
-        }
+        serialize_customer(customer, case_counts.get(customer.id, 0))
         for customer in paginated_customers.items
     ]
 
@@ -225,3 +216,30 @@ def get_customers():
         "currentPage": paginated_customers.page
     }), 200
 
+@customer_bp.route('/suggest', methods=['GET'])
+@jwt_required()
+def suggest_customers():
+    """
+    Autocomplete for customer pickers: up to `limit` {id, name, representative}
+    whose name matches `q` (Turkish case and accents ignored), best first.
+    Served from the worker's in-memory index; from the database while it is
+    being built.
+    """
+    query = request.args.get('q', '', type=str).strip()
+    limit = max(1, min(request.args.get('limit', 10, type=int), SUGGEST_MAX_LIMIT))
+
+    matches = customer_index.suggest(query, limit)
+    if matches is None:
+        customer_index.rebuild_in_background(current_app._get_current_object())
+        db_query = Customers.query
+        if query:
+            db_query = db_query.filter(turkish_fold_sql(Customers.name).contains(turkish_fold(query), autoescape=True))
+        rows = db_query.order_by(Customers.name).limit(limit).all()
+        matches = [(c.id, c.name, c.representative) for c in rows]
+
+    return jsonify({
+        "customers": [
+            {"id": customer_id, "name": name, "representative": representative}
+            for customer_id, name, representative in matches
+        ]
+    }), 200
@@ -2,17 +2,21 @@ import logging
 from flask import Blueprint, request, jsonify, g
 from flask_jwt_extended import jwt_required
 from permissions import permission_required
+from conditional import conditional_get
 from services.log_service import LogService
+from services.usage_service import UsageService
+from services.catalog import reference_catalog
 from models import ActionType
 
 # Import your db instance and models
-from models import AppPermissions, db, ProductModel, ProductTypeEnum, ReturnCaseItem
+from models import AppPermissions, db, ProductModel, ProductTypeEnum, ReturnCase, ReturnCaseItem
 
 
 product_bp = Blueprint("product", __name__, url_prefix="/products")
 
 @product_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get(ProductModel, ReturnCaseItem)
 def get_products():
     """
     Retrieve a paginated and searchable list of product models.
@@ -38,11 +42,13 @@ def get_products():
         
         paginated_products = query.paginate(page=page, per_page=limit, error_out=False)
         
+        item_counts = UsageService.product_item_counts(p.id for p in paginated_products.items)
         products_list = [
             {
                 'id': p.id,
                 'name': p.name,
-                'product_type': p.product_type.value # Send the user-friendly value
+                'product_type': p.product_type.value, # Send the user-friendly value
+                'return_case_item_count': item_counts.get(p.id, 0)
             }
             for p in paginated_products.items
         ]
@@ -79,6 +85,7 @@ def create_product():
     )
     db.session.add(new_product)
     db.session.commit()
+    reference_catalog.refresh()
 
     try:
         email = g.user.email
@@ -112,10 +119,19 @@ def update_product(product_id):
     if existing_product:
         return jsonify({"msg": "Bu isimle başka bir ürün modeli zaten mevcut."}), 409
 
+    summary_changed = product.name != name or product.product_type != ProductTypeEnum[product_type_key]
     product.name = name
     product.product_type = ProductTypeEnum[product_type_key]
+
+    if summary_changed:
+        # Cases using this model carry its name and type in their summary columns
+        db.session.flush()
+        cases = ReturnCase.query.join(ReturnCase.items).filter(ReturnCaseItem.product_model_id == product_id).distinct()
+        for return_case in cases:
+            return_case.refresh_summary()
     
     db.session.commit()
+    reference_catalog.refresh()
     return jsonify({ "msg": "Ürün modeli başarıyla güncellendi" }), 200
 
 @product_bp.route('/<int:product_id>', methods=['DELETE'])
@@ -125,15 +141,10 @@ def delete_product(product_id):
     product = ProductModel.query.get_or_404(product_id)
     
     # Check if product has associated return case items
-    # We need to check through the relationship
-    associated_items = ReturnCaseItem.query.filter_by(product_model_id=product_id).first()
-    
-    if associated_items:
-        # Count all associated items
-        item_count = ReturnCaseItem.query.filter_by(product_model_id=product_id).count()
+    if UsageService.product_in_use(product_id):
         return jsonify({
             "msg": "Bu ürün modeli silinemez çünkü arıza vakalarında kullanılmaktadır. Önce ilgili arıza vakalarını silin.",
-            "return_case_item_count": item_count
+            "return_case_item_count": UsageService.product_item_count(product_id)
         }), 400
 
     try:
@@ -147,6 +158,7 @@ def delete_product(product_id):
         
         db.session.delete(product)
         db.session.commit()
+        reference_catalog.refresh()
         return jsonify({"msg": "Ürün modeli başarıyla silindi."}), 200
     except Exception as e:
         db.session.rollback()
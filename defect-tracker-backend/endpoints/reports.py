@@ -1,15 +1,25 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy import func
+from flask import Blueprint, request, jsonify, url_for
+from sqlalchemy import Date, case, cast, func, literal_column, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import aliased
 from models import (
     db, ReturnCase, ReturnCaseItem, Customers, ProductModel,
     ServiceDefinition, ReturnCaseItemService, ProductTypeEnum,
-    FaultResponsibilityEnum, ResolutionMethodEnum
+    FaultResponsibilityEnum, ResolutionMethodEnum, CaseStatusEnum,
+    ReturnCaseStageTransition, AppPermissions
 )
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+from conditional import conditional_get, table_validators
+from coalesce import coalesced
+from permissions import permission_required
+from services.report_jobs import report_job_runner, DONE, FAILED
+from services.request_coalescer import request_coalescer
+from datetime import datetime, timedelta
 
 reports_bp = Blueprint("reports", __name__)
 
+# Every report reads from these tables; any write to them changes the ETag
+REPORT_TABLES = (ReturnCase, ReturnCaseItem, Customers, ProductModel, ServiceDefinition, ReturnCaseItemService)
+
 
 def parse_date_range():
     start_date = datetime.strptime(request.args.get("start_date"), "%Y-%m-%d")
@@ -34,6 +44,8 @@ def pct(count, total):
 
 
 @reports_bp.route("/reports/items-by-customer", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def items_by_customer():
     try:
         start_date, end_date = parse_date_range()
@@ -97,6 +109,8 @@ def items_by_customer():
 
 
 @reports_bp.route("/reports/items-by-product-model", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def items_by_product_model():
     try:
         start_date, end_date = parse_date_range()
@@ -130,34 +144,95 @@ def items_by_product_model():
     })
 
 
+BREAKDOWN_FORMATS = ("dense", "sparse", "top")
+BREAKDOWN_OTHER_LABEL = "Diğer"
+
+
+def breakdown_cells(period, *columns):
+    """Non-zero (period, ..., return_count) cells of the returns breakdown, grouped in SQL."""
+    return (
+        db.session.query(period.label("period"), *columns, func.sum(ReturnCaseItem.product_count).label("return_count"))
+        .select_from(ReturnCaseItem)
+        .join(ReturnCase, ReturnCaseItem.return_case_id == ReturnCase.id)
+    )
+
+
 @reports_bp.route("/reports/returns-breakdown", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def returns_breakdown():
+    """
+    Returns per period, product model and customer.
+
+    format=dense (default) keeps the chart's original shape: one key per
+    (product model x customer) pair in every period, zeros included.
+    format=sparse only sends the non-zero cells as [period, model, customer,
+    count] index rows into the periods/productModels/customers arrays.
+    format=top&limit=N keeps the N biggest (model, customer) pairs over the
+    whole range and folds the rest into "Diğer", all in SQL; its series are
+    keyed "<product model id>|<customer id>" with the names alongside.
+    """
     try:
         start_date, end_date = parse_date_range()
     except (TypeError, ValueError):
         return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
 
+    response_format = request.args.get("format", "dense")
+    if response_format not in BREAKDOWN_FORMATS:
+        return jsonify({"error": f"Invalid format. Use one of: {', '.join(BREAKDOWN_FORMATS)}"}), 400
+    try:
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        return jsonify({"error": "Invalid limit"}), 400
+    if limit < 1:
+        return jsonify({"error": "Invalid limit"}), 400
+
     delta_days = (end_date - start_date).days
     group_unit = "month" if delta_days >= 30 else "week"
     date_fmt = "YYYY-MM" if group_unit == "month" else "IYYY-IW"
+    period = func.to_char(ReturnCase.arrival_date, date_fmt)
+    in_range = (ReturnCase.arrival_date >= start_date, ReturnCase.arrival_date <= end_date)
+
+    if response_format == "top":
+        return returns_breakdown_top(period, in_range, group_unit, limit)
 
     results = (
-        db.session.query(
-            func.to_char(ReturnCase.arrival_date, date_fmt).label("period"),
+        breakdown_cells(
+            period,
+            ProductModel.id.label("product_model_id"),
             ProductModel.name.label("product_model"),
+            Customers.id.label("customer_id"),
             Customers.name.label("customer_name"),
-            func.sum(ReturnCaseItem.product_count).label("return_count")
         )
-        .join(ReturnCase, ReturnCaseItem.return_case_id == ReturnCase.id)
         .join(ProductModel, ProductModel.id == ReturnCaseItem.product_model_id)
         .join(Customers, Customers.id == ReturnCase.customer_id)
-        .filter(ReturnCase.arrival_date >= start_date)
-        .filter(ReturnCase.arrival_date <= end_date)
-        .group_by("period", "product_model", "customer_name")
-        .order_by("period")
+        .filter(*in_range)
+        .group_by(period, ProductModel.id, ProductModel.name, Customers.id, Customers.name)
+        .order_by(period)
         .all()
     )
 
+    if response_format == "sparse":
+        periods, product_models, customers = {}, {}, {}
+        cells = []
+        for row in results:
+            cells.append([
+                periods.setdefault(row.period, len(periods)),
+                product_models.setdefault((row.product_model_id, row.product_model), len(product_models)),
+                customers.setdefault((row.customer_id, row.customer_name), len(customers)),
+                row.return_count,
+            ])
+        return jsonify({
+            "group_unit": group_unit,
+            "format": "sparse",
+            "periods": list(periods),
+            "productModelIds": [model_id for model_id, _ in product_models],
+            "productModels": [name for _, name in product_models],
+            "customerIds": [customer_id for customer_id, _ in customers],
+            "customers": [name for _, name in customers],
+            "cells": cells,
+        })
+
     customers = set()
     product_models = set()
     for row in results:
@@ -168,7 +243,8 @@ def returns_breakdown():
     period_data = {}
     for row in results:
         entry = period_data.setdefault(row.period, {"period": row.period, **{k: 0 for k in all_keys}})
-        entry[f"{row.product_model}|{row.customer_name}"] = row.return_count
+        # Rows are per id now; customers sharing a name still add up under one key
+        entry[f"{row.product_model}|{row.customer_name}"] += row.return_count
 
     return jsonify({
         "group_unit": group_unit,
@@ -178,7 +254,116 @@ def returns_breakdown():
     })
 
 
+def returns_breakdown_top(period, in_range, group_unit, limit):
+    # Rank (model, customer) pairs by their total over the whole range
+    pair_totals = (
+        db.session.query(
+            ReturnCaseItem.product_model_id.label("product_model_id"),
+            ReturnCase.customer_id.label("customer_id"),
+            func.sum(ReturnCaseItem.product_count).label("total"),
+            func.row_number().over(
+                order_by=(
+                    func.sum(ReturnCaseItem.product_count).desc(),
+                    ReturnCaseItem.product_model_id,
+                    ReturnCase.customer_id,
+                )
+            ).label("rank"),
+        )
+        .join(ReturnCase, ReturnCaseItem.return_case_id == ReturnCase.id)
+        .filter(*in_range)
+        .group_by(ReturnCaseItem.product_model_id, ReturnCase.customer_id)
+        .cte("pair_totals")
+    )
+
+    series = (
+        db.session.query(
+            pair_totals.c.rank,
+            pair_totals.c.total,
+            pair_totals.c.product_model_id,
+            pair_totals.c.customer_id,
+        )
+        .filter(pair_totals.c.rank <= limit)
+        .order_by(pair_totals.c.rank)
+        .all()
+    )
+
+    # Every pair outside the top N lands in bucket 0
+    bucket = case((pair_totals.c.rank <= limit, pair_totals.c.rank), else_=0)
+    results = (
+        breakdown_cells(period, bucket.label("bucket"))
+        .join(
+            pair_totals,
+            (pair_totals.c.product_model_id == ReturnCaseItem.product_model_id)
+            & (pair_totals.c.customer_id == ReturnCase.customer_id),
+        )
+        .filter(*in_range)
+        .group_by(period, bucket)
+        .order_by(period)
+        .all()
+    )
+
+    # Keyed by ids, so customers (or models) sharing a name stay separate
+    # series; names are attached once the series are known
+    model_names = dict(
+        db.session.query(ProductModel.id, ProductModel.name)
+        .filter(ProductModel.id.in_({row.product_model_id for row in series}))
+        .all()
+    )
+    customer_names = dict(
+        db.session.query(Customers.id, Customers.name)
+        .filter(Customers.id.in_({row.customer_id for row in series}))
+        .all()
+    )
+
+    keys = {row.rank: f"{row.product_model_id}|{row.customer_id}" for row in series}
+    keys[0] = BREAKDOWN_OTHER_LABEL
+    period_data = {}
+    other_total = 0
+    for row in results:
+        entry = period_data.setdefault(row.period, {"period": row.period})
+        entry[keys[row.bucket]] = row.return_count
+        if row.bucket == 0:
+            other_total += row.return_count
+
+    series_data = [
+        {
+            "key": keys[row.rank],
+            "product_model_id": row.product_model_id,
+            "product_model": model_names.get(row.product_model_id),
+            "customer_id": row.customer_id,
+            "customer_name": customer_names.get(row.customer_id),
+            "total": row.total,
+        }
+        for row in series
+    ]
+    if other_total:
+        series_data.append({
+            "key": BREAKDOWN_OTHER_LABEL,
+            "product_model_id": None,
+            "product_model": None,
+            "customer_id": None,
+            "customer_name": None,
+            "total": other_total,
+        })
+
+    customer_ids = list(dict.fromkeys(row.customer_id for row in series))
+    product_model_ids = list(dict.fromkeys(row.product_model_id for row in series))
+    return jsonify({
+        "group_unit": group_unit,
+        "format": "top",
+        "limit": limit,
+        "series": series_data,
+        "data": list(period_data.values()),
+        "customerIds": customer_ids,
+        "customers": [customer_names.get(customer_id) for customer_id in customer_ids],
+        "productModelIds": product_model_ids,
+        "productModels": [model_names.get(model_id) for model_id in product_model_ids],
+    })
+
+
 @reports_bp.route("/reports/defects-by-production-month", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def defects_by_production_month():
     try:
         start_date, end_date = parse_date_range()
@@ -191,22 +376,20 @@ def defects_by_production_month():
     if (end_date - start_date).days < 30:
         return jsonify({"error": "Date range must be at least one month", "data": []}), 400
 
-    months_in_range = []
-    current_date = start_date.replace(day=1)
-    while current_date <= end_date:
-        months_in_range.append(current_date.strftime("%Y-%m"))
-        current_date += relativedelta(months=1)
+    start_month = start_date.date().replace(day=1)
+    end_month = end_date.date()
 
     query = (
         db.session.query(
-            func.substring(ReturnCaseItem.production_date, 1, 7).label("production_month"),
+            ReturnCaseItem.production_month.label("production_month"),
             func.sum(ReturnCaseItem.product_count).label("defect_count")
         )
         .join(ReturnCase, ReturnCase.id == ReturnCaseItem.return_case_id)
         .join(ProductModel, ProductModel.id == ReturnCaseItem.product_model_id)
         .filter(ReturnCase.arrival_date >= start_date)
         .filter(ReturnCase.arrival_date <= end_date)
-        .filter(ReturnCaseItem.production_date.isnot(None))
+        .filter(ReturnCaseItem.production_month >= start_month)
+        .filter(ReturnCaseItem.production_month <= end_month)
     )
 
     if product_type_filter and product_type_filter in ProductTypeEnum._member_map_:
@@ -228,17 +411,32 @@ def defects_by_production_month():
         except ValueError:
             return jsonify({"error": "Invalid service_id"}), 400
 
-    defect_counts = {
-        row.production_month: row.defect_count
-        for row in query.group_by(func.substring(ReturnCaseItem.production_date, 1, 7)).all()
-    }
+    defect_counts = query.group_by(ReturnCaseItem.production_month).subquery("defect_counts")
+
+    # Every month of the range, including the ones without defects
+    months = db.session.query(
+        func.generate_series(start_month, end_month, literal_column("interval '1 month'")).label("month")
+    ).subquery("months")
+
+    results = (
+        db.session.query(
+            func.to_char(months.c.month, "YYYY-MM").label("month"),
+            func.coalesce(defect_counts.c.defect_count, 0).label("defect_count")
+        )
+        .select_from(months)
+        .outerjoin(defect_counts, defect_counts.c.production_month == cast(months.c.month, Date))
+        .order_by(months.c.month)
+        .all()
+    )
 
     return jsonify({
-        "data": [{"month": m, "defect_count": defect_counts.get(m, 0)} for m in months_in_range]
+        "data": [{"month": row.month, "defect_count": row.defect_count} for row in results]
     })
 
 
 @reports_bp.route("/reports/fault-responsibility-stats", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def fault_responsibility_stats():
     try:
         start_date, end_date = parse_date_range()
@@ -287,6 +485,8 @@ def service_type_stats():
 
 
 @reports_bp.route("/reports/resolution-method-stats", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def resolution_method_stats():
     try:
         start_date, end_date = parse_date_range()
@@ -330,6 +530,8 @@ def resolution_method_stats():
 
 
 @reports_bp.route("/reports/product-type-stats", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def product_type_stats():
     try:
         start_date, end_date = parse_date_range()
@@ -366,6 +568,8 @@ def product_type_stats():
 
 
 @reports_bp.route("/reports/top-defects", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def top_defects():
     try:
         start_date, end_date = parse_date_range()
@@ -445,6 +649,8 @@ def top_defects():
 
 
 @reports_bp.route("/reports/production-date-distribution", methods=["GET"])
+@conditional_get(*REPORT_TABLES)
+@coalesced
 def production_date_distribution():
     try:
         start_date, end_date = parse_date_range()
@@ -456,7 +662,7 @@ def production_date_distribution():
 
     query = (
         db.session.query(
-            ReturnCaseItem.production_date.label("production_month"),
+            func.to_char(ReturnCaseItem.production_month, "YYYY-MM").label("production_month"),
             ProductModel.product_type,
             ProductModel.name.label("product_model"),
             func.sum(ReturnCaseItem.product_count).label("item_count")
@@ -465,7 +671,7 @@ def production_date_distribution():
         .join(ProductModel, ProductModel.id == ReturnCaseItem.product_model_id)
         .filter(ReturnCase.arrival_date >= start_date)
         .filter(ReturnCase.arrival_date <= end_date)
-        .filter(ReturnCaseItem.production_date.isnot(None))
+        .filter(ReturnCaseItem.production_month.isnot(None))
     )
 
     if product_type_filter and product_type_filter in ProductTypeEnum._member_map_:
@@ -488,8 +694,8 @@ def production_date_distribution():
             return jsonify({"error": "Invalid service_id"}), 400
 
     results = (
-        query.group_by(ReturnCaseItem.production_date, ProductModel.product_type, ProductModel.name)
-        .order_by(ReturnCaseItem.production_date)
+        query.group_by(ReturnCaseItem.production_month, ProductModel.product_type, ProductModel.name)
+        .order_by(ReturnCaseItem.production_month)
         .all()
     )
     total_items = sum(row.item_count for row in results)
@@ -507,3 +713,230 @@ def production_date_distribution():
             for row in results
         ]
     })
+
+
+# Optional splits of the cycle-time report, besides period and stage
+CYCLE_TIME_GROUPS = ("product_type", "customer")
+CYCLE_TIME_PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+@reports_bp.route("/reports/stage-cycle-times", methods=["GET"])
+@conditional_get(*REPORT_TABLES, ReturnCaseStageTransition)
+@coalesced
+def stage_cycle_times():
+    """
+    Hours spent in each workflow stage (p50/p90/p99) per period in which the
+    stage was left, optionally split by group_by=product_type,customer and
+    limited to one stage=<CaseStatusEnum name>. A case with several product
+    types counts under each of them; cases still in a stage are not counted.
+    """
+    try:
+        start_date, end_date = parse_date_range()
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+    group_by = [name for name in request.args.get("group_by", "").split(",") if name]
+    if any(name not in CYCLE_TIME_GROUPS for name in group_by):
+        return jsonify({"error": f"Invalid group_by. Use any of: {', '.join(CYCLE_TIME_GROUPS)}"}), 400
+    stage = request.args.get("stage", "")
+    if stage and stage not in CaseStatusEnum._member_map_:
+        return jsonify({"error": "Invalid stage"}), 400
+
+    delta_days = (end_date - start_date).days
+    group_unit = "month" if delta_days >= 30 else "week"
+    date_fmt = "YYYY-MM" if group_unit == "month" else "IYYY-IW"
+
+    # A stay ends at a transition out of the stage (found through the
+    # changed_at index) and starts at the case's latest transition into that
+    # stage before it (found through the case index), so only the range is read
+    stage_exit = aliased(ReturnCaseStageTransition, name="stage_exit")
+    stage_entry = aliased(ReturnCaseStageTransition, name="stage_entry")
+    entered_at = (
+        select(func.max(stage_entry.changed_at))
+        .where(
+            stage_entry.return_case_id == stage_exit.return_case_id,
+            stage_entry.to_status == stage_exit.from_status,
+            stage_entry.changed_at <= stage_exit.changed_at,
+        )
+        .correlate(stage_exit)
+        .scalar_subquery()
+    )
+    hours = func.extract("epoch", stage_exit.changed_at - entered_at) / 3600.0
+
+    columns = [
+        func.to_char(stage_exit.changed_at, date_fmt).label("period"),
+        stage_exit.from_status.label("stage"),
+        hours.label("hours"),
+    ]
+    if "customer" in group_by:
+        columns += [Customers.id.label("customer_id"), Customers.name.label("customer_name")]
+    if "product_type" in group_by:
+        case_types = (
+            db.session.query(ReturnCaseItem.return_case_id, ProductModel.product_type)
+            .join(ProductModel, ProductModel.id == ReturnCaseItem.product_model_id)
+            .distinct()
+            .subquery("case_types")
+        )
+        columns.append(case_types.c.product_type.label("product_type"))
+
+    stays = db.session.query(*columns).filter(
+        stage_exit.changed_at >= start_date,
+        stage_exit.changed_at < end_date + timedelta(days=1),
+        stage_exit.from_status.isnot(None),
+    )
+    if stage:
+        stays = stays.filter(stage_exit.from_status == CaseStatusEnum[stage])
+    if "customer" in group_by:
+        stays = (
+            stays.join(ReturnCase, ReturnCase.id == stage_exit.return_case_id)
+            .join(Customers, Customers.id == ReturnCase.customer_id)
+        )
+    if "product_type" in group_by:
+        stays = stays.join(case_types, case_types.c.return_case_id == stage_exit.return_case_id)
+    stays = stays.subquery("stays")
+
+    keys = [stays.c.period, stays.c.stage]
+    if "customer" in group_by:
+        keys += [stays.c.customer_id, stays.c.customer_name]
+    if "product_type" in group_by:
+        keys.append(stays.c.product_type)
+    results = (
+        db.session.query(
+            *keys,
+            func.count().label("case_count"),
+            *(
+                func.percentile_cont(fraction).within_group(stays.c.hours).label(name)
+                for name, fraction in CYCLE_TIME_PERCENTILES.items()
+            ),
+        )
+        # Exits without a recorded entry (history older than the table) have no duration
+        .filter(stays.c.hours.isnot(None))
+        .group_by(*keys)
+        .order_by(*keys)
+        .all()
+    )
+
+    data = []
+    for row in results:
+        entry = {
+            "period": row.period,
+            "stage": row.stage.name,
+            "stage_label": row.stage.value,
+            "case_count": row.case_count,
+            **{f"{name}_hours": round(getattr(row, name), 2) for name in CYCLE_TIME_PERCENTILES},
+        }
+        if "customer" in group_by:
+            entry["customer_id"] = row.customer_id
+            entry["customer_name"] = row.customer_name
+        if "product_type" in group_by:
+            entry["product_type"] = row.product_type.value
+        data.append(entry)
+
+    return jsonify({"group_unit": group_unit, "group_by": group_by, "data": data})
+
+
+# Reports that can run as background jobs, by URL name
+REPORT_JOB_VIEWS = {
+    "items-by-customer": items_by_customer,
+    "items-by-product-model": items_by_product_model,
+    "returns-breakdown": returns_breakdown,
+    "defects-by-production-month": defects_by_production_month,
+    "fault-responsibility-stats": fault_responsibility_stats,
+    "resolution-method-stats": resolution_method_stats,
+    "product-type-stats": product_type_stats,
+    "top-defects": top_defects,
+    "production-date-distribution": production_date_distribution,
+    "stage-cycle-times": stage_cycle_times,
+}
+
+# Upper bound for long-polling GET /reports/jobs/<id>?wait=
+REPORT_JOB_MAX_WAIT_SECONDS = 30
+
+
+# Tables any report may read; their versions key the jobs
+REPORT_JOB_TABLES = (*REPORT_TABLES, ReturnCaseStageTransition)
+REPORT_JOB_ENDPOINTS = {f"reports.{view.__name__}": report for report, view in REPORT_JOB_VIEWS.items()}
+
+
+def queue_report(report, view, wrap_result):
+    """Submit the request as a job: 202 and a job to poll, or the result if it is already done"""
+    job = report_job_runner.submit(report, view, request.args.to_dict(), table_validators(*REPORT_JOB_TABLES))
+    status_url = url_for("reports.get_report_job", job_id=job["id"])
+    if job["status"] == DONE:
+        return jsonify(job if wrap_result else job["result"]), 200
+    return jsonify({"job_id": job["id"], "status": job["status"], "status_url": status_url}), 202, {"Location": status_url}
+
+
+@reports_bp.before_request
+def limit_report_requests():
+    """
+    GET /reports/<report> over more than REPORT_INLINE_MAX_DAYS is queued
+    like POST /reports/<report>/jobs (202 + Location; the job's result is
+    the report). Shorter ranges run inline under
+    REPORT_INLINE_STATEMENT_TIMEOUT_MS, so no request can hold a worker
+    for an unbounded query.
+    """
+    report = REPORT_JOB_ENDPOINTS.get(request.endpoint)
+    if request.method != "GET" or report is None:
+        return None
+    try:
+        start_date, end_date = parse_date_range()
+    except (TypeError, ValueError):
+        return None  # the view answers 400
+    if (end_date - start_date).days > report_job_runner.inline_max_days:
+        return queue_report(report, REPORT_JOB_VIEWS[report], wrap_result=False)
+    report_job_runner.limit_statements(report_job_runner.inline_statement_timeout_ms)
+    return None
+
+
+@reports_bp.errorhandler(OperationalError)
+def report_query_failed(e):
+    # 57014 = query_canceled, i.e. REPORT_INLINE_STATEMENT_TIMEOUT_MS ran out
+    if getattr(e.orig, "sqlstate", None) != "57014":
+        raise e
+    db.session.rollback()
+    return jsonify({"error": "Rapor sorgusu zaman aşımına uğradı. Lütfen tarih aralığını daraltın."}), 503
+
+
+@reports_bp.route("/reports/<report>/jobs", methods=["POST"])
+def submit_report_job(report):
+    """
+    Same query string as GET /reports/<report>. Ranges up to
+    REPORT_INLINE_MAX_DAYS are answered inline with the report itself;
+    longer ones are queued and answered with 202 and a job to poll.
+    """
+    view = REPORT_JOB_VIEWS.get(report)
+    if view is None:
+        return jsonify({"error": "Rapor bulunamadı"}), 404
+
+    try:
+        start_date, end_date = parse_date_range()
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+    if (end_date - start_date).days <= report_job_runner.inline_max_days:
+        report_job_runner.limit_statements(report_job_runner.inline_statement_timeout_ms)
+        return view()
+
+    return queue_report(report, view, wrap_result=True)
+
+
+@reports_bp.route("/reports/jobs/<job_id>", methods=["GET"])
+def get_report_job(job_id):
+    """Job state; ?wait=N long-polls up to N seconds for it to finish"""
+    try:
+        wait = min(float(request.args.get("wait", 0)), REPORT_JOB_MAX_WAIT_SECONDS)
+    except ValueError:
+        return jsonify({"error": "Invalid wait"}), 400
+
+    job = report_job_runner.wait(job_id, wait) if wait > 0 else report_job_runner.get(job_id)
+    if job is None:
+        return jsonify({"error": "Rapor işi bulunamadı"}), 404
+    return jsonify(job), 200 if job["status"] in (DONE, FAILED) else 202
+
+
+@reports_bp.route("/reports/coalescing-stats", methods=["GET"])
+@permission_required(AppPermissions.PAGE_VIEW_STATISTICS)
+def get_coalescing_stats():
+    """How many report requests of this worker shared another request's execution, per report"""
+    return jsonify({"reports": request_coalescer.stats()}), 200
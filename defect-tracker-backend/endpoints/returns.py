@@ -1,12 +1,26 @@
+import hashlib
 import logging
-from flask import Blueprint, request, jsonify
+import queue
+import re
+import time
+from flask import Blueprint, Response, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from models import AppPermissions, WarrantyStatusEnum, PaymentStatusEnum, db, ReturnCase, ReturnCaseItem, ProductTypeEnum, ReceiptMethodEnum, CaseStatusEnum, Customers, ProductModel, FaultResponsibilityEnum, ResolutionMethodEnum, ActionType, ServiceDefinition, ReturnCaseItemService
+from models import AppPermissions, WarrantyStatusEnum, PaymentStatusEnum, db, ReturnCase, ReturnCaseItem, ProductTypeEnum, ReceiptMethodEnum, CaseStatusEnum, Customers, ProductModel, FaultResponsibilityEnum, ResolutionMethodEnum, ActionType, ServiceDefinition, ReturnCaseItemService, ReturnCaseTombstone, UserActionLog, User, ChangeCounter, table_counter, current_change_seq, SEARCH_CONFIG, SEARCH_VECTOR, search_fold
 from datetime import datetime
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from permissions import permission_required
+from conditional import conditional_get
+from concurrency import case_conflict, if_match_required
+from serializers import serialize_return_case, serialize_return_case_item, serialize_return_case_summary, serialize_user_action_log
 from services.email_service import CentaEmailService
 from services.log_service import LogService
+from services.case_events import CASE_EVENTS_CHANNEL, CaseEventService, case_event_streams
+from services.case_detail_cache import case_detail_cache
+from services.catalog import reference_catalog
+from services.event_bus import event_bus
+from services.permission_cache import role_permission_cache
+from services.work_queue import OPEN_STAGES, WorkQueueService
 from flask import Blueprint, g
 
 
@@ -36,6 +50,7 @@ return_case_bp = Blueprint('returns', __name__, url_prefix='/returns')
 
 @return_case_bp.route('', methods=['GET'])
 @return_case_bp.route('/', methods=['GET'])
+@conditional_get(ReturnCase, ReturnCaseItem, Customers, ProductModel, ReturnCaseItemService, ServiceDefinition)
 def get_return_cases():
     try:
         # Get pagination parameters
@@ -51,11 +66,19 @@ def get_return_cases():
         product_type = request.args.get('productType', '').strip()
         product_model = request.args.get('productModel', '').strip()
 
+        # view=summary: only the denormalized summary columns, items are
+        # fetched per row from /returns/<id>/items
+        summary_view = request.args.get('view', '').strip() == 'summary'
+
         # Start with base query
-        query = ReturnCase.query.options(
-            joinedload(ReturnCase.customer),
-            joinedload(ReturnCase.items).joinedload(ReturnCaseItem.product_model)
-        )
+        if summary_view:
+            query = ReturnCase.query.options(joinedload(ReturnCase.customer))
+        else:
+            # Product model and service names come from the reference catalog
+            query = ReturnCase.query.options(
+                joinedload(ReturnCase.customer),
+                joinedload(ReturnCase.items).selectinload(ReturnCaseItem.services)
+            )
 
         # Apply search filter (customer name only)
         if search:
@@ -133,59 +156,8 @@ def get_return_cases():
         # Use built-in pagination
         paginated_cases = query.paginate(page=page, per_page=limit, error_out=False)
 
-        def serialize_item(item):
-            # Get services for this item
-            services = []
-            for service in item.services:
-                services.append({
-                    "id": service.id,
-                    "service_definition_id": service.service_definition_id,
-                    "service_name": service.service_definition.service_name,
-                    "is_performed": service.is_performed
-                })
-            
-            return {
-                "id": item.id,
-                "product_model": {
-                    "id": item.product_model.id if item.product_model else None,
-                    "name": item.product_model.name if item.product_model else "Bilinmeyen Ürün",
-                    "product_type": item.product_model.product_type.value if item.product_model else None
-                },
-                "product_count": item.product_count,
-                "production_date": item.production_date,
-                "has_control_unit": item.has_control_unit,
-                "warranty_status": item.warranty_status.value if item.warranty_status else None,
-                "fault_responsibility": item.fault_responsibility.value if item.fault_responsibility else None,
-                "resolution_method": item.resolution_method.value if item.resolution_method else None,
-                "cable_check": item.cable_check,
-                "profile_check": item.profile_check,
-                "packaging": item.packaging,
-                "services": services
-            }
-
-        data = [{
-            "id": c.id,
-            "status": c.workflow_status.value if c.workflow_status else None,
-            "customer": {
-                "id": c.customer.id if c.customer else None,
-                "name": c.customer.name if c.customer else "Bilinmeyen Müşteri",
-                "contact_info": c.customer.contact_info if c.customer else None,
-                "address": c.customer.address if c.customer else None
-            },
-            "arrival_date": c.arrival_date.isoformat() if c.arrival_date else None,
-            "receipt_method": c.receipt_method.value if c.receipt_method else None,
-            "notes": c.notes,
-            "shipping_info": c.shipping_info,
-            "tracking_number": c.tracking_number,
-            "shipping_date": c.shipping_date.isoformat() if c.shipping_date else None,
-            "payment_status": c.payment_status.value if c.payment_status else None,
-            "yedek_parca": float(c.yedek_parca) if c.yedek_parca is not None else 0,
-            "bakim": float(c.bakim) if c.bakim is not None else 0,
-            "iscilik": float(c.iscilik) if c.iscilik is not None else 0,
-            "cost": float(c.cost) if c.cost is not None else 0,
-            "performed_services": c.performed_services,
-            "items": [serialize_item(i) for i in c.items]
-        } for c in paginated_cases.items]
+        serialize = serialize_return_case_summary if summary_view else serialize_return_case
+        data = [serialize(c) for c in paginated_cases.items]
 
         return jsonify({
             "cases": data,
@@ -202,6 +174,400 @@ def get_return_cases():
         traceback.print_exc()
         return jsonify({"error": f"Failed to fetch return cases: {str(e)}"}), 500
 
+@return_case_bp.route('/<int:return_case_id>/items', methods=['GET'])
+@conditional_get(ReturnCaseItem, ProductModel, ReturnCaseItemService, ServiceDefinition)
+def get_return_case_items(return_case_id):
+    """Items of one case, for expanding a row of the summary list"""
+    items = (
+        ReturnCaseItem.query.options(selectinload(ReturnCaseItem.services))
+        .filter_by(return_case_id=return_case_id)
+        .order_by(ReturnCaseItem.id)
+        .all()
+    )
+    return jsonify({"items": [serialize_return_case_item(i) for i in items]})
+
+RECENT_ACTIONS_LIMIT = 20
+# The action log entries embed user names, which change without touching the case
+USERS_VERSION = (
+    db.select(ChangeCounter.value)
+    .where(ChangeCounter.name == table_counter(User.__table__))
+    .scalar_subquery()
+)
+
+def _load_case_detail(return_case_id):
+    """(validator, payload) built from two queries, or None if the case does not exist"""
+    # The case, its customer, items and their services in one joined query,
+    # read together with the users' version; product model and service
+    # names come from the reference catalog
+    row = (
+        db.session.query(ReturnCase, USERS_VERSION)
+        .options(
+            joinedload(ReturnCase.customer),
+            joinedload(ReturnCase.items).joinedload(ReturnCaseItem.services),
+        )
+        .filter(ReturnCase.id == return_case_id)
+        .one_or_none()
+    )
+    if row is None:
+        return None
+    return_case, users_version = row
+    actions = (
+        UserActionLog.query.options(joinedload(UserActionLog.user))
+        .filter(UserActionLog.return_case_id == return_case_id)
+        .order_by(UserActionLog.id.desc())
+        .limit(RECENT_ACTIONS_LIMIT)
+        .all()
+    )
+    payload = serialize_return_case(return_case)
+    payload["recent_actions"] = [serialize_user_action_log(a) for a in actions]
+    # From the rows just read, not from an earlier validator query, so a
+    # write in between cannot leave a stale payload under a newer validator
+    # (the users' version is read before the actions, so at worst it is older)
+    validator = (
+        return_case.version,
+        actions[0].id if actions else None,
+        return_case.customer.updated_at.isoformat() if return_case.customer.updated_at else None,
+        users_version,
+        reference_catalog.version,
+    )
+    return validator, payload
+
+def _case_detail_etag(return_case_id, validator, include_actions):
+    # "<id>-<version>" up front, so the tag also works as If-Match for the
+    # stage PUTs (concurrency.py); the hash covers the rest of the validator
+    digest = hashlib.sha1('|'.join(str(part) for part in (*validator[1:], int(include_actions))).encode())
+    return f"{return_case_id}-{validator[0]}.{digest.hexdigest()[:16]}"
+
+@return_case_bp.route('/<int:return_case_id>', methods=['GET'])
+@jwt_required()
+def get_return_case(return_case_id):
+    """
+    One case with its customer, items, product models, services with their
+    names and its RECENT_ACTIONS_LIMIT newest action log entries (only for
+    roles that may see the action log). At most three queries: the case's
+    validator (case version, newest action, customer's updated_at, users'
+    version), then on a cache miss the case graph and the actions. Answers
+    304 to a matching If-None-Match; the ETag is also accepted as If-Match
+    by the stage PUTs.
+    """
+    row = db.session.execute(
+        db.select(
+            ReturnCase.version,
+            db.select(db.func.max(UserActionLog.id))
+            .where(UserActionLog.return_case_id == ReturnCase.id)
+            .scalar_subquery(),
+            Customers.updated_at,
+            USERS_VERSION,
+        )
+        .join(Customers, Customers.id == ReturnCase.customer_id)
+        .where(ReturnCase.id == return_case_id)
+    ).first()
+    if row is None:
+        case_detail_cache.discard(return_case_id)
+        return jsonify({"error": "Arıza vakası bulunamadı"}), 404
+
+    version, newest_action, customer_updated_at, users_version = row
+    validator = (
+        version,
+        newest_action,
+        customer_updated_at.isoformat() if customer_updated_at else None,
+        users_version,
+        reference_catalog.version,
+    )
+    user = g.get('user')
+    include_actions = user is not None and (
+        AppPermissions.PAGE_VIEW_CASE_TRACKING in role_permission_cache.permissions(user.role_id)
+    )
+    etag = _case_detail_etag(return_case_id, validator, include_actions)
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        payload = case_detail_cache.get(return_case_id, validator)
+        if payload is None:
+            loaded = _load_case_detail(return_case_id)
+            if loaded is None:
+                return jsonify({"error": "Arıza vakası bulunamadı"}), 404
+            validator, payload = loaded
+            case_detail_cache.put(return_case_id, validator, payload)
+            etag = _case_detail_etag(return_case_id, validator, include_actions)
+        if not include_actions:
+            payload = {key: value for key, value in payload.items() if key != "recent_actions"}
+        response = jsonify(payload)
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+SEARCH_MAX_LIMIT = 50
+# Carrier tracking numbers: a single run of letters, digits and dashes with at least one digit
+TRACKING_NUMBER_RE = re.compile(r'^(?=.*\d)[A-Za-z0-9-]{6,100}$')
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MaxWords=18, MinWords=6, FragmentDelimiter=" … "'
+SEARCH_COLUMNS = (
+    ReturnCase.customer_name, ReturnCase.tracking_number, ReturnCase.shipping_info,
+    ReturnCase.notes, ReturnCase.performed_services,
+)
+
+def serialize_search_result(case, rank=None, highlight=None):
+    result = serialize_return_case_summary(case)
+    result.update({
+        "tracking_number": case.tracking_number,
+        "rank": round(rank, 4) if rank is not None else None,
+        "highlight": highlight,
+    })
+    return result
+
+def _full_text_search(text, limit):
+    tsquery = db.func.websearch_to_tsquery(SEARCH_CONFIG, search_fold(text))
+    rank = db.func.ts_rank_cd(SEARCH_VECTOR, tsquery).label('rank')
+    matches = (
+        db.select(ReturnCase.id, ReturnCase.arrival_date, rank)
+        .where(SEARCH_VECTOR.op('@@')(tsquery))
+        .order_by(rank.desc(), ReturnCase.arrival_date.desc(), ReturnCase.id.desc())
+        .limit(limit)
+        .subquery()
+    )
+
+    # Headlines re-parse the whole text, so only for the rows on the page.
+    # The text is HTML-escaped first; the only markup left is our <mark>.
+    # It is not folded like the vector, so the original spelling is shown
+    # (a word whose Turkish capitals the database's ctype cannot lower
+    # matches without being marked)
+    document = db.func.concat_ws('\n', *SEARCH_COLUMNS)
+    for char, entity in (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;')):
+        document = db.func.replace(document, char, entity)
+    headline = db.func.ts_headline(SEARCH_CONFIG, document, tsquery, HEADLINE_OPTIONS)
+
+    rows = (
+        db.session.query(ReturnCase, matches.c.rank, headline)
+        .join(matches, matches.c.id == ReturnCase.id)
+        .options(joinedload(ReturnCase.customer))
+        .order_by(matches.c.rank.desc(), matches.c.arrival_date.desc(), matches.c.id.desc())
+        .all()
+    )
+    return [serialize_search_result(case, rank, highlight) for case, rank, highlight in rows]
+
+def _substring_search(text, limit):
+    # Databases without full-text search: every word somewhere in the text columns
+    query = ReturnCase.query.options(joinedload(ReturnCase.customer))
+    for word in text.split():
+        query = query.filter(db.or_(*(column.ilike(f'%{word}%') for column in SEARCH_COLUMNS)))
+    cases = query.order_by(ReturnCase.arrival_date.desc(), ReturnCase.id.desc()).limit(limit).all()
+    return [serialize_search_result(case) for case in cases]
+
+@return_case_bp.route('/search', methods=['GET'])
+@jwt_required()
+@conditional_get(ReturnCase)
+def search_return_cases():
+    """
+    Cases whose customer name, tracking number, notes, performed services or
+    shipping info match `q`, best first.
+
+    A query shaped like a tracking number is first looked up exactly (B-tree
+    index on tracking_number). Otherwise, or without a hit, PostgreSQL
+    full-text search with the Turkish configuration matches stemmed words
+    ("oksitlenmiş" also finds "oksitlendi"; websearch syntax: "quoted
+    phrases", -exclusions, or), ranks customer name and tracking number hits
+    first and returns up to three fragments in `highlight`, HTML-escaped with
+    the matched words in <mark>. Other databases fall back to a substring
+    match without rank or highlight.
+    """
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({"error": "Arama ifadesi gerekli."}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), SEARCH_MAX_LIMIT)
+    except ValueError:
+        return jsonify({"error": "Geçersiz limit değeri."}), 400
+
+    tracking_number = text.replace(' ', '')
+    if TRACKING_NUMBER_RE.match(tracking_number):
+        cases = (
+            ReturnCase.query.options(joinedload(ReturnCase.customer))
+            .filter(ReturnCase.tracking_number.in_([tracking_number, tracking_number.upper()]))
+            .order_by(ReturnCase.id.desc())
+            .limit(limit)
+            .all()
+        )
+        if cases:
+            return jsonify({"match": "tracking_number", "cases": [serialize_search_result(c) for c in cases]})
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        results = _full_text_search(text, limit)
+    else:
+        results = _substring_search(text, limit)
+    return jsonify({"match": "text", "cases": results})
+
+@return_case_bp.route('/queue', methods=['GET'])
+@jwt_required()
+def get_work_queue():
+    """
+    Open cases in the calling role's stage, the longest waiting first.
+    ADMIN and MANAGER get every open stage and may pick one with ?stage=.
+    """
+    user = g.get('user')
+    if not user:
+        return jsonify({"error": "Kullanıcı bulunamadı"}), 404
+    stages = WorkQueueService.stages_for(user.role.name.name)
+
+    stage = request.args.get('stage', '').strip()
+    if stage:
+        if stage not in CaseStatusEnum._member_map_ or CaseStatusEnum[stage] not in stages:
+            return jsonify({"error": "Bu aşamanın iş listesine erişiminiz yok."}), 400
+        stages = (CaseStatusEnum[stage],)
+
+    try:
+        page = int(request.args.get('page', 1))
+        limit = min(int(request.args.get('limit', 50)), 200)
+    except ValueError:
+        return jsonify({"error": "page ve limit tam sayı olmalıdır."}), 400
+
+    paginated_cases = WorkQueueService.queue(stages, page, limit)
+    return jsonify({
+        "stages": [s.name for s in stages],
+        "cases": [serialize_return_case_summary(c) for c in paginated_cases.items],
+        "totalPages": paginated_cases.pages,
+        "currentPage": paginated_cases.page,
+        "totalItems": paginated_cases.total,
+        "hasNext": paginated_cases.has_next,
+        "hasPrev": paginated_cases.has_prev
+    })
+
+@return_case_bp.route('/stage-counts', methods=['GET'])
+@jwt_required()
+def get_stage_counts():
+    """Open case count per stage for the board header"""
+    # Every case write advances the change counter, so it doubles as the ETag
+    # and a poll that finds nothing new costs one single-row read
+    etag = hashlib.sha1(f"stage-counts|{current_change_seq()}".encode("utf-8")).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        counts = WorkQueueService.stage_counts()
+        response = jsonify({
+            "counts": counts,
+            "labels": {stage.name: stage.value for stage in OPEN_STAGES},
+            "totalOpen": sum(counts.values()),
+        })
+
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+@return_case_bp.route('/changes', methods=['GET'])
+@jwt_required()
+def get_return_case_changes():
+    """
+    Delta sync for the returns board: cases created, updated or deleted after
+    change sequence `since` (0 = everything). Pass the returned `next` as
+    `since` on the following call and keep calling while `hasMore` is true.
+    Renaming a product model or changing its type is a change of every case
+    using it (update_product refreshes their summary columns); editing a
+    customer's details is not a change of its cases.
+    """
+    try:
+        since = int(request.args.get('since', 0))
+        limit = min(int(request.args.get('limit', 500)), 1000)
+    except ValueError:
+        return jsonify({"error": "since ve limit tam sayı olmalıdır."}), 400
+    if since < 0 or limit < 1:
+        return jsonify({"error": "since ve limit pozitif olmalıdır."}), 400
+    summary_view = request.args.get('view', '').strip() == 'summary'
+
+    # Read the counter first: every value up to it is committed, so nothing
+    # returned below can be overtaken by a write that is still in flight
+    upper = current_change_seq()
+
+    if summary_view:
+        query = ReturnCase.query.options(joinedload(ReturnCase.customer))
+    else:
+        query = ReturnCase.query.options(
+            joinedload(ReturnCase.customer),
+            joinedload(ReturnCase.items).selectinload(ReturnCaseItem.services)
+        )
+    query = query.filter(ReturnCase.change_seq > since, ReturnCase.change_seq <= upper)
+    cases = query.order_by(ReturnCase.change_seq, ReturnCase.id).limit(limit + 1).all()
+
+    has_more = len(cases) > limit
+    if has_more:
+        # Cases written by the same flush share a value; never split them across pages
+        last_seq = cases[limit - 1].change_seq
+        cases = [c for c in cases[:limit] if c.change_seq < last_seq]
+        if not cases:
+            cases = query.filter(ReturnCase.change_seq == last_seq).order_by(ReturnCase.id).all()
+        upper = cases[-1].change_seq
+
+    live_seq = {c.id: c.change_seq for c in cases}
+    tombstones = (
+        ReturnCaseTombstone.query
+        .filter(ReturnCaseTombstone.change_seq > since, ReturnCaseTombstone.change_seq <= upper)
+        .order_by(ReturnCaseTombstone.change_seq)
+        .all()
+    )
+    serialize = serialize_return_case_summary if summary_view else serialize_return_case
+
+    return jsonify({
+        "since": since,
+        "next": max(upper, since),
+        "hasMore": has_more,
+        "created": [c.id for c in cases if c.created_seq > since],
+        "updated": [c.id for c in cases if c.created_seq <= since],
+        # An id can be reused after a delete; the newer case wins
+        "deleted": [t.case_id for t in tombstones if live_seq.get(t.case_id, 0) < t.change_seq],
+        "cases": [serialize(c) for c in cases],
+    })
+
+@return_case_bp.route('/events', methods=['GET'])
+@jwt_required()
+def stream_case_events():
+    """
+    Server-Sent Events feed of case changes ({id, type, status, previousStatus, fields}).
+    Each role only receives the stages it works on. Streams end after
+    SSE_MAX_STREAM_SECONDS and the browser's EventSource reconnects on its own.
+    With SSE_MAX_STREAMS streams already open in this worker the request is
+    refused with 503 and Retry-After; EventSource does not retry a 503 by
+    itself, so clients reopen the feed after that delay.
+    """
+    user = g.get('user')
+    if not user:
+        return jsonify({"error": "Kullanıcı bulunamadı"}), 404
+    if not case_event_streams.acquire():
+        response = jsonify({"error": "Canlı akış şu anda dolu, lütfen daha sonra tekrar deneyin."})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(current_app.config.get('SSE_RETRY_AFTER_SECONDS', 30))
+        return response
+
+    role_name = user.role.name.name
+    heartbeat = current_app.config.get('SSE_HEARTBEAT_SECONDS', 15)
+    max_seconds = current_app.config.get('SSE_MAX_STREAM_SECONDS', 300)
+    events = event_bus.subscribe(CASE_EVENTS_CHANNEL)
+
+    # Runs after the request context is gone: no g, no db.session from here on
+    def generate():
+        deadline = time.monotonic() + max_seconds
+        yield 'retry: 3000\n\n'
+        while time.monotonic() < deadline:
+            try:
+                data = events.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            payload = CaseEventService.decode(data)
+            if payload and CaseEventService.visible_to(role_name, payload):
+                yield f"event: case\ndata: {data}\n\n"
+
+    # On close rather than in the generator: a generator that never started
+    # (client gone before the first chunk) does not run its finally block
+    def close_stream():
+        event_bus.unsubscribe(CASE_EVENTS_CHANNEL, events)
+        case_event_streams.release()
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.call_on_close(close_stream)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # let proxies pass events through immediately
+    return response
+
 @return_case_bp.route('/simple', methods=['POST'])
 @permission_required(AppPermissions.CASE_CREATE)
 def create_simple_return_case():
@@ -225,10 +591,11 @@ def create_simple_return_case():
             arrival_date=datetime.strptime(arrival_date, '%Y-%m-%d'),
             receipt_method=ReceiptMethodEnum[receipt_method],
             notes=notes,
-            # workflow_status defaults to DELIVERED
         )
+        case.move_to_stage(CaseStatusEnum.DELIVERED, g.user.email)
         db.session.add(case)
         db.session.commit()
+        CaseEventService.publish_created(case)
 
         try:
             email = g.user.email
@@ -243,7 +610,7 @@ def create_simple_return_case():
 
         try:
             # Send notification to all users
-            CentaEmailService.new_return_case_notification(case.id)
+            CentaEmailService.queue_new_return_case_notification(case.id)
         except Exception as e:
             logging.error(f"Error sending notification for case {case.id}: {e}")
 
@@ -259,6 +626,7 @@ def create_simple_return_case():
 # Edit Button used by Support
 @return_case_bp.route('/<int:return_case_id>/teslim-alindi', methods=['PUT'])
 @permission_required(AppPermissions.CASE_EDIT_DELIVERED)
+@if_match_required
 def update_teslim_alindi(return_case_id):
     """Update Teslim Alındı stage information"""
     try:
@@ -289,8 +657,11 @@ def update_teslim_alindi(return_case_id):
             return_case.notes = data['notes']
         
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Teslim Alındı bilgileri güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -320,7 +691,9 @@ def complete_teslim_alindi(return_case_id):
         if not return_case.receipt_method:
             return jsonify({"error": "Teslim alma yöntemi eksik. Lütfen teslim alma yöntemini seçin."}), 400
 
-        return_case.workflow_status = CaseStatusEnum.TECHNICAL_REVIEW
+        return_case.move_to_stage(CaseStatusEnum.TECHNICAL_REVIEW, g.user.email)
+        # Write the stage change before logging so a concurrent edit surfaces as a 409 here
+        db.session.flush()
 
         # Log the action
         try:        
@@ -346,8 +719,11 @@ def complete_teslim_alindi(return_case_id):
         #     logging.error(f"Email notification error for case {return_case.id}: {e}")
         
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Teslim Alındı aşaması tamamlandı, durum Teknik İnceleme olarak güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -357,6 +733,7 @@ def complete_teslim_alindi(return_case_id):
 # Edit Button used by Technician
 @return_case_bp.route('/<int:return_case_id>/teknik-inceleme', methods=['PUT'])
 @permission_required(AppPermissions.CASE_EDIT_TECHNICAL_REVIEW)
+@if_match_required
 def update_teknik_inceleme(return_case_id):
     """Update Teknik İnceleme stage information"""
     try:
@@ -441,9 +818,15 @@ def update_teknik_inceleme(return_case_id):
                         )
                         db.session.add(service_item)
         
+        db.session.flush()
+        return_case.refresh_summary()
+
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Teknik İnceleme bilgileri güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -515,7 +898,9 @@ def complete_teknik_inceleme(return_case_id):
         if not return_case.performed_services or not return_case.performed_services.strip():
             return jsonify({"error": "Teknik servis notu eksik. Lütfen teknik servis notunu belirtin."}), 400
 
-        return_case.workflow_status = CaseStatusEnum.PAYMENT_COLLECTION
+        return_case.move_to_stage(CaseStatusEnum.PAYMENT_COLLECTION, g.user.email)
+        # Write the stage change before logging so a concurrent edit surfaces as a 409 here
+        db.session.flush()
         try:
             email = g.user.email
             LogService.log_return_case_action(
@@ -536,8 +921,11 @@ def complete_teknik_inceleme(return_case_id):
         #     logging.error(f"Email notification error for case {return_case.id}: {e}")
 
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Teknik İnceleme aşaması tamamlandı, durum Ödeme Tahsilatı olarak güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -547,6 +935,7 @@ def complete_teknik_inceleme(return_case_id):
 # Edit Button used by Support
 @return_case_bp.route('/<int:return_case_id>/odeme-tahsilati', methods=['PUT'])
 @permission_required(AppPermissions.CASE_EDIT_PAYMENT_COLLECTION)
+@if_match_required
 def update_odeme_tahsilati(return_case_id):
     """Update Ödeme Tahsilatı stage information"""
     try:
@@ -563,8 +952,11 @@ def update_odeme_tahsilati(return_case_id):
                 return_case.payment_status = PaymentStatusEnum[payment_status_key]
 
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Ödeme tahsilatı bilgileri güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -592,7 +984,9 @@ def complete_odeme_tahsilati(return_case_id):
         if return_case.payment_status not in [PaymentStatusEnum.waived, PaymentStatusEnum.paid]:
             return jsonify({"error": "Ödeme tahsilatı aşaması tamamlanamaz. Ödeme durumu 'Ücretsiz' veya 'Ödendi' olmalıdır."}), 400
 
-        return_case.workflow_status = CaseStatusEnum.SHIPPING
+        return_case.move_to_stage(CaseStatusEnum.SHIPPING, g.user.email)
+        # Write the stage change before logging so a concurrent edit surfaces as a 409 here
+        db.session.flush()
         # Log the action
         try:
             email = g.user.email
@@ -614,8 +1008,11 @@ def complete_odeme_tahsilati(return_case_id):
         # except Exception as e:
         #     logging.error(f"Email notification error for case {return_case.id}: {e}")
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Ödeme tahsilatı aşaması tamamlandı, durum Kargoya Veriliyor olarak güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -626,6 +1023,7 @@ def complete_odeme_tahsilati(return_case_id):
 # Edit Button used by Logistics
 @return_case_bp.route('/<int:return_case_id>/kargoya-verildi', methods=['PUT'])
 @permission_required(AppPermissions.CASE_EDIT_SHIPPING)
+@if_match_required
 def update_kargoya_verildi(return_case_id):
     """Update Kargoya Verildi stage information"""
     try:
@@ -648,8 +1046,11 @@ def update_kargoya_verildi(return_case_id):
             return_case.shipping_date = datetime.strptime(data['shippingDate'], '%Y-%m-%d').date()
 
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Kargo bilgileri güncellendi"}), 200
         
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -680,7 +1081,9 @@ def complete_kargoya_verildi(return_case_id):
         if not return_case.shipping_date:
             return jsonify({"error": "Kargo tarihi eksik. Lütfen kargo tarihini belirtin."}), 400
 
-        return_case.workflow_status = CaseStatusEnum.COMPLETED
+        return_case.move_to_stage(CaseStatusEnum.COMPLETED, g.user.email)
+        # Write the stage change before logging so a concurrent edit surfaces as a 409 here
+        db.session.flush()
         # Log the action
         try:
             email = g.user.email
@@ -703,8 +1106,11 @@ def complete_kargoya_verildi(return_case_id):
         #     logging.error(f"Email notification error for case {return_case.id}: {e}")
 
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Kargoya Verildi aşaması tamamlandı, durum Tamamlandı olarak güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -714,6 +1120,7 @@ def complete_kargoya_verildi(return_case_id):
 # Edit Button used by Support
 @return_case_bp.route('/<int:return_case_id>/tamamlandi', methods=['PUT'])
 @jwt_required()
+@if_match_required
 def update_tamamlandi(return_case_id):
     """Update Tamamlandı stage information"""
     try:
@@ -729,8 +1136,11 @@ def update_tamamlandi(return_case_id):
             return_case.payment_status = PaymentStatusEnum[payment_key]
 
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Tamamlandı bilgileri güncellendi"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -754,9 +1164,9 @@ def complete_tamamlandi(return_case_id):
         if not return_case.payment_status:
             return jsonify({"error": "Ödeme durumu eksik. Lütfen ödeme durumunu belirtin."}), 400
 
-        return_case.workflow_status = CaseStatusEnum.COMPLETED
+        return_case.move_to_stage(CaseStatusEnum.COMPLETED, g.user.email)
         try:
-            CentaEmailService.send_case_completion_notification(
+            CentaEmailService.queue_case_completion_notification(
                 case_id=return_case.id,
                 completed_by=current_user_name
             )
@@ -764,8 +1174,11 @@ def complete_tamamlandi(return_case_id):
             logging.error(f"Email notification error for case {return_case.id}: {e}")
 
         db.session.commit()
+        CaseEventService.publish_changes(return_case)
         return jsonify({"message": "Tamamlandı aşaması tamamlandı"}), 200
 
+    except StaleDataError:
+        return case_conflict(return_case_id)
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": f"Bir hata oluştu: {str(e)}"}), 500
@@ -799,8 +1212,10 @@ def delete_return_case(return_case_id):
         UserActionLog.query.filter_by(return_case_id=return_case_id).delete()
         
         # Then delete the return case
+        deleted_status = return_case.workflow_status
         db.session.delete(return_case)
         db.session.commit()
+        CaseEventService.publish_deleted(return_case_id, deleted_status)
         return jsonify({'msg': f'Vaka {return_case_id} başarıyla silindi.'}), 200
     except Exception as e:
         db.session.rollback()
@@ -833,16 +1248,14 @@ def send_customer_email(return_case_id):
         if not customer:
             return jsonify({"error": "Müşteri bilgisi bulunamadı"}), 404
 
-        # Import the email service
-        from services.email_service import CentaEmailService
-        
-        # Send the email using the provided recipient email
-        if CentaEmailService.send_custom_customer_email(
+        # Send the email using the provided recipient email; the upstream call
+        # runs on the shared email transport, not on this request thread
+        if CentaEmailService.queue_custom_customer_email(
             recipient_email, 
             return_case_id, 
             email_content
         ):
-            return jsonify({"message": "E-posta başarıyla gönderildi"}), 200
+            return jsonify({"message": "E-posta gönderilmek üzere sıraya alındı"}), 202
         else:
             return jsonify({"error": "E-posta gönderilemedi"}), 500
 
@@ -862,14 +1275,12 @@ def get_service_definitions(product_type):
         
         product_type_enum = ProductTypeEnum[product_type]
         
-        # Get service definitions for this product type
-        service_definitions = ServiceDefinition.query.filter_by(product_type=product_type_enum).all()
-        
+        # Served from the reference catalog, no query per modal open
         services = [{
-            "id": sd.id,
-            "service_name": sd.service_name,
-            "product_type": sd.product_type.value
-        } for sd in service_definitions]
+            "id": sd["id"],
+            "service_name": sd["service_name"],
+            "product_type": sd["product_type"].value
+        } for sd in reference_catalog.service_definitions_for(product_type_enum)]
         
         return jsonify({"services": services}), 200
         
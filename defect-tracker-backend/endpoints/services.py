@@ -2,7 +2,10 @@ import logging
 from flask import Blueprint, request, jsonify, g
 from flask_jwt_extended import jwt_required
 from permissions import permission_required
+from conditional import conditional_get
 from services.log_service import LogService
+from services.usage_service import UsageService
+from services.catalog import reference_catalog
 from models import ActionType
 
 # Import your db instance and models
@@ -12,6 +15,7 @@ service_bp = Blueprint("service", __name__, url_prefix="/services")
 
 @service_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get(ServiceDefinition, ReturnCaseItemService)
 def get_services():
     """
     Retrieve a paginated and searchable list of service definitions.
@@ -37,11 +41,13 @@ def get_services():
         
         paginated_services = query.paginate(page=page, per_page=limit, error_out=False)
         
+        usage_counts = UsageService.service_usage_counts(s.id for s in paginated_services.items)
         services_list = [
             {
                 'id': s.id,
                 'service_name': s.service_name,
-                'product_type': s.product_type.value # Send the user-friendly value
+                'product_type': s.product_type.value, # Send the user-friendly value
+                'usage_count': usage_counts.get(s.id, 0)
             }
             for s in paginated_services.items
         ]
@@ -78,6 +84,7 @@ def create_service():
     )
     db.session.add(new_service)
     db.session.commit()
+    reference_catalog.refresh()
 
     try:
         email = g.user.email
@@ -99,12 +106,12 @@ def delete_service(service_id):
     
     try:
         # Check if the service is being used by any return case items
-        service_usage = ReturnCaseItemService.query.filter_by(service_definition_id=service_id).first()
-        if service_usage:
+        if UsageService.service_in_use(service_id):
             return jsonify({"msg": "Bu servis kullanımda olduğu için silinemez."}), 400
         
         db.session.delete(service)
         db.session.commit()
+        reference_catalog.refresh()
         
         return jsonify({"msg": "Servis başarıyla silindi"}), 200
     except Exception as e:
@@ -1,15 +1,17 @@
 import datetime
+import hashlib
 from math import ceil
 from types import NoneType
 from sqlalchemy import or_
 import secrets
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, g, request, jsonify
 from flask_jwt_extended import create_access_token, set_access_cookies, unset_jwt_cookies, get_jwt_identity, jwt_required, get_jwt
-from flask_mail import Message
-from models import AppPermissions, Permission, Role, RolePermission, User, UserRole, db, mail
+from models import AppPermissions, Permission, Role, RolePermission, User, UserRole, db
 import re
 from permissions import permission_required
 from services.email_service import CentaEmailService
+from services.password_service import password_service, login_rate_limiter
+from services.permission_cache import role_permission_cache
 
 URL_BASE = 'http://localhost:5000'
 
@@ -64,7 +66,7 @@ def accept_invitation():
 
         # Send welcome email after successful account activation
         try:
-            CentaEmailService.send_welcome_email(user.email, user.first_name)
+            CentaEmailService.queue_welcome_email(user.email, user.first_name)
         except Exception as e:
             print(f"Error sending welcome email: {e}")
             # Don't fail the account activation if email fails
@@ -112,12 +114,23 @@ def login():
     if not email or not password:
         return jsonify({"msg": "E-posta ve şifre gereklidir"}), 400
     
+    # Refuse before doing any bcrypt work if this email is locked out
+    if login_rate_limiter.is_locked(email):
+        return jsonify({"msg": "Çok fazla başarısız giriş denemesi. Lütfen birkaç dakika sonra tekrar deneyin."}), 429
+
     # Query user by email and check if the password is correct
     user = User.query.filter_by(email=email).first()
     if not user or not user.check_password(password):
+        login_rate_limiter.record_failure(email)
         return jsonify({"msg": "E-posta veya şifre yanlış! Lütfen tekrar deneyin."}), 400
 
+    login_rate_limiter.reset(email)
+
     try:
+        # Upgrade hashes made with a different cost factor
+        if password_service.needs_rehash(user.password_hash):
+            user.set_password(password)
+
         # Update last login time
         user.last_login = datetime.datetime.utcnow()
         db.session.commit()
@@ -159,12 +172,9 @@ def forgot_password():
 
     reset_url = f" https://centa-returns-frontend-production.up.railway.app/reset-password?token={token}"
 
-    try:
-        CentaEmailService.send_password_reset(user.email, user.first_name, reset_url)
-    except Exception as e:
-        # Log the error and return a generic message
-        print(f"Error sending email: {e}")
-        return jsonify({"msg": "E-posta gönderilirken bir hata oluştu."}, {"error": str(e)}), 500
+    # Queued on the shared email transport; failures are logged there
+    if not CentaEmailService.queue_password_reset(user.email, user.first_name, reset_url):
+        return jsonify({"msg": "E-posta gönderilirken bir hata oluştu."}), 500
 
     return jsonify(msg="Bu e-posta adresi mevcutsa, sıfırlama bağlantısı gönderildi."), 200
     
@@ -198,11 +208,7 @@ def reset_password():
     user.reset_token_expiry = None
     db.session.commit()
 
-    try:
-        CentaEmailService.send_password_reset_confirmation(user.email, user.first_name)
-    except Exception as e:
-        # Log the error and return a generic message
-        print(f"Error sending email: {e}")
+    if not CentaEmailService.queue_password_reset_confirmation(user.email, user.first_name):
         return jsonify(msg="Şifre başarıyla sıfırlandı, ancak onay e-postası gönderilemedi."), 200
 
     return jsonify(msg="Şifre başarıyla sıfırlandı"), 200
@@ -219,39 +225,37 @@ def whoami():
     identity = get_jwt_identity() # typically the user's email
     claims = get_jwt()            # custom fields added with `additional_claims`
 
-    # Get user from database
-    user = User.query.filter_by(email=identity).first()
+    # Loaded (with its role) by the app's load_user hook
+    user = g.get("user")
     if not user:
         return jsonify({"msg": "Kullanıcı bulunamadı"}), 404
-    
-    # Get permission ids from database
-    role_id = user.role_id
-    permission_ids = [
-        pid for (pid,) in
-        RolePermission.query
-            .filter_by(role_id=role_id)
-            .with_entities(RolePermission.permission_id)
-            .all()
-    ]
-    permissions = (
-        Permission.query
-        .filter(Permission.id.in_(permission_ids))
-        .all()
-    )
-
-    # Get permission names from database
-    permission_names = [perm.name.name for perm in permissions] 
-
-    # Return response
-    response =  {
-        "email": identity,
-        "firstName": claims.get("name"),
-        "lastName": claims.get("surname"),
-        "role": claims.get("role"),
-        "permissions": permission_names
-    }
-    
-    return jsonify(response), 200
+
+    # Permission names come from the per-worker role cache; the ETag changes
+    # with the token claims, the role's permissions and the notification setting
+    etag = hashlib.sha1("|".join([
+        identity,
+        str(claims.get("name")),
+        str(claims.get("surname")),
+        str(claims.get("role")),
+        role_permission_cache.version(user.role_id),
+        str(user.email_notifications_enabled),
+    ]).encode("utf-8")).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify({
+            "email": identity,
+            "firstName": claims.get("name"),
+            "lastName": claims.get("surname"),
+            "role": claims.get("role"),
+            "permissions": sorted(p.name for p in role_permission_cache.permissions(user.role_id)),
+            "emailNotificationsEnabled": user.email_notifications_enabled,
+        })
+
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 @user_bp.route('/logout', methods=['POST'])
 @jwt_required()
@@ -3,12 +3,15 @@ from flask_jwt_extended import jwt_required
 from models import UserActionLog, db, User
 from sqlalchemy import desc, cast, String
 from permissions import permission_required
+from conditional import conditional_get
+from serializers import serialize_user_action_log
 from models import AppPermissions
 
 user_action_logs_bp = Blueprint('user_action_logs', __name__, url_prefix='/user-action-logs')
 
 @user_action_logs_bp.route('', methods=['GET'])
 @permission_required(AppPermissions.PAGE_VIEW_CASE_TRACKING)
+@conditional_get(UserActionLog, User)
 def get_user_action_logs():
     try:
         # Get pagination parameters
@@ -34,27 +37,7 @@ def get_user_action_logs():
         # Use paginate method like in products endpoint
         paginated_logs = query.order_by(desc(UserActionLog.created_at)).paginate(page=page, per_page=limit, error_out=False)
         
-        # Convert to dictionary format manually
-        logs_data = []
-        for log in paginated_logs.items:
-            try:
-                # Get user name from the joined User table
-                user_name = f"{log.user.first_name} {log.user.last_name}" if log.user and log.user.first_name and log.user.last_name else log.user_email
-                
-                log_dict = {
-                    'id': log.id,
-                    'user_email': log.user_email,
-                    'user_name': user_name,
-                    'return_case_id': log.return_case_id,
-                    'action_type': log.action_type.value if hasattr(log.action_type, 'value') else str(log.action_type),
-                    'additional_info': log.additional_info,
-                    'created_at': log.created_at.isoformat() + 'Z' if log.created_at else None
-                }
-                logs_data.append(log_dict)
-            except Exception as log_error:
-                print(f"Error processing log {log.id}: {log_error}")
-                # Skip this log if there's an error
-                continue
+        logs_data = [serialize_user_action_log(log) for log in paginated_logs.items]
         
         return jsonify({
             'logs': logs_data,
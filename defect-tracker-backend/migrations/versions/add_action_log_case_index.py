@@ -0,0 +1,26 @@
+"""index a case's action log entries for the case detail endpoint
+
+Revision ID: add_action_log_case_index
+Revises: add_case_search
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_action_log_case_index'
+down_revision = 'add_case_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_action_logs', schema=None) as batch_op:
+        batch_op.create_index('ix_user_action_logs_case_recent', ['return_case_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_action_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_action_logs_case_recent')
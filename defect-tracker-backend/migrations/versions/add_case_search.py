@@ -0,0 +1,51 @@
+"""full-text search over return cases, exact tracking number lookups
+
+Revision ID: add_case_search
+Revises: add_coalesced_results
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_case_search'
+down_revision = 'add_coalesced_results'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('customer_name', sa.String(length=100), nullable=True))
+        batch_op.create_index(batch_op.f('ix_return_cases_tracking_number'), ['tracking_number'], unique=False)
+
+    op.execute("""
+        UPDATE return_cases SET customer_name = (
+            SELECT c.name FROM customers c WHERE c.id = return_cases.customer_id
+        )
+    """)
+
+    # Same definition as models.SEARCH_VECTOR_DDL
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE return_cases ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('turkish', translate(coalesce(customer_name, ''), 'IİÇĞÖŞÜ', 'ıiçğöşü')), 'A') ||
+                setweight(to_tsvector('turkish', translate(coalesce(tracking_number, ''), 'IİÇĞÖŞÜ', 'ıiçğöşü')), 'A') ||
+                setweight(to_tsvector('turkish', translate(coalesce(notes, ''), 'IİÇĞÖŞÜ', 'ıiçğöşü')), 'B') ||
+                setweight(to_tsvector('turkish', translate(coalesce(performed_services, ''), 'IİÇĞÖŞÜ', 'ıiçğöşü')), 'B') ||
+                setweight(to_tsvector('turkish', translate(coalesce(shipping_info, ''), 'IİÇĞÖŞÜ', 'ıiçğöşü')), 'C')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_return_cases_search_vector ON return_cases USING gin (search_vector)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX ix_return_cases_search_vector")
+        op.execute("ALTER TABLE return_cases DROP COLUMN search_vector")
+
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_return_cases_tracking_number'))
+        batch_op.drop_column('customer_name')
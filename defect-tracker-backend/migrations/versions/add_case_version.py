@@ -0,0 +1,26 @@
+"""version column for optimistic locking of return cases
+
+Revision ID: add_case_version
+Revises: add_open_case_indexes
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_case_version'
+down_revision = 'add_open_case_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,54 @@
+"""change sequence and tombstones for delta sync of return cases
+
+Revision ID: add_change_sequence
+Revises: add_usage_indexes
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_change_sequence'
+down_revision = 'add_usage_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'change_counters',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.create_table(
+        'return_case_tombstones',
+        sa.Column('case_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('case_id'),
+    )
+    with op.batch_alter_table('return_case_tombstones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_return_case_tombstones_change_seq'), ['change_seq'], unique=False)
+
+    # Existing cases all start at 1, so a client syncing from 0 receives them once
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=False, server_default='1'))
+        batch_op.add_column(sa.Column('created_seq', sa.BigInteger(), nullable=False, server_default='1'))
+        batch_op.create_index(batch_op.f('ix_return_cases_change_seq'), ['change_seq'], unique=False)
+
+    op.execute("INSERT INTO change_counters (name, value) VALUES ('return_cases', 1)")
+
+
+def downgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_return_cases_change_seq'))
+        batch_op.drop_column('created_seq')
+        batch_op.drop_column('change_seq')
+
+    with op.batch_alter_table('return_case_tombstones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_return_case_tombstones_change_seq'))
+    op.drop_table('return_case_tombstones')
+    op.drop_table('change_counters')
@@ -0,0 +1,35 @@
+"""short-lived report results shared between workers
+
+Revision ID: add_coalesced_results
+Revises: add_case_version
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_coalesced_results'
+down_revision = 'add_case_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'coalesced_results',
+        sa.Column('key', sa.String(length=40), nullable=False),
+        sa.Column('body', sa.LargeBinary(), nullable=False),
+        sa.Column('mimetype', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    with op.batch_alter_table('coalesced_results', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_coalesced_results_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('coalesced_results', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_coalesced_results_created_at'))
+    op.drop_table('coalesced_results')
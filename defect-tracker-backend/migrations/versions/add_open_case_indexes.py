@@ -0,0 +1,32 @@
+"""partial index over open return cases for work queues and stage counters
+
+Revision ID: add_open_case_indexes
+Revises: add_stage_transitions
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_open_case_indexes'
+down_revision = 'add_stage_transitions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_return_cases_open_stage_age',
+            ['workflow_status', 'stage_changed_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text("workflow_status <> 'COMPLETED'"),
+            sqlite_where=sa.text("workflow_status <> 'COMPLETED'"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.drop_index('ix_return_cases_open_stage_age')
@@ -0,0 +1,41 @@
+"""add typed production_month to return_case_items
+
+Revision ID: add_production_month
+Revises: add_updated_at_tracking
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_production_month'
+down_revision = 'add_updated_at_tracking'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('return_case_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('production_month', sa.Date(), nullable=True))
+        batch_op.create_index(
+            'ix_return_case_items_product_model_production_month',
+            ['product_model_id', 'production_month'],
+            unique=False,
+        )
+
+    # production_date holds "YYYY-MM" (older rows "MM-YYYY"); anything else stays NULL
+    op.execute("""
+        UPDATE return_case_items
+        SET production_month = CASE
+            WHEN production_date ~ '^[0-9]{4}-(0[1-9]|1[0-2])$' THEN to_date(production_date, 'YYYY-MM')
+            WHEN production_date ~ '^(0[1-9]|1[0-2])-[0-9]{4}$' THEN to_date(production_date, 'MM-YYYY')
+        END
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('return_case_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_return_case_items_product_model_production_month')
+        batch_op.drop_column('production_month')
@@ -0,0 +1,28 @@
+"""index production_month on its own for the cohort report
+
+Revision ID: add_production_month_index
+Revises: add_table_versions
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_production_month_index'
+down_revision = 'add_table_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The (product_model_id, production_month) index only helps when a model
+    # is given; the cohort report filters on the month range alone by default
+    with op.batch_alter_table('return_case_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_return_case_items_production_month'), ['production_month'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('return_case_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_return_case_items_production_month'))
@@ -0,0 +1,65 @@
+"""add denormalized list summary columns to return_cases
+
+Revision ID: add_return_case_summary
+Revises: add_production_month
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_return_case_summary'
+down_revision = 'add_production_month'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('product_types', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('primary_product_model', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('services_performed_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('stage_changed_at', sa.DateTime(), nullable=True))
+
+    # Same rules as ReturnCase.refresh_summary()
+    op.execute("""
+        UPDATE return_cases rc SET
+            item_count = COALESCE((
+                SELECT SUM(i.product_count) FROM return_case_items i WHERE i.return_case_id = rc.id
+            ), 0),
+            product_types = (
+                SELECT string_agg(DISTINCT pm.product_type::text, ',' ORDER BY pm.product_type::text)
+                FROM return_case_items i JOIN product_models pm ON pm.id = i.product_model_id
+                WHERE i.return_case_id = rc.id
+            ),
+            primary_product_model = (
+                SELECT pm.name
+                FROM return_case_items i JOIN product_models pm ON pm.id = i.product_model_id
+                WHERE i.return_case_id = rc.id
+                GROUP BY pm.name
+                ORDER BY SUM(i.product_count) DESC, MIN(i.id)
+                LIMIT 1
+            ),
+            services_performed_count = (
+                SELECT COUNT(*)
+                FROM return_case_item_services s JOIN return_case_items i ON i.id = s.return_case_item_id
+                WHERE i.return_case_id = rc.id AND s.is_performed
+            ),
+            stage_changed_at = COALESCE((
+                SELECT MAX(l.created_at) FROM user_action_logs l
+                WHERE l.return_case_id = rc.id
+                  AND (l.action_type::text LIKE 'STAGE_%%' OR l.action_type::text = 'CASE_COMPLETED')
+            ), rc.updated_at, rc.arrival_date)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('return_cases', schema=None) as batch_op:
+        batch_op.drop_column('stage_changed_at')
+        batch_op.drop_column('services_performed_count')
+        batch_op.drop_column('primary_product_model')
+        batch_op.drop_column('product_types')
+        batch_op.drop_column('item_count')
@@ -0,0 +1,77 @@
+"""return case stage transition history, backfilled from user_action_logs
+
+Revision ID: add_stage_transitions
+Revises: add_change_sequence
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_stage_transitions'
+down_revision = 'add_change_sequence'
+branch_labels = None
+depends_on = None
+
+CASE_STATUSES = ('DELIVERED', 'TECHNICAL_REVIEW', 'PAYMENT_COLLECTION', 'SHIPPING', 'COMPLETED')
+
+# Stage-completion log entries and the transition each one stands for
+LOGGED_TRANSITIONS = (
+    ('CASE_CREATED', None, 'DELIVERED'),
+    ('STAGE_DELIVERED_COMPLETED', 'DELIVERED', 'TECHNICAL_REVIEW'),
+    ('STAGE_TECHNICAL_REVIEW_COMPLETED', 'TECHNICAL_REVIEW', 'PAYMENT_COLLECTION'),
+    ('STAGE_PAYMENT_COLLECTION_COMPLETED', 'PAYMENT_COLLECTION', 'SHIPPING'),
+    ('STAGE_SHIPPING_COMPLETED', 'SHIPPING', 'COMPLETED'),
+)
+
+
+def upgrade():
+    # The casestatusenum type already exists for return_cases.workflow_status
+    case_status = sa.Enum(*CASE_STATUSES, name='casestatusenum').with_variant(
+        postgresql.ENUM(*CASE_STATUSES, name='casestatusenum', create_type=False), 'postgresql'
+    )
+    op.create_table(
+        'return_case_stage_transitions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('return_case_id', sa.Integer(), nullable=False),
+        sa.Column('from_status', case_status, nullable=True),
+        sa.Column('to_status', case_status, nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.Column('user_email', sa.String(length=254), nullable=True),
+        sa.ForeignKeyConstraint(['return_case_id'], ['return_cases.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('return_case_stage_transitions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_return_case_stage_transitions_changed_at'), ['changed_at'], unique=False)
+        batch_op.create_index('ix_return_case_stage_transitions_case_changed_at', ['return_case_id', 'changed_at'], unique=False)
+
+    status_type = 'casestatusenum' if op.get_bind().dialect.name == 'postgresql' else 'VARCHAR(18)'
+
+    def status(name):
+        return f"CAST('{name}' AS {status_type})" if name else 'NULL'
+
+    from_status = ' '.join(f"WHEN '{action}' THEN {status(old)}" for action, old, _ in LOGGED_TRANSITIONS)
+    to_status = ' '.join(f"WHEN '{action}' THEN {status(new)}" for action, _, new in LOGGED_TRANSITIONS)
+    actions = ', '.join(f"'{action}'" for action, _, _ in LOGGED_TRANSITIONS)
+    op.execute(f"""
+        INSERT INTO return_case_stage_transitions (return_case_id, from_status, to_status, changed_at, user_email)
+        SELECT l.return_case_id,
+               CASE CAST(l.action_type AS VARCHAR(50)) {from_status} END,
+               CASE CAST(l.action_type AS VARCHAR(50)) {to_status} END,
+               l.created_at,
+               l.user_email
+        FROM user_action_logs l
+        JOIN return_cases c ON c.id = l.return_case_id
+        WHERE CAST(l.action_type AS VARCHAR(50)) IN ({actions})
+        ORDER BY l.created_at, l.id
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('return_case_stage_transitions', schema=None) as batch_op:
+        batch_op.drop_index('ix_return_case_stage_transitions_case_changed_at')
+        batch_op.drop_index(batch_op.f('ix_return_case_stage_transitions_changed_at'))
+    op.drop_table('return_case_stage_transitions')
@@ -0,0 +1,32 @@
+"""per-table version counters for conditional GETs
+
+Revision ID: add_table_versions
+Revises: add_action_log_case_index
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_table_versions'
+down_revision = 'add_action_log_case_index'
+branch_labels = None
+depends_on = None
+
+TABLES = (
+    'roles', 'permissions', 'role_permissions', 'users', 'customers', 'product_models',
+    'return_cases', 'return_case_items', 'return_case_stage_transitions', 'user_action_logs',
+    'service_definitions', 'return_case_item_services', 'return_case_tombstones',
+)
+
+
+def upgrade():
+    # Rows exist up front so the first writers of a table do not race to insert them
+    change_counters = sa.table('change_counters', sa.column('name', sa.String), sa.column('value', sa.BigInteger))
+    op.bulk_insert(change_counters, [{'name': f'table:{name}', 'value': 1} for name in TABLES])
+
+
+def downgrade():
+    op.execute("DELETE FROM change_counters WHERE name LIKE 'table:%'")
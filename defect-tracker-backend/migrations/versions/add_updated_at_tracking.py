@@ -0,0 +1,36 @@
+"""add updated_at tracking for conditional GETs
+
+Revision ID: add_updated_at_tracking
+Revises: add_email_notifications
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_updated_at_tracking'
+down_revision = 'add_email_notifications'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['return_cases', 'return_case_items', 'customers', 'product_models']
+
+
+def upgrade():
+    # Existing rows start out as "modified now"; new writes are stamped by the ORM
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now())
+            )
+            batch_op.create_index(batch_op.f(f'ix_{table}_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_updated_at'))
+            batch_op.drop_column('updated_at')
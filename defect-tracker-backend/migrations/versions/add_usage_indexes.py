@@ -0,0 +1,32 @@
+"""index return_case_item_services.service_definition_id for usage checks
+
+Revision ID: add_usage_indexes
+Revises: add_return_case_summary
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_usage_indexes'
+down_revision = 'add_return_case_summary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # return_cases.customer_id is already indexed and return_case_items.product_model_id
+    # leads ix_return_case_items_product_model_production_month
+    with op.batch_alter_table('return_case_item_services', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_return_case_item_services_service_definition_id'),
+            ['service_definition_id'],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('return_case_item_services', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_return_case_item_services_service_definition_id'))
@@ -1,13 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_mail import Mail
 from flask_migrate import Migrate
-from flask_bcrypt import Bcrypt 
-from datetime import datetime, timezone
+from sqlalchemy import DDL, event, insert, inspect, update
+from sqlalchemy.orm import validates
+from datetime import date, datetime, timezone
 from enum import Enum, auto
+from services.password_service import password_service
+from db_routing import RoutingSession
 
-db = SQLAlchemy()
-mail = Mail()
-bcrypt = Bcrypt()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 class UserRole(Enum):
@@ -103,24 +103,14 @@ class User(db.Model):
     email_notifications_enabled = db.Column(db.Boolean, default=True, nullable=False)
 
     def set_password(self, pw):
-        self.password_hash = bcrypt.generate_password_hash(pw).decode('utf-8')
+        self.password_hash = password_service.hash_password(pw)
 
     def check_password(self, pw):
-        return bcrypt.check_password_hash(self.password_hash, pw)
+        return password_service.check_password(self.password_hash, pw)
 
     def to_dict(self):
-        return {
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'role': self.role.name.value,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-            'accepted_at': self.accepted_at.isoformat() if self.accepted_at else None,
-            'invited_by': self.invited_by,
-            'invited_at': self.invited_at.isoformat() if self.invited_at else None,
-            'is_active': bool(self.password_hash),  # User is active if they have a password
-            'email_notifications_enabled': self.email_notifications_enabled
-        }
+        from serializers import serialize_user
+        return serialize_user(self)
 
 class Customers(db.Model):
     __tablename__ = 'customers'
@@ -130,6 +120,7 @@ class Customers(db.Model):
     contact_info = db.Column(db.String(200), nullable=True)
     address = db.Column(db.String(200), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 class ProductTypeEnum(Enum):
     overload = 'Aşırı Yük Sensörü'
@@ -141,6 +132,7 @@ class ProductModel(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     product_type = db.Column(db.Enum(ProductTypeEnum), nullable=False)
     name = db.Column(db.String(100), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 class CaseStatusEnum(Enum):
     DELIVERED = 'Teslim Alındı'
@@ -217,12 +209,41 @@ class ReturnCase(db.Model):
     #   - tracking_number
     #   - shipping_date
     shipping_info = db.Column(db.String(255), nullable=True)
-    tracking_number = db.Column(db.String(100), nullable=True)
+    tracking_number = db.Column(db.String(100), nullable=True, index=True)  # exact-match lookups in /returns/search
     shipping_date = db.Column(db.Date, nullable=True)
 
     # Current workflow status of the return case
     workflow_status = db.Column(db.Enum(CaseStatusEnum), nullable=False, default=CaseStatusEnum.DELIVERED, index=True)
 
+    # Last time any column of the case changed (used for ETags)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # --- List summary ---
+    # Denormalized from the items so the case list can be rendered without
+    # loading them; kept up to date by refresh_summary() and the
+    # workflow_status validator
+    item_count = db.Column(db.Integer, nullable=False, default=0)  # sum of product_count
+    product_types = db.Column(db.String(255), nullable=True)  # comma separated ProductTypeEnum names
+    primary_product_model = db.Column(db.String(100), nullable=True)  # model with the most units
+    services_performed_count = db.Column(db.Integer, nullable=False, default=0)
+    stage_changed_at = db.Column(db.DateTime, nullable=True, default=datetime.utcnow)
+
+    # --- Full-text search ---
+    # Copy of the customer's name (which cannot be changed) so the search
+    # vector can be a generated column of this table; set by _fill_customer_name.
+    # On PostgreSQL the table also has search_vector, see SEARCH_VECTOR_DDL
+    customer_name = db.Column(db.String(100), nullable=True)
+
+    # --- Change feed ---
+    # Value of the 'return_cases' change counter at the last write to the case,
+    # its items or their services, and at creation (see _stamp_change_seq)
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0, index=True)
+    created_seq = db.Column(db.BigInteger, nullable=False, default=0)
+
+    # Optimistic locking: bumped by every UPDATE of the row, which only
+    # succeeds if the version is still the one that was read (see concurrency.py)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
     # RELATIONSHIPS
     # Relationship to Customers; adds 'return_cases' to Customers for reverse access
     customer = db.relationship('Customers', backref=db.backref('return_cases', lazy=True))
@@ -231,10 +252,74 @@ class ReturnCase(db.Model):
     # The 'cascade' option ensures that when a ReturnCase is deleted, all its associated items are also deleted.
     items = db.relationship('ReturnCaseItem', back_populates='return_case', cascade='all, delete-orphan')
 
+    # Work queues and stage counters only look at open cases; partial indexes
+    # keep that working set small however many completed cases pile up
+    __table_args__ = (
+        db.Index(
+            'ix_return_cases_open_stage_age', 'workflow_status', 'stage_changed_at', 'id',
+            postgresql_where=db.text("workflow_status <> 'COMPLETED'"),
+            sqlite_where=db.text("workflow_status <> 'COMPLETED'"),
+        ),
+    )
+    __mapper_args__ = {'version_id_col': version}
+
+    @validates('workflow_status')
+    def _track_stage_change(self, key, value):
+        if value != self.workflow_status:
+            self.stage_changed_at = datetime.utcnow()
+        return value
+
+    def move_to_stage(self, status, user_email=None):
+        """Set workflow_status and record the transition for cycle-time reports"""
+        if status == self.workflow_status:
+            return
+        db.session.add(ReturnCaseStageTransition(
+            return_case=self,
+            from_status=self.workflow_status,
+            to_status=status,
+            user_email=user_email,
+        ))
+        self.workflow_status = status
+
+    def refresh_summary(self):
+        """Recompute the list summary columns from the items in the database (call after a flush)"""
+        rows = (
+            db.session.query(ReturnCaseItem.product_count, ProductModel.name, ProductModel.product_type)
+            .join(ProductModel, ProductModel.id == ReturnCaseItem.product_model_id)
+            .filter(ReturnCaseItem.return_case_id == self.id)
+            .order_by(ReturnCaseItem.id)
+            .all()
+        )
+        units_per_model = {}
+        for row in rows:
+            units_per_model[row.name] = units_per_model.get(row.name, 0) + (row.product_count or 0)
+
+        self.item_count = sum(units_per_model.values())
+        self.product_types = ','.join(sorted({row.product_type.name for row in rows})) or None
+        self.primary_product_model = max(units_per_model, key=units_per_model.get) if units_per_model else None
+        self.services_performed_count = (
+            db.session.query(db.func.count(ReturnCaseItemService.id))
+            .join(ReturnCaseItem, ReturnCaseItem.id == ReturnCaseItemService.return_case_item_id)
+            .filter(ReturnCaseItem.return_case_id == self.id)
+            .filter(ReturnCaseItemService.is_performed == True)
+            .scalar()
+        )
 
     def __repr__(self):
         return f'<ReturnCase id={self.id} customer_id={self.customer_id} status={self.workflow_status.value}>'
 
+def parse_production_month(value):
+    """First day of the month for "YYYY-MM" or "MM-YYYY", None if unparseable"""
+    if not value:
+        return None
+    for fmt in ("%Y-%m", "%m-%Y"):
+        try:
+            parsed = datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+        return date(parsed.year, parsed.month, 1)
+    return None
+
 class ReturnCaseItem(db.Model):
     __tablename__ = 'return_case_items'
 
@@ -245,8 +330,12 @@ class ReturnCaseItem(db.Model):
     product_model_id = db.Column(db.Integer, db.ForeignKey('product_models.id'), nullable=False)
     product_count = db.Column(db.Integer, nullable=False, default=1)
     
-    # Changed from String to Date for production date (month-year format)
-    production_date = db.Column(db.String(7), nullable=False)  # MM-YYYY format for production date
+    # Production month as entered in the form: "YYYY-MM" ("MM-YYYY" in older rows)
+    production_date = db.Column(db.String(7), nullable=False)
+
+    # Typed copy of production_date (first day of the month) for cohort reports;
+    # kept in sync by the validator below
+    production_month = db.Column(db.Date, nullable=True, index=True)
 
 
     # Warranty status of the product
@@ -267,6 +356,9 @@ class ReturnCaseItem(db.Model):
     profile_check = db.Column(db.Boolean, default=False, nullable=False)
     packaging = db.Column(db.Boolean, default=False, nullable=False)
 
+    # Last time the item changed (used for ETags)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
     
     # Relationship to the parent ReturnCase. This allows each ReturnCaseItem to access its associated ReturnCase object.
     # The 'back_populates' argument links this relationship to the 'items' relationship on the ReturnCase model,
@@ -283,10 +375,45 @@ class ReturnCaseItem(db.Model):
     services = db.relationship('ReturnCaseItemService', back_populates='return_case_item', cascade='all, delete-orphan')
 
 
+    __table_args__ = (
+        db.Index('ix_return_case_items_product_model_production_month', 'product_model_id', 'production_month'),
+    )
+
+    @validates('production_date')
+    def _sync_production_month(self, key, value):
+        self.production_month = parse_production_month(value)
+        return value
+
     def __repr__(self):
         return f'<ReturnCaseItem id={self.id} product_model_id={self.product_model_id} case_id={self.return_case_id}>'
 
 
+class ReturnCaseStageTransition(db.Model):
+    """One row per workflow stage change (from_status is NULL when the case is created)"""
+    __tablename__ = 'return_case_stage_transitions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    return_case_id = db.Column(db.Integer, db.ForeignKey('return_cases.id', ondelete='CASCADE'), nullable=False)
+    from_status = db.Column(db.Enum(CaseStatusEnum), nullable=True)
+    to_status = db.Column(db.Enum(CaseStatusEnum), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    user_email = db.Column(db.String(254), nullable=True)
+
+    return_case = db.relationship(
+        'ReturnCase',
+        backref=db.backref('stage_transitions', cascade='all, delete-orphan', order_by='ReturnCaseStageTransition.changed_at'),
+    )
+
+    # Cycle-time reports find the exits in a date range through changed_at
+    # and each exit's matching entry through the case index
+    __table_args__ = (
+        db.Index('ix_return_case_stage_transitions_case_changed_at', 'return_case_id', 'changed_at'),
+    )
+
+    def __repr__(self):
+        return f'<ReturnCaseStageTransition case_id={self.return_case_id} {self.from_status} -> {self.to_status}>'
+
+
 class ActionType(Enum):
     CASE_CREATED = "CASE_CREATED"
     PRODUCT_CREATED = "PRODUCT_CREATED"
@@ -323,20 +450,18 @@ class UserActionLog(db.Model):
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    # A case's newest actions (case detail) straight from the index, newest id first
+    __table_args__ = (
+        db.Index('ix_user_action_logs_case_recent', 'return_case_id', 'id'),
+    )
     
     def __repr__(self):
         return f'<UserActionLog id={self.id} user={self.user_email} action={self.action_type.value} case={self.return_case_id}>'
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_email': self.user_email,
-            'user_name': f"{self.user.first_name} {self.user.last_name}" if self.user else self.user_email,
-            'return_case_id': self.return_case_id,
-            'action_type': self.action_type.value,
-            'additional_info': self.additional_info,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        from serializers import serialize_user_action_log
+        return serialize_user_action_log(self)
         
 ## ADDED NEW: THESE NEW MODELS FOR SERVICES
 class ServiceDefinition(db.Model):
@@ -349,10 +474,194 @@ class ReturnCaseItemService(db.Model):
     __tablename__ = 'return_case_item_services'
     id = db.Column(db.Integer, primary_key=True)
     return_case_item_id = db.Column(db.Integer, db.ForeignKey('return_case_items.id'), nullable=False)
-    service_definition_id = db.Column(db.Integer, db.ForeignKey('service_definitions.id'), nullable=False)
+    service_definition_id = db.Column(db.Integer, db.ForeignKey('service_definitions.id'), nullable=False, index=True)
     is_performed = db.Column(db.Boolean, default=False, nullable=False)
     
     # Relationships
     return_case_item = db.relationship('ReturnCaseItem', back_populates='services')
     service_definition = db.relationship('ServiceDefinition')
 
+
+# --- Change feed ---------------------------------------------------------------
+# Every flush that writes a return case, one of its items or their services
+# stamps the case with the next value of the 'return_cases' counter, and a
+# deleted case leaves a tombstone with that value. GET /returns/changes?since=
+# returns what was stamped after the client's last value. The UPDATE keeps the
+# counter row locked until commit, so values become visible in commit order
+# and a client can never skip past a write that was still in flight.
+
+RETURN_CASE_COUNTER = 'return_cases'
+
+class ChangeCounter(db.Model):
+    __tablename__ = 'change_counters'
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+class ReturnCaseTombstone(db.Model):
+    __tablename__ = 'return_case_tombstones'
+    case_id = db.Column(db.Integer, primary_key=True)
+    change_seq = db.Column(db.BigInteger, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+def next_change_seq(session, name=RETURN_CASE_COUNTER):
+    table = ChangeCounter.__table__
+    value = session.execute(
+        update(table).where(table.c.name == name).values(value=table.c.value + 1).returning(table.c.value)
+    ).scalar()
+    if value is None:
+        # Databases built with create_all() instead of the migration
+        session.execute(insert(table).values(name=name, value=1))
+        value = 1
+    return value
+
+def current_change_seq(name=RETURN_CASE_COUNTER):
+    return db.session.query(ChangeCounter.value).filter(ChangeCounter.name == name).scalar() or 0
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _stamp_change_seq(session, flush_context, instances):
+    changed, deleted = {}, set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, ReturnCaseItemService):
+            obj = session.get(ReturnCaseItem, obj.return_case_item_id) if obj.return_case_item_id else None
+        if isinstance(obj, ReturnCaseItem):
+            obj = session.get(ReturnCase, obj.return_case_id) if obj.return_case_id else None
+        if not isinstance(obj, ReturnCase):
+            continue
+        if obj in session.deleted:
+            deleted.add(obj.id)
+        else:
+            changed[id(obj)] = obj
+    if not changed and not deleted:
+        return
+
+    seq = next_change_seq(session)
+    for case in changed.values():
+        case.change_seq = seq
+        if case in session.new:
+            case.created_seq = seq
+    for case_id in deleted:
+        session.merge(ReturnCaseTombstone(case_id=case_id, change_seq=seq, deleted_at=datetime.utcnow()))
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _fill_customer_name(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, ReturnCase):
+            continue
+        if obj.customer_name is None or 'customer_id' in inspect(obj).committed_state:
+            # customer_id is still unset when only the relationship was assigned
+            customer = session.get(Customers, obj.customer_id) if obj.customer_id else obj.customer
+            obj.customer_name = customer.name if customer else None
+
+
+# --- Table versions -------------------------------------------------------------
+# One 'table:<name>' counter per table, bumped once by every transaction that
+# writes the table (inserts, updates and deletes, including bulk ones). ETags
+# and cache keys read them instead of scanning the tables (conditional.py).
+# The bump happens right before the commit, in the same transaction, so a
+# reader never sees a new version together with old rows; counters are taken
+# in name order, so two writers cannot deadlock on them.
+
+TABLE_COUNTER_PREFIX = 'table:'
+
+def table_counter(table):
+    return TABLE_COUNTER_PREFIX + table.name
+
+def _record_tables(session, mapper):
+    session.info.setdefault('changed_tables', set()).update(table.name for table in mapper.tables)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _record_flushed_tables(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here, cascaded deletes included
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        _record_tables(session, inspect(obj).mapper)
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _record_bulk_tables(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper:
+        _record_tables(orm_execute_state.session, orm_execute_state.bind_mapper)
+
+@event.listens_for(RoutingSession, 'before_commit')
+def _bump_table_versions(session):
+    session.flush()
+    for name in sorted(session.info.pop('changed_tables', ())):
+        next_change_seq(session, TABLE_COUNTER_PREFIX + name)
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _forget_tables(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('changed_tables', None)
+
+@event.listens_for(ChangeCounter.__table__, 'after_create')
+def _seed_table_counters(target, connection, **kw):
+    # Rows exist up front so the first writers of a table do not race to insert them
+    connection.execute(insert(target), [
+        {'name': table_counter(table), 'value': 1}
+        for table in db.metadata.sorted_tables if table is not target
+    ])
+
+def table_versions(*tables):
+    """{table name: version} for the given tables in one query; 0 for a table never written"""
+    names = {table_counter(table): table.name for table in tables}
+    rows = db.session.query(ChangeCounter.name, ChangeCounter.value).filter(ChangeCounter.name.in_(names)).all()
+    versions = dict.fromkeys(names.values(), 0)
+    versions.update((names[name], value) for name, value in rows)
+    return versions
+
+
+# --- Full-text search ---------------------------------------------------------
+# PostgreSQL only: a generated tsvector over the case's text columns, stemmed
+# with the 'turkish' configuration and weighted so customer name and tracking
+# number hits rank above notes and services. It is not mapped on the model
+# (SQLite has no equivalent); queries reach it through SEARCH_VECTOR.
+#
+# Turkish capitals are folded before parsing (I -> ı, İ -> i, Ö -> ö, ...):
+# the parser lowercases by the database's ctype, which gets I/İ wrong in any
+# non-Turkish locale and leaves them all alone in the C locale. Queries go
+# through search_fold() to match.
+
+SEARCH_CONFIG = 'turkish'
+_FOLD_FROM, _FOLD_TO = 'IİÇĞÖŞÜ', 'ıiçğöşü'
+_SEARCH_FOLD = str.maketrans(_FOLD_FROM, _FOLD_TO)
+
+def search_fold(text):
+    return (text or '').translate(_SEARCH_FOLD)
+
+def _search_part(column, weight):
+    return f"setweight(to_tsvector('{SEARCH_CONFIG}', translate(coalesce({column}, ''), '{_FOLD_FROM}', '{_FOLD_TO}')), '{weight}')"
+
+SEARCH_VECTOR_DDL = (
+    DDL(
+        "ALTER TABLE return_cases ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        + " || ".join(_search_part(column, weight) for column, weight in (
+            ('customer_name', 'A'), ('tracking_number', 'A'),
+            ('notes', 'B'), ('performed_services', 'B'), ('shipping_info', 'C'),
+        ))
+        + ") STORED"
+    ),
+    DDL("CREATE INDEX ix_return_cases_search_vector ON return_cases USING gin (search_vector)"),
+)
+
+# Databases built with create_all() get the same column as the migration
+for _ddl in SEARCH_VECTOR_DDL:
+    event.listen(ReturnCase.__table__, 'after_create', _ddl.execute_if(dialect='postgresql'))
+
+SEARCH_VECTOR = db.literal_column('return_cases.search_vector')
+
+
+# --- Coalesced report results --------------------------------------------------
+# Short-lived copies of report responses, so identical requests handled by
+# other workers at the same time can reuse one execution (see
+# services/request_coalescer.py). The key includes the tables' change
+# validator, so a stored body always matches the data it was computed from.
+
+class CoalescedResult(db.Model):
+    __tablename__ = 'coalesced_results'
+    key = db.Column(db.String(40), primary_key=True)
+    body = db.Column(db.LargeBinary, nullable=False)
+    mimetype = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
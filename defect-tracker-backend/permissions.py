@@ -1,9 +1,10 @@
 from functools import wraps
 from flask_jwt_extended import jwt_required, get_jwt
-from flask import jsonify
+from flask import jsonify, current_app
 from flask import Blueprint, g
 from seed import ROLE_PERMISSIONS
-from models import Permission, RolePermission, UserRole
+from models import UserRole
+from services.permission_cache import role_permission_cache
 
 def permission_required(permission):
     def decorator(fn):
@@ -15,38 +16,12 @@ def permission_required(permission):
             if not role:
                 return jsonify({"msg": "Role missing"}), 403
             user = g.user
-            # Get the role id from the user
-            # print(f"User: {user}")
-            role_id = user.role_id
-            # print(f"Role id: {role_id}")
-            # Get the permission ids for the role
-            permission_ids = [
-                pid for (pid,) in
-                RolePermission.query
-                    .filter_by(role_id=role_id)
-                    .with_entities(RolePermission.permission_id)
-                    .all()
-            ]
-            # print(f"Permission ids: {permission_ids}")
-            # Get the permissions for the role
-            permissions = (
-                Permission.query
-                .filter(Permission.id.in_(permission_ids))
-                .all()
-            )
-            # Get permission enums from database
-            permission_enums = [perm.name for perm in permissions]
-            # print(f"Permission enums: {permission_enums}")
-            # Check if the user has the permission
-            is_allowed = any(perm.name == permission for perm in permissions)
-            # print(f"Is allowed: {is_allowed}")
-            # Debugging
-            # print(f"Allowed: {is_allowed}")
-            # print(f"Permission: {permission}")
-            # print(f"Role: {role}")
-            # If the user does not have the permission, return a 403 error
-            if not is_allowed:
+            if not user:
                 return jsonify({"msg": "Permission denied"}), 403
-            return fn(*args, **kwargs)
+            # Permissions of the user's role, cached per worker
+            if permission not in role_permission_cache.permissions(user.role_id):
+                return jsonify({"msg": "Permission denied"}), 403
+            # ensure_sync lets async views sit behind this decorator
+            return current_app.ensure_sync(fn)(*args, **kwargs)
         return wrapper
     return decorator
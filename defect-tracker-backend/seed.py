@@ -1,5 +1,7 @@
 from models import ProductTypeEnum, ServiceDefinition, User, db, UserRole, AppPermissions, Role, Permission, RolePermission
 from datetime import datetime
+from services.permission_cache import role_permission_cache
+from services.catalog import reference_catalog
 
 
 ROLE_PERMISSIONS = {
@@ -60,6 +62,7 @@ def seed_roles_permissions():
     db.session.commit()
 
     # Assign permissions to roles
+    granted = False
     for role_enum, perms in ROLE_PERMISSIONS.items():
         role = Role.query.filter_by(name=role_enum).first()
         for perm_enum in perms:
@@ -67,7 +70,11 @@ def seed_roles_permissions():
             rp = RolePermission.query.filter_by(role_id=role.id, permission_id=perm.id).first()
             if not rp:
                 db.session.add(RolePermission(role_id=role.id, permission_id=perm.id))
+                granted = True
     db.session.commit()
+    # Every worker runs this on boot; only announce an actual change
+    if granted:
+        role_permission_cache.invalidate()
 
 
 def seed_users():
@@ -147,18 +154,20 @@ def seed_services():
         ],
     }
 
+    # One load of the catalog instead of a lookup per service
+    reference_catalog.clear()
+    added = False
     for product_type, service_list in services.items():
+        existing = {sd["service_name"] for sd in reference_catalog.service_definitions_for(product_type)}
         for service_name in service_list:
-            # Check if it already exists
-            existing = ServiceDefinition.query.filter_by(
-                product_type=product_type,
-                service_name=service_name
-            ).first()
-            if not existing:
+            if service_name not in existing:
                 db.session.add(ServiceDefinition(
                     product_type=product_type,
                     service_name=service_name
                 ))
+                added = True
 
     db.session.commit()
+    if added:
+        reference_catalog.refresh()
     print("✅ Services seeded successfully")
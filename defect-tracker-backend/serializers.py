@@ -0,0 +1,221 @@
+"""
+Explicit response schemas and the app's JSON provider.
+
+Schema functions return plain dicts that may still contain Enum members,
+Decimals, dates and datetimes; the JSON provider encodes those natively
+(Enum -> its Turkish label, Decimal -> float, date/datetime -> ISO 8601),
+so the per-row work is just attribute access. orjson is used when it is
+installed, otherwise the stdlib encoder with the same conversions.
+"""
+import datetime
+import json
+from decimal import Decimal
+from enum import Enum
+
+from flask.json.provider import DefaultJSONProvider
+
+from date_format import format_iso_utc, format_tr_datetime
+from models import ProductTypeEnum
+from services.catalog import reference_catalog
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(o):
+    if isinstance(o, Enum):
+        return o.value
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, (datetime.date, datetime.datetime)):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when available"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is not None:
+            body = orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            body = self.dumps(obj).encode('utf-8')
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# --- Return cases --------------------------------------------------------
+# Product model and service names come from the reference catalog
+# (services/catalog.py), so case queries need not join those tables.
+
+def serialize_product_model(product_model_id):
+    product_model = reference_catalog.product_model(product_model_id)
+    if product_model is None:
+        return {"id": None, "name": "Bilinmeyen Ürün", "product_type": None}
+    return {
+        "id": product_model["id"],
+        "name": product_model["name"],
+        "product_type": product_model["product_type"],
+    }
+
+
+def serialize_item_service(service):
+    definition = reference_catalog.service_definition(service.service_definition_id)
+    return {
+        "id": service.id,
+        "service_definition_id": service.service_definition_id,
+        "service_name": definition["service_name"] if definition else None,
+        "is_performed": service.is_performed,
+    }
+
+
+def serialize_return_case_item(item):
+    return {
+        "id": item.id,
+        "product_model": serialize_product_model(item.product_model_id),
+        "product_count": item.product_count,
+        "production_date": item.production_date,
+        "has_control_unit": item.has_control_unit,
+        "warranty_status": item.warranty_status,
+        "fault_responsibility": item.fault_responsibility,
+        "resolution_method": item.resolution_method,
+        "cable_check": item.cable_check,
+        "profile_check": item.profile_check,
+        "packaging": item.packaging,
+        "services": [serialize_item_service(s) for s in item.services],
+    }
+
+
+def serialize_case_customer(customer):
+    if customer is None:
+        return {"id": None, "name": "Bilinmeyen Müşteri", "contact_info": None, "address": None}
+    return {
+        "id": customer.id,
+        "name": customer.name,
+        "contact_info": customer.contact_info,
+        "address": customer.address,
+    }
+
+
+def serialize_return_case(case):
+    return {
+        "id": case.id,
+        # Send back as If-Match "<id>-<version>" when editing (see concurrency.py)
+        "version": case.version,
+        "status": case.workflow_status,
+        "customer": serialize_case_customer(case.customer),
+        "arrival_date": case.arrival_date,
+        "receipt_method": case.receipt_method,
+        "notes": case.notes,
+        "shipping_info": case.shipping_info,
+        "tracking_number": case.tracking_number,
+        "shipping_date": case.shipping_date,
+        "payment_status": case.payment_status,
+        "yedek_parca": case.yedek_parca if case.yedek_parca is not None else 0,
+        "bakim": case.bakim if case.bakim is not None else 0,
+        "iscilik": case.iscilik if case.iscilik is not None else 0,
+        "cost": case.cost if case.cost is not None else 0,
+        "performed_services": case.performed_services,
+        "items": [serialize_return_case_item(i) for i in case.items],
+    }
+
+
+def serialize_return_case_summary(case):
+    """List row built only from the case's summary columns (no items)"""
+    return {
+        "id": case.id,
+        "version": case.version,
+        "status": case.workflow_status,
+        "customer": serialize_case_customer(case.customer),
+        "arrival_date": case.arrival_date,
+        "receipt_method": case.receipt_method,
+        "payment_status": case.payment_status,
+        "cost": case.cost if case.cost is not None else 0,
+        "item_count": case.item_count or 0,
+        "product_types": [ProductTypeEnum[name] for name in case.product_types.split(',')] if case.product_types else [],
+        "primary_product_model": case.primary_product_model,
+        "services_performed_count": case.services_performed_count or 0,
+        "stage_changed_at": format_iso_utc(case.stage_changed_at),
+    }
+
+
+# --- Customers -----------------------------------------------------------
+
+def serialize_customer(customer, return_case_count=0):
+    return {
+        'id': customer.id,
+        'name': customer.name,
+        'representative': customer.representative,
+        'contact_info': customer.contact_info,
+        'address': customer.address,
+        'created_at': format_tr_datetime(customer.created_at),
+        'created_at_iso': format_iso_utc(customer.created_at),
+        'return_case_count': return_case_count,
+    }
+
+
+# --- Users ---------------------------------------------------------------
+
+def serialize_user(user):
+    return {
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'role': user.role.name,
+        'last_login': format_iso_utc(user.last_login),
+        'accepted_at': format_iso_utc(user.accepted_at),
+        'invited_by': user.invited_by,
+        'invited_at': format_iso_utc(user.invited_at),
+        'is_active': bool(user.password_hash),  # User is active if they have a password
+        'email_notifications_enabled': user.email_notifications_enabled,
+    }
+
+
+def serialize_admin_user(user, now=None):
+    """Row of the admin dashboard's user table"""
+    now = now or datetime.datetime.utcnow()
+    return {
+        "email": user.email,
+        "firstName": user.first_name,
+        "lastName": user.last_name,
+        "role": user.role.name,
+        "createdAt": format_tr_datetime(user.accepted_at),
+        "invitedAt": format_tr_datetime(user.invited_at),
+        "lastLogin": format_tr_datetime(user.last_login),
+        "createdAtIso": format_iso_utc(user.accepted_at),
+        "invitedAtIso": format_iso_utc(user.invited_at),
+        "lastLoginIso": format_iso_utc(user.last_login),
+        "invitedBy": user.invited_by,
+        "isInvited": bool(user.invitation_token and user.invitation_expiry and user.invitation_expiry > now),
+        "isActive": bool(user.password_hash),
+        "emailNotificationsEnabled": user.email_notifications_enabled,
+    }
+
+
+# --- User action logs ----------------------------------------------------
+
+def serialize_user_action_log(log):
+    user = log.user
+    return {
+        'id': log.id,
+        'user_email': log.user_email,
+        'user_name': f"{user.first_name} {user.last_name}" if user and user.first_name and user.last_name else log.user_email,
+        'return_case_id': log.return_case_id,
+        'action_type': log.action_type,
+        'additional_info': log.additional_info,
+        'created_at': format_iso_utc(log.created_at),
+    }
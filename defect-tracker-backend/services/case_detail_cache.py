@@ -0,0 +1,52 @@
+# services/case_detail_cache.py
+import threading
+from collections import OrderedDict
+
+
+class CaseDetailCache:
+    """
+    Per-worker LRU of serialized case details (GET /returns/<id>).
+
+    Entries are stored with the validator they were built from (case
+    version, newest action log id, customer's updated_at, users' version,
+    catalog version) and only returned for
+    the same validator, so a write anywhere (any worker, any node) makes
+    the entry unreachable without being told about it. The endpoint
+    fetches the validator in one small query before every lookup.
+    """
+
+    def __init__(self):
+        self.max_entries = 512
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('CASE_DETAIL_CACHE_SIZE', self.max_entries)
+
+    def get(self, case_id, validator):
+        with self._lock:
+            entry = self._entries.get(case_id)
+            if entry is None or entry[0] != validator:
+                return None
+            self._entries.move_to_end(case_id)
+            return entry[1]
+
+    def put(self, case_id, validator, payload):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[case_id] = (validator, payload)
+            self._entries.move_to_end(case_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, case_id):
+        with self._lock:
+            self._entries.pop(case_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+case_detail_cache = CaseDetailCache()
@@ -0,0 +1,163 @@
+# services/case_events.py
+import json
+import logging
+import threading
+
+from sqlalchemy import event, inspect
+
+from db_routing import RoutingSession
+from models import CaseStatusEnum, ReturnCase, ReturnCaseItem, ReturnCaseItemService, UserRole, db
+from services.event_bus import event_bus
+
+CASE_EVENTS_CHANNEL = 'case_events'
+
+# Which stages each role follows on the live feed; roles not listed see everything
+ROLE_EVENT_STATUSES = {
+    UserRole.SUPPORT.name: {CaseStatusEnum.DELIVERED.name, CaseStatusEnum.COMPLETED.name},
+    UserRole.TECHNICIAN.name: {CaseStatusEnum.TECHNICAL_REVIEW.name},
+    UserRole.SALES.name: {CaseStatusEnum.PAYMENT_COLLECTION.name},
+    UserRole.LOGISTICS.name: {CaseStatusEnum.SHIPPING.name},
+}
+
+# Bookkeeping columns that change on every write and mean nothing to a client
+_IGNORED_FIELDS = {'updated_at', 'stage_changed_at', 'change_seq', 'created_seq'}
+
+
+class CaseEventService:
+    """
+    Compact "case changed" events for the live feed (GET /returns/events).
+
+    A before_flush hook records which ReturnCase columns each flush touched
+    (item rows count as "items"), so the changes survive the intermediate
+    commits done by LogService. Handlers call publish_* after their own
+    commit; nothing is sent for rolled back work.
+    """
+
+    @staticmethod
+    def init_app(app):
+        if not event.contains(RoutingSession, 'before_flush', CaseEventService._track):
+            event.listen(RoutingSession, 'before_flush', CaseEventService._track)
+            event.listen(RoutingSession, 'after_rollback', CaseEventService._forget)
+
+    # --- Change tracking ---------------------------------------------------
+
+    @staticmethod
+    def _track(session, flush_context, instances):
+        changes = session.info.setdefault('case_changes', {})
+
+        def entry(case_id):
+            return changes.setdefault(case_id, {'fields': set(), 'previous_status': None})
+
+        with session.no_autoflush:
+            for obj in session.dirty:
+                if not isinstance(obj, ReturnCase) or not session.is_modified(obj):
+                    continue
+                state = inspect(obj)
+                tracked = entry(obj.id)
+                for attr in state.mapper.column_attrs:
+                    history = state.attrs[attr.key].history
+                    if not history.has_changes() or attr.key in _IGNORED_FIELDS:
+                        continue
+                    tracked['fields'].add(attr.key)
+                    if attr.key == 'workflow_status' and tracked['previous_status'] is None and history.deleted:
+                        tracked['previous_status'] = history.deleted[0]
+
+            for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+                if isinstance(obj, ReturnCaseItemService):
+                    obj = session.get(ReturnCaseItem, obj.return_case_item_id) if obj.return_case_item_id else None
+                if isinstance(obj, ReturnCaseItem) and obj.return_case_id:
+                    entry(obj.return_case_id)['fields'].add('items')
+
+    @staticmethod
+    def _forget(session):
+        session.info.pop('case_changes', None)
+
+    # --- Publishing --------------------------------------------------------
+
+    @staticmethod
+    def _publish(payload):
+        try:
+            event_bus.publish(CASE_EVENTS_CHANNEL, payload)
+        except Exception as e:
+            logging.error(f"Error publishing case event for case {payload.get('id')}: {e}")
+
+    @staticmethod
+    def _payload(case_id, event_type, status, previous_status=None, fields=()):
+        return {
+            'id': case_id,
+            'type': event_type,
+            'status': status.name if status else None,
+            'statusLabel': status.value if status else None,
+            'previousStatus': previous_status.name if previous_status else None,
+            'fields': sorted(fields),
+        }
+
+    @staticmethod
+    def publish_created(return_case):
+        CaseEventService._publish(CaseEventService._payload(return_case.id, 'created', return_case.workflow_status))
+
+    @staticmethod
+    def publish_changes(return_case):
+        """Send what changed on `return_case` since the request started (no-op if nothing did)"""
+        tracked = db.session.info.get('case_changes', {}).pop(return_case.id, None)
+        if not tracked or not tracked['fields']:
+            return
+        previous_status = tracked['previous_status']
+        if previous_status == return_case.workflow_status:
+            previous_status = None
+        event_type = 'status' if previous_status else 'updated'
+        CaseEventService._publish(CaseEventService._payload(
+            return_case.id, event_type, return_case.workflow_status, previous_status, tracked['fields']
+        ))
+
+    @staticmethod
+    def publish_deleted(case_id, status):
+        CaseEventService._publish(CaseEventService._payload(case_id, 'deleted', status))
+
+    # --- Consuming ---------------------------------------------------------
+
+    @staticmethod
+    def visible_to(role_name, payload):
+        """Roles with a stage filter see events entering, inside or leaving their stages"""
+        statuses = ROLE_EVENT_STATUSES.get(role_name)
+        if statuses is None:
+            return True
+        return payload.get('status') in statuses or payload.get('previousStatus') in statuses
+
+    @staticmethod
+    def decode(data):
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+
+class StreamSlots:
+    """
+    Caps the open live feed streams per worker. A gthread worker serves
+    each stream on one of its threads for up to SSE_MAX_STREAM_SECONDS, so
+    without a cap enough open boards would leave no thread for API
+    requests. Requests beyond SSE_MAX_STREAMS are refused with 503.
+    """
+
+    def __init__(self):
+        self.limit = 8
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.limit = app.config.get('SSE_MAX_STREAMS', self.limit)
+
+    def acquire(self):
+        with self._lock:
+            if self._open >= self.limit:
+                return False
+            self._open += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._open = max(self._open - 1, 0)
+
+
+case_event_streams = StreamSlots()
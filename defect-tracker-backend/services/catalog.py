@@ -0,0 +1,177 @@
+# services/catalog.py
+import hashlib
+import json
+import threading
+import time
+
+from sqlalchemy import select
+
+from models import (
+    CaseStatusEnum, FaultResponsibilityEnum, PaymentStatusEnum, ProductModel, ProductTypeEnum,
+    ReceiptMethodEnum, ResolutionMethodEnum, ServiceDefinition, WarrantyStatusEnum, db,
+)
+from services.invalidation import invalidation_bus
+
+CATALOG_CACHE = 'catalog'
+
+# Enum value lists sent to clients as [{key, label}]
+CATALOG_ENUMS = {
+    'productType': ProductTypeEnum,
+    'caseStatus': CaseStatusEnum,
+    'receiptMethod': ReceiptMethodEnum,
+    'warrantyStatus': WarrantyStatusEnum,
+    'paymentStatus': PaymentStatusEnum,
+    'faultResponsibility': FaultResponsibilityEnum,
+    'resolutionMethod': ResolutionMethodEnum,
+}
+
+
+class _Snapshot:
+    """One immutable load of the reference tables; swapped in whole on refresh"""
+
+    def __init__(self, product_models, service_definitions):
+        self.products_by_id = {}
+        self.products_by_type = {pt: [] for pt in ProductTypeEnum}
+        for pm in sorted(product_models, key=lambda pm: (pm.name, pm.id)):
+            entry = {"id": pm.id, "name": pm.name, "product_type": pm.product_type}
+            self.products_by_id[pm.id] = entry
+            self.products_by_type[pm.product_type].append(entry)
+
+        self.services_by_id = {}
+        self.services_by_type = {pt: [] for pt in ProductTypeEnum}
+        for sd in sorted(service_definitions, key=lambda sd: sd.id):
+            entry = {"id": sd.id, "service_name": sd.service_name, "product_type": sd.product_type}
+            self.services_by_id[sd.id] = entry
+            self.services_by_type[sd.product_type].append(entry)
+
+        body = {
+            "productModels": {
+                pt.name: [{"id": e["id"], "name": e["name"]} for e in entries]
+                for pt, entries in self.products_by_type.items()
+            },
+            "serviceDefinitions": {
+                pt.name: [{"id": e["id"], "service_name": e["service_name"]} for e in entries]
+                for pt, entries in self.services_by_type.items()
+            },
+            "enums": {
+                name: [{"key": member.name, "label": member.value} for member in enum_class]
+                for name, enum_class in CATALOG_ENUMS.items()
+            },
+        }
+        encoded = json.dumps(body, sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:16]
+        self.payload = {"version": self.version, **body}
+
+
+class ReferenceCatalog:
+    """
+    Per-worker copy of the reference data: product models, service
+    definitions and the enum value lists.
+
+    The tables are tiny and change rarely, so they are read with two queries
+    on first use and then served from dicts keyed by id and by product type.
+    products.py/services.py call refresh() after their writes, which drops
+    the copy in every worker through the invalidation bus. An id that is not
+    in the copy yet (its notification still in flight) triggers a reload, at
+    most once per CATALOG_MISS_RELOAD_SECONDS so a dangling id cannot cause a
+    reload storm; CATALOG_CACHE_SECONDS bounds staleness if all else fails.
+    """
+
+    def __init__(self, ttl_seconds=300, miss_reload_seconds=5):
+        self.ttl_seconds = ttl_seconds
+        self.miss_reload_seconds = miss_reload_seconds
+        self._snapshot = None
+        self._expires_at = 0.0
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl_seconds = app.config.get('CATALOG_CACHE_SECONDS', self.ttl_seconds)
+        self.miss_reload_seconds = app.config.get('CATALOG_MISS_RELOAD_SECONDS', self.miss_reload_seconds)
+        invalidation_bus.register(CATALOG_CACHE, self.clear)
+
+    def _load(self):
+        # Always from the primary: a lagging replica would be cached for a full TTL
+        primary = {'bind': db.engine}
+        product_models = db.session.execute(
+            select(ProductModel.id, ProductModel.name, ProductModel.product_type), bind_arguments=primary
+        ).all()
+        service_definitions = db.session.execute(
+            select(ServiceDefinition.id, ServiceDefinition.service_name, ServiceDefinition.product_type),
+            bind_arguments=primary,
+        ).all()
+        return _Snapshot(product_models, service_definitions)
+
+    def _install(self, snapshot, generation=None):
+        now = time.monotonic()
+        with self._lock:
+            # Invalidated while loading: use the rows for this call, do not keep them
+            if generation is None or generation == self._generation:
+                self._snapshot = snapshot
+                self._loaded_at = now
+                self._expires_at = now + self.ttl_seconds
+        return snapshot
+
+    def _reload(self):
+        generation = self._generation
+        return self._install(self._load(), generation)
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is None or self._expires_at < time.monotonic():
+            snapshot = self._reload()
+        return snapshot
+
+    def _lookup(self, attr, key):
+        if key is None:
+            return None
+        entry = getattr(self._current(), attr).get(key)
+        if entry is None and self._loaded_at + self.miss_reload_seconds < time.monotonic():
+            entry = getattr(self._reload(), attr).get(key)
+        return entry
+
+    # --- Lookups -----------------------------------------------------------
+
+    def product_model(self, product_model_id):
+        """{id, name, product_type} or None"""
+        return self._lookup('products_by_id', product_model_id)
+
+    def service_definition(self, service_definition_id):
+        """{id, service_name, product_type} or None"""
+        return self._lookup('services_by_id', service_definition_id)
+
+    def product_models_for(self, product_type):
+        return self._current().products_by_type.get(product_type, [])
+
+    def service_definitions_for(self, product_type):
+        return self._current().services_by_type.get(product_type, [])
+
+    def payload(self):
+        """Body of GET /catalog"""
+        return self._current().payload
+
+    @property
+    def version(self):
+        """Hash of the whole catalog, used as its strong ETag"""
+        return self._current().version
+
+    # --- Invalidation ------------------------------------------------------
+
+    def refresh(self):
+        """Call after committing a product model or service definition change"""
+        # Drops this worker's copy too; the next lookup reloads it
+        invalidation_bus.invalidate(CATALOG_CACHE)
+
+    def prime(self, product_models, service_definitions):
+        """Install the given rows without touching the database (scripts, benchmarks)"""
+        self._install(_Snapshot(product_models, service_definitions))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            self._expires_at = 0.0
+
+
+reference_catalog = ReferenceCatalog()
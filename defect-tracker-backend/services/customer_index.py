@@ -0,0 +1,198 @@
+# services/customer_index.py
+import heapq
+import logging
+import threading
+
+from sqlalchemy import func, select
+
+from models import Customers, db
+from services.invalidation import invalidation_bus
+
+CUSTOMER_INDEX_CACHE = 'customer_index'
+
+# Turkish case folding (I -> ı, İ -> i) first, then the letters people skip on
+# non-Turkish keyboards, so "ozturk", "ÖZTÜRK" and "Öztürk" all match
+_TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_TURKISH_LETTERS = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+# Longest word prefix kept in the index; longer query words are checked against the name
+MAX_PREFIX = 12
+NGRAM = 3
+
+
+def turkish_fold(text):
+    return (text or '').translate(_TURKISH_UPPER).lower().translate(_TURKISH_LETTERS).strip()
+
+
+# The same folding in SQL, for lookups that bypass the index. Built from
+# replace() (SQLite has no translate()), mapping the Turkish capitals before
+# lower(), which only handles ASCII under the C locale and in SQLite
+_SQL_FOLDS = [(ch, turkish_fold(ch)) for ch in 'IİÇĞÖŞÜÂÎÛçğıöşüâîû']
+
+
+def turkish_fold_sql(column):
+    for source, target in _SQL_FOLDS:
+        column = func.replace(column, source, target)
+    return func.lower(column)
+
+
+class CustomerSuggestIndex:
+    """
+    Per-worker autocomplete index over customer names.
+
+    Every word of a folded name is indexed by all of its prefixes (up to
+    MAX_PREFIX characters), and the whole folded name by its trigrams for
+    matches inside a word. customers.py applies its own writes to the index
+    in place and invalidates the other workers' copies, which rebuild from
+    a single query on their next suggestion; while an index is cold the
+    suggestion is answered from the database instead.
+    """
+
+    def __init__(self):
+        self._entries = None
+        self._prefixes = {}
+        self._ngrams = {}
+        self._generation = 0
+        self._building = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        invalidation_bus.register(CUSTOMER_INDEX_CACHE, self.clear)
+
+    @property
+    def ready(self):
+        return self._entries is not None
+
+    # --- Index maintenance -------------------------------------------------
+
+    @staticmethod
+    def _keys(folded):
+        prefixes = {word[:n] for word in folded.split() for n in range(1, min(len(word), MAX_PREFIX) + 1)}
+        ngrams = {folded[i:i + NGRAM] for i in range(len(folded) - NGRAM + 1)}
+        return prefixes, ngrams
+
+    def _add(self, customer_id, name, representative):
+        folded = turkish_fold(name)
+        self._entries[customer_id] = (name, representative, folded)
+        prefixes, ngrams = self._keys(folded)
+        for key in prefixes:
+            self._prefixes.setdefault(key, set()).add(customer_id)
+        for key in ngrams:
+            self._ngrams.setdefault(key, set()).add(customer_id)
+
+    def _remove(self, customer_id):
+        entry = self._entries.pop(customer_id, None)
+        if entry is None:
+            return
+        prefixes, ngrams = self._keys(entry[2])
+        for index, keys in ((self._prefixes, prefixes), (self._ngrams, ngrams)):
+            for key in keys:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(customer_id)
+                    if not ids:
+                        del index[key]
+
+    def rebuild(self):
+        # Always from the primary: a lagging replica would miss the newest customers
+        generation = self._generation
+        rows = db.session.execute(
+            select(Customers.id, Customers.name, Customers.representative),
+            bind_arguments={'bind': db.engine},
+        ).all()
+        with self._lock:
+            if generation != self._generation:
+                return  # invalidated while loading; the next request starts over
+            self._entries, self._prefixes, self._ngrams = {}, {}, {}
+            for row in rows:
+                self._add(row.id, row.name, row.representative)
+
+    def rebuild_in_background(self, app):
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+
+        def run():
+            try:
+                with app.app_context():
+                    self.rebuild()
+            except Exception as e:
+                logging.error(f"Error building the customer index: {e}")
+            finally:
+                self._building = False
+
+        threading.Thread(target=run, name='customer-index-build', daemon=True).start()
+
+    def _discard_build(self):
+        # Cold index: a rebuild in flight may have read the rows before this
+        # write, so make it drop its snapshot; the next request starts over
+        self._generation += 1
+
+    def upsert(self, customer):
+        """Apply a committed create/update in place and drop the other workers' copies"""
+        with self._lock:
+            if self._entries is not None:
+                self._remove(customer.id)
+                self._add(customer.id, customer.name, customer.representative)
+            else:
+                self._discard_build()
+        invalidation_bus.invalidate(CUSTOMER_INDEX_CACHE, local=False)
+
+    def remove(self, customer_id):
+        """Apply a committed delete in place and drop the other workers' copies"""
+        with self._lock:
+            if self._entries is not None:
+                self._remove(customer_id)
+            else:
+                self._discard_build()
+        invalidation_bus.invalidate(CUSTOMER_INDEX_CACHE, local=False)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries = None
+            self._prefixes, self._ngrams = {}, {}
+
+    # --- Lookup ------------------------------------------------------------
+
+    def suggest(self, query, limit):
+        """
+        Up to `limit` (id, name, representative), best first: names starting
+        with the query, then names with a word starting with every query
+        word, then names containing the query; shorter names first within
+        each group. None while the index is cold.
+        """
+        folded = turkish_fold(query)
+        words = folded.split()
+        with self._lock:
+            entries = self._entries
+            if entries is None:
+                return None
+            if not words:
+                candidates = entries.keys()
+            else:
+                sets = [self._prefixes.get(word[:MAX_PREFIX], set()) for word in words]
+                candidates = set.intersection(*sets)
+                if len(candidates) < limit and len(folded) >= NGRAM:
+                    grams = [self._ngrams.get(folded[i:i + NGRAM], set()) for i in range(len(folded) - NGRAM + 1)]
+                    candidates = candidates | set.intersection(*grams)
+
+            ranked = []
+            for customer_id in candidates:
+                name, representative, name_folded = entries[customer_id]
+                if name_folded.startswith(folded):
+                    rank = 0
+                elif all(any(w.startswith(word) for w in name_folded.split()) for word in words):
+                    rank = 1
+                elif folded in name_folded:
+                    rank = 2
+                else:
+                    continue  # n-gram hit whose grams are not contiguous in the name
+                ranked.append((rank, len(name_folded), name_folded, customer_id, name, representative))
+
+        best = heapq.nsmallest(limit, ranked)
+        return [(customer_id, name, representative) for _, _, _, customer_id, name, representative in best]
+
+
+customer_index = CustomerSuggestIndex()
@@ -1,5 +1,4 @@
 # services/email_service.py
-import resend
 import os
 import logging
 from datetime import datetime
@@ -8,60 +7,77 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Configure ReSend
-resend.api_key = os.getenv("RESEND_API_KEY")
-
-# Add validation for API key
-if not resend.api_key:
-    logging.error("RESEND_API_KEY environment variable is not set!")
-else:
-    logging.info(f"ReSend API key loaded: {resend.api_key[:10]}...")
-
 # Import models for database queries
 from models import ReturnCase, User, Role, UserRole
+from services.email_transport import email_transport
 
 class CentaEmailService:
+    @staticmethod
+    def _send_in_background(params, sent_message, failed_message):
+        """
+        Hand the send to the shared transport's event loop and return at once,
+        so the request thread does not wait for the provider. The outcome is
+        only logged. False if the send could not even be scheduled.
+        """
+        def done(future):
+            try:
+                email = future.result()
+                logging.info(f"{sent_message} ID: {email.get('id', 'unknown')}")
+            except Exception as e:
+                logging.error(f"{failed_message}: {e}")
+
+        try:
+            email_transport.send_background(params).add_done_callback(done)
+            return True
+        except Exception as e:
+            logging.error(f"{failed_message}: {e}")
+            return False
+
+    @staticmethod
+    def _password_reset_params(user_email, user_name, reset_url):
+        return {
+            "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
+            "to": [user_email],
+            "subject": "Centa Arıza Takip Sistemi - Şifre Sıfırlama",
+            "html": f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #2c3e50;">Merhaba {user_name},</h2>
+                
+                <p>Centa Arıza Takip Sistemi'nde şifrenizi sıfırlamak için bir talep aldık.</p>
+                
+                <p>Şifrenizi sıfırlamak için aşağıdaki bağlantıya tıklayın:</p>
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="{reset_url}" 
+                       style="background-color: #3498db; color: white; padding: 12px 24px; 
+                              text-decoration: none; border-radius: 5px; display: inline-block;">
+                        Şifremi Sıfırla
+                    </a>
+                </div>
+                
+                <p style="color: #7f8c8d; font-size: 14px;">
+                    Bu talebi siz yapmadıysanız, bu mesajı dikkate almayın.<br>
+                    Bu bağlantı 15 dakika boyunca geçerlidir.
+                </p>
+                
+                <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
+                
+                <p style="color: #7f8c8d; font-size: 12px;">
+                    Saygılarımızla,<br>
+                    <strong>Centa Teknik Servis</strong><br>
+                    ariza.takip@centa.com.tr
+                </p>
+            </div>
+            """
+        }
+
     @staticmethod
     def send_password_reset(user_email, user_name, reset_url):
         """Send password reset email with Centa branding"""
         try:
-            params = {
-                "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
-                "to": [user_email],
-                "subject": "Centa Arıza Takip Sistemi - Şifre Sıfırlama",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #2c3e50;">Merhaba {user_name},</h2>
-                    
-                    <p>Centa Arıza Takip Sistemi'nde şifrenizi sıfırlamak için bir talep aldık.</p>
-                    
-                    <p>Şifrenizi sıfırlamak için aşağıdaki bağlantıya tıklayın:</p>
-                    
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{reset_url}" 
-                           style="background-color: #3498db; color: white; padding: 12px 24px; 
-                                  text-decoration: none; border-radius: 5px; display: inline-block;">
-                            Şifremi Sıfırla
-                        </a>
-                    </div>
-                    
-                    <p style="color: #7f8c8d; font-size: 14px;">
-                        Bu talebi siz yapmadıysanız, bu mesajı dikkate almayın.<br>
-                        Bu bağlantı 15 dakika boyunca geçerlidir.
-                    </p>
-                    
-                    <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
-                    
-                    <p style="color: #7f8c8d; font-size: 12px;">
-                        Saygılarımızla,<br>
-                        <strong>Centa Teknik Servis</strong><br>
-                        ariza.takip@centa.com.tr
-                    </p>
-                </div>
-                """
-            }
+            params = CentaEmailService._password_reset_params(user_email, user_name, reset_url)
             
-            email = resend.Emails.send(params)
+            email = email_transport.send(params)
             email_id = email.get("id", "unknown")  # safer than email.id
             logging.info(
                 f"Şifre sıfırlama e-postası {user_email} adresine gönderildi. ID: {email_id}"
@@ -73,52 +89,65 @@ class CentaEmailService:
             logging.error(f"Exception args: {e.args}")
             return False
 
+    @staticmethod
+    def queue_password_reset(user_email, user_name, reset_url):
+        """Non-blocking send_password_reset for request handlers"""
+        return CentaEmailService._send_in_background(
+            CentaEmailService._password_reset_params(user_email, user_name, reset_url),
+            f"Şifre sıfırlama e-postası {user_email} adresine gönderildi.",
+            "Şifre sıfırlama e-postası gönderilemedi",
+        )
+
+    @staticmethod
+    def _user_invitation_params(user_email, role_name, invitation_url, invited_by_name):
+        return {
+            "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
+            "to": [user_email],
+            "subject": "Centa Arıza Takip Sistemi - Davet",
+            "html": f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #2c3e50;">Merhaba,</h2>
+                
+                <p>Centa Arıza Takip Sistemi'ne davet edildiniz.</p>
+                
+                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
+                    <p><strong>Davet Eden:</strong> {invited_by_name}</p>
+                    <p><strong>Rol:</strong> {role_name}</p>
+                </div>
+                
+                <p>Hesabınızı aktifleştirmek için aşağıdaki bağlantıya tıklayın:</p>
+                
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="{invitation_url}" 
+                       style="background-color: #27ae60; color: white; padding: 12px 24px; 
+                              text-decoration: none; border-radius: 5px; display: inline-block;">
+                        Hesabımı Aktifleştir
+                    </a>
+                </div>
+                
+                <p style="color: #7f8c8d; font-size: 14px;">
+                    Bu bağlantı 24 saat boyunca geçerlidir.<br>
+                    Hesabınızı aktifleştirdikten sonra şifrenizi belirleyebilir ve sisteme giriş yapabilirsiniz.
+                </p>
+                
+                <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
+                
+                <p style="color: #7f8c8d; font-size: 12px;">
+                    Saygılarımızla,<br>
+                    <strong>Centa Teknik Servis</strong><br>
+                    ariza.takip@centa.com.tr
+                </p>
+            </div>
+            """
+        }
+
     @staticmethod
     def send_user_invitation(user_email, role_name, invitation_url, invited_by_name):
         """Send user invitation email"""
         try:
-            params = {
-                "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
-                "to": [user_email],
-                "subject": "Centa Arıza Takip Sistemi - Davet",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #2c3e50;">Merhaba,</h2>
-                    
-                    <p>Centa Arıza Takip Sistemi'ne davet edildiniz.</p>
-                    
-                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
-                        <p><strong>Davet Eden:</strong> {invited_by_name}</p>
-                        <p><strong>Rol:</strong> {role_name}</p>
-                    </div>
-                    
-                    <p>Hesabınızı aktifleştirmek için aşağıdaki bağlantıya tıklayın:</p>
-                    
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{invitation_url}" 
-                           style="background-color: #27ae60; color: white; padding: 12px 24px; 
-                                  text-decoration: none; border-radius: 5px; display: inline-block;">
-                            Hesabımı Aktifleştir
-                        </a>
-                    </div>
-                    
-                    <p style="color: #7f8c8d; font-size: 14px;">
-                        Bu bağlantı 24 saat boyunca geçerlidir.<br>
-                        Hesabınızı aktifleştirdikten sonra şifrenizi belirleyebilir ve sisteme giriş yapabilirsiniz.
-                    </p>
-                    
-                    <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
-                    
-                    <p style="color: #7f8c8d; font-size: 12px;">
-                        Saygılarımızla,<br>
-                        <strong>Centa Teknik Servis</strong><br>
-                        ariza.takip@centa.com.tr
-                    </p>
-                </div>
-                """
-            }
+            params = CentaEmailService._user_invitation_params(user_email, role_name, invitation_url, invited_by_name)
             
-            email = resend.Emails.send(params)
+            email = email_transport.send(params)
             email_id = email.get("id", "unknown")  # safer than email.id
             logging.info(
                 f"Kullanıcı davet e-postası {user_email} adresine gönderildi. ID: {email_id}"
@@ -130,40 +159,53 @@ class CentaEmailService:
             logging.error(f"Exception args: {e.args}")
             return False
 
+    @staticmethod
+    def queue_user_invitation(user_email, role_name, invitation_url, invited_by_name):
+        """Non-blocking send_user_invitation for request handlers"""
+        return CentaEmailService._send_in_background(
+            CentaEmailService._user_invitation_params(user_email, role_name, invitation_url, invited_by_name),
+            f"Kullanıcı davet e-postası {user_email} adresine gönderildi.",
+            "Kullanıcı davet e-postası gönderilemedi",
+        )
+
+    @staticmethod
+    def _welcome_email_params(user_email, user_name):
+        return {
+            "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
+            "to": [user_email],
+            "subject": "Centa Arıza Takip Sistemi - Hoş Geldiniz",
+            "html": f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #2c3e50;">Merhaba {user_name},</h2>
+                
+                <p>Centa Arıza Takip Sistemi'ne hoş geldiniz!</p>
+                
+                <div style="background-color: #e8f5e8; padding: 20px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #27ae60;">
+                    <p style="margin: 0; color: #27ae60;">
+                        <strong>✓</strong> Hesabınız başarıyla oluşturuldu ve sisteme giriş yapabilirsiniz.
+                    </p>
+                </div>
+                
+                <p>Herhangi bir sorunuz için bizimle iletişime geçebilirsiniz.</p>
+                
+                <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
+                
+                <p style="color: #7f8c8d; font-size: 12px;">
+                    Saygılarımızla,<br>
+                    <strong>Centa Teknik Servis</strong><br>
+                    ariza.takip@centa.com.tr
+                </p>
+            </div>
+            """
+        }
+
     @staticmethod
     def send_welcome_email(user_email, user_name):
         """Send welcome email to new users"""
         try:
-            params = {
-                "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
-                "to": [user_email],
-                "subject": "Centa Arıza Takip Sistemi - Hoş Geldiniz",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #2c3e50;">Merhaba {user_name},</h2>
-                    
-                    <p>Centa Arıza Takip Sistemi'ne hoş geldiniz!</p>
-                    
-                    <div style="background-color: #e8f5e8; padding: 20px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #27ae60;">
-                        <p style="margin: 0; color: #27ae60;">
-                            <strong>✓</strong> Hesabınız başarıyla oluşturuldu ve sisteme giriş yapabilirsiniz.
-                        </p>
-                    </div>
-                    
-                    <p>Herhangi bir sorunuz için bizimle iletişime geçebilirsiniz.</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
-                    
-                    <p style="color: #7f8c8d; font-size: 12px;">
-                        Saygılarımızla,<br>
-                        <strong>Centa Teknik Servis</strong><br>
-                        ariza.takip@centa.com.tr
-                    </p>
-                </div>
-                """
-            }
+            params = CentaEmailService._welcome_email_params(user_email, user_name)
             
-            email = resend.Emails.send(params)
+            email = email_transport.send(params)
             email_id = email.get("id", "unknown")  # safer than email.id
             logging.info(
                 f"Hoş geldin e-postası {user_email} adresine gönderildi. ID: {email_id}"
@@ -175,33 +217,82 @@ class CentaEmailService:
             logging.error(f"Exception args: {e.args}")
             return False
 
+    @staticmethod
+    def queue_welcome_email(user_email, user_name):
+        """Non-blocking send_welcome_email for request handlers"""
+        return CentaEmailService._send_in_background(
+            CentaEmailService._welcome_email_params(user_email, user_name),
+            f"Hoş geldin e-postası {user_email} adresine gönderildi.",
+            "Hoş geldin e-postası gönderilemedi",
+        )
+
+    @staticmethod
+    def _password_reset_confirmation_params(user_email, user_name):
+        return {
+            "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
+            "to": [user_email],
+            "subject": "Centa Arıza Takip Sistemi - Şifreniz Değiştirildi",
+            "html": f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #2c3e50;">Merhaba {user_name},</h2>
+                
+                <p>Centa Arıza Takip Sistemi'ndeki hesabınızın şifresi başarıyla sıfırlandı.</p>
+                
+                <p style="color: #7f8c8d; font-size: 14px;">
+                    Bu işlemi siz yapmadıysanız, lütfen hemen bizimle iletişime geçin.
+                </p>
+                
+                <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
+                
+                <p style="color: #7f8c8d; font-size: 12px;">
+                    Saygılarımızla,<br>
+                    <strong>Centa Teknik Servis</strong><br>
+                    ariza.takip@centa.com.tr
+                </p>
+            </div>
+            """
+        }
+
+    @staticmethod
+    def queue_password_reset_confirmation(user_email, user_name):
+        """Tell the user their password was reset, without waiting for the provider"""
+        return CentaEmailService._send_in_background(
+            CentaEmailService._password_reset_confirmation_params(user_email, user_name),
+            f"Şifre sıfırlama onay e-postası {user_email} adresine gönderildi.",
+            "Şifre sıfırlama onay e-postası gönderilemedi",
+        )
+
+    @staticmethod
+    def _custom_customer_email_params(customer_email, case_id, email_content):
+        return {
+            "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
+            "to": [customer_email],
+            "subject": f"Centa - Arıza Vakası #{case_id} Bilgilendirmesi",
+            "html": f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #2c3e50;">Arıza Vakası #{case_id}</h2>
+                
+                <div style="background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
+                    {email_content}
+                </div>
+                
+                <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
+                
+                <p style="color: #7f8c8d; font-size: 12px;">
+                    Bu e-posta Centa Arıza Takip Sistemi tarafından otomatik olarak gönderilmiştir.<br>
+                    ariza.takip@centa.com.tr
+                </p>
+            </div>
+            """
+        }
+
     @staticmethod
     def send_custom_customer_email(customer_email, case_id, email_content):
         """Send custom email to customer about their return case"""
         try:
-            params = {
-                "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
-                "to": [customer_email],
-                "subject": f"Centa - Arıza Vakası #{case_id} Bilgilendirmesi",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #2c3e50;">Arıza Vakası #{case_id}</h2>
-                    
-                    <div style="background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
-                        {email_content}
-                    </div>
-                    
-                    <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
-                    
-                    <p style="color: #7f8c8d; font-size: 12px;">
-                        Bu e-posta Centa Arıza Takip Sistemi tarafından otomatik olarak gönderilmiştir.<br>
-                        ariza.takip@centa.com.tr
-                    </p>
-                </div>
-                """
-            }
+            params = CentaEmailService._custom_customer_email_params(customer_email, case_id, email_content)
             
-            email = resend.Emails.send(params)
+            email = email_transport.send(params)
             email_id = email.get("id", "unknown")  # safer than email.id
             logging.info(
                 f"Özel müşteri e-postası {customer_email} adresine vaka #{case_id} için gönderildi. ID: {email_id}"
@@ -212,75 +303,93 @@ class CentaEmailService:
             logging.error(f"Exception type: {type(e)}")
             logging.error(f"Exception args: {e.args}")
             return False
+
     
     @staticmethod
-    def new_return_case_notification(case_id):
-        """Send return case notification to all users"""
+    def queue_custom_customer_email(customer_email, case_id, email_content):
+        """Non-blocking send_custom_customer_email for request handlers"""
+        return CentaEmailService._send_in_background(
+            CentaEmailService._custom_customer_email_params(customer_email, case_id, email_content),
+            f"Özel müşteri e-postası {customer_email} adresine vaka #{case_id} için gönderildi.",
+            "Özel müşteri e-postası gönderilemedi",
+        )
+
+    @staticmethod
+    def _new_return_case_params(case_id):
+        """Recipients and content of the new case notification; None (logged) when there is nothing to send"""
+        # Retrieve only the users that have email notifications enabled
         try:
-            # Retrieve only the users that have email notifications enabled
-            try:
-                users = User.query.filter_by(email_notifications_enabled=True).all()
-                user_emails = [user.email for user in users]
-            except Exception as db_error:
-                logging.error(f"Database error retrieving users: {db_error}")
-                return False
+            users = User.query.filter_by(email_notifications_enabled=True).all()
+            user_emails = [user.email for user in users]
+        except Exception as db_error:
+            logging.error(f"Database error retrieving users: {db_error}")
+            return None
 
-            if not user_emails:
-                logging.warning("E-posta gönderilecek kullanıcı bulunamadı (tüm kullanıcılar bildirimleri kapatmış olabilir)")
-                return False
+        if not user_emails:
+            logging.warning("E-posta gönderilecek kullanıcı bulunamadı (tüm kullanıcılar bildirimleri kapatmış olabilir)")
+            return None
 
-            # Retrieve the case from the database
-            try:
-                case = ReturnCase.query.get(case_id)
-                if not case:
-                    logging.error(f"Vaka bulunamadı, vaka numarası: {case_id}")
-                    return False
-            except Exception as db_error:
-                logging.error(f"Database error retrieving case {case_id}: {db_error}")
-                return False
+        # Retrieve the case from the database
+        try:
+            case = ReturnCase.query.get(case_id)
+            if not case:
+                logging.error(f"Vaka bulunamadı, vaka numarası: {case_id}")
+                return None
+        except Exception as db_error:
+            logging.error(f"Database error retrieving case {case_id}: {db_error}")
+            return None
 
-            # Get customer information
-            customer_name = case.customer.name
-            customer_contact_info = case.customer.contact_info 
-            arrival_date = case.arrival_date.strftime('%d.%m.%Y')
+        # Get customer information
+        customer_name = case.customer.name
+        customer_contact_info = case.customer.contact_info 
+        arrival_date = case.arrival_date.strftime('%d.%m.%Y')
 
-            params = {
-                "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
-                "to": user_emails,
-                "subject": f"Centa - Arıza Vakası #{case_id} - {customer_name} Bildirimi",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #2c3e50;">Yeni Arıza Vakası Bildirimi</h2>
-                    
-                    <p>Centa Arıza Takip Sistemi'nde yeni bir arıza vakası oluşturuldu.</p>
-                    
-                    <div style="background-color: #fff3cd; padding: 20px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #ffc107;">
-                        <h3 style="margin-top: 0; color: #856404;">Vaka Detayları</h3>
-                        <p><strong>Vaka Numarası:</strong> {case_id}</p>
-                        <p><strong>Tarih:</strong> {arrival_date}</p>
-                        <p><strong>Müşteri:</strong> {customer_name}</p>
-                        <p><strong>Müşteri İletişim Bilgileri:</strong> {customer_contact_info}</p>
-                    </div>
-                    
-                    <p>En yakın zamanda arıza vakasının durumunu güncelleyiniz.</p>
-                    
-                    <p>Detaylı bilgi için sistemimize giriş yapabilirsiniz.</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
-                    
-                    <p style="color: #7f8c8d; font-size: 12px;">
-                        Saygılarımızla,<br>
-                        <strong>Centa Teknik Servis</strong><br>
-                        ariza.takip@centa.com.tr
-                    </p>
+        params = {
+            "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
+            "to": user_emails,
+            "subject": f"Centa - Arıza Vakası #{case_id} - {customer_name} Bildirimi",
+            "html": f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #2c3e50;">Yeni Arıza Vakası Bildirimi</h2>
+                
+                <p>Centa Arıza Takip Sistemi'nde yeni bir arıza vakası oluşturuldu.</p>
+                
+                <div style="background-color: #fff3cd; padding: 20px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #ffc107;">
+                    <h3 style="margin-top: 0; color: #856404;">Vaka Detayları</h3>
+                    <p><strong>Vaka Numarası:</strong> {case_id}</p>
+                    <p><strong>Tarih:</strong> {arrival_date}</p>
+                    <p><strong>Müşteri:</strong> {customer_name}</p>
+                    <p><strong>Müşteri İletişim Bilgileri:</strong> {customer_contact_info}</p>
                 </div>
-                """
-            }
+                
+                <p>En yakın zamanda arıza vakasının durumunu güncelleyiniz.</p>
+                
+                <p>Detaylı bilgi için sistemimize giriş yapabilirsiniz.</p>
+                
+                <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
+                
+                <p style="color: #7f8c8d; font-size: 12px;">
+                    Saygılarımızla,<br>
+                    <strong>Centa Teknik Servis</strong><br>
+                    ariza.takip@centa.com.tr
+                </p>
+            </div>
+            """
+        }
+        return params
+
+    @staticmethod
+    def new_return_case_notification(case_id):
+        """Send return case notification to all users"""
+        try:
+            params = CentaEmailService._new_return_case_params(case_id)
+            if params is None:
+                return False
             
-            email = resend.Emails.send(params)
+            email = email_transport.send(params)
             email_id = email.get("id", "unknown")  # safer than email.id
             logging.info(
-                f"Arıza vakası #{case_id} bildirimi {len(user_emails)} kullanıcıya gönderildi. ID: {email_id}"
+                f"Arıza vakası #{case_id} bildirimi {len(params['to'])} kullanıcıya gönderildi. ID: {email_id}"
             )
             return True
         except Exception as e:
@@ -289,6 +398,18 @@ class CentaEmailService:
             logging.error(f"Exception args: {e.args}")
             return False
 
+    @staticmethod
+    def queue_new_return_case_notification(case_id):
+        """Non-blocking new_return_case_notification for request handlers"""
+        params = CentaEmailService._new_return_case_params(case_id)
+        if params is None:
+            return False
+        return CentaEmailService._send_in_background(
+            params,
+            f"Arıza vakası #{case_id} bildirimi {len(params['to'])} kullanıcıya gönderildi.",
+            "Arıza vakası bildirimi tüm kullanıcılara gönderilemedi",
+        )
+
     @staticmethod
     def send_stage_completion_notification(case_id, completed_stage, next_stage, updated_by=None):
         """Send notification when a stage is completed and inform about the next stage"""
@@ -398,7 +519,7 @@ class CentaEmailService:
                 """
             }
             
-            email = resend.Emails.send(params)
+            email = email_transport.send(params)
             email_id = email.get("id", "unknown")  # safer than email.id
             logging.info(
                 f"Arıza vakası #{case_id} aşama tamamlama bildirimi {len(user_emails)} kullanıcıya gönderildi. ID: {email_id}"
@@ -411,67 +532,75 @@ class CentaEmailService:
             return False
 
     @staticmethod
-    def send_case_completion_notification(case_id, completed_by=None):
-        """Send notification when a case is fully completed"""
-        try:
-            # Retrieve MANAGER and ADMIN users with email notifications enabled
-            users = User.query.join(Role).filter(
-                Role.name.in_([UserRole.MANAGER, UserRole.ADMIN]),
-                User.email_notifications_enabled == True
-            ).all()
-            user_emails = [user.email for user in users]
+    def _case_completion_params(case_id, completed_by=None):
+        """Recipients and content of the case completion notification; None (logged) when there is nothing to send"""
+        # Retrieve MANAGER and ADMIN users with email notifications enabled
+        users = User.query.join(Role).filter(
+            Role.name.in_([UserRole.MANAGER, UserRole.ADMIN]),
+            User.email_notifications_enabled == True
+        ).all()
+        user_emails = [user.email for user in users]
 
-            if not user_emails:
-                logging.warning("E-posta gönderilecek kullanıcı bulunamadı (bildirimleri etkin olan yönetici/admin yok)")
-                return False
+        if not user_emails:
+            logging.warning("E-posta gönderilecek kullanıcı bulunamadı (bildirimleri etkin olan yönetici/admin yok)")
+            return None
 
-            # Retrieve the case from the database
-            case = ReturnCase.query.get(case_id)
-            if not case:
-                logging.error(f"Vaka bulunamadı, vaka numarası: {case_id}")
-                return False
+        # Retrieve the case from the database
+        case = ReturnCase.query.get(case_id)
+        if not case:
+            logging.error(f"Vaka bulunamadı, vaka numarası: {case_id}")
+            return None
 
-            # Get customer information
-            customer_name = case.customer.name
-            current_time = datetime.now().strftime('%d.%m.%Y %H:%M')
+        # Get customer information
+        customer_name = case.customer.name
+        current_time = datetime.now().strftime('%d.%m.%Y %H:%M')
 
-            params = {
-                "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
-                "to": user_emails,
-                "subject": f"Centa - Arıza Vakası #{case_id} Tamamlandı",
-                "html": f"""
-                <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                    <h2 style="color: #2c3e50;">Vaka Tamamlandı</h2>
-                    
-                    <p>Arıza vakası #{case_id} başarıyla tamamlandı.</p>
-                    
-                    <div style="background-color: #d4edda; padding: 20px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #28a745;">
-                        <h3 style="margin-top: 0; color: #155724;">Vaka Bilgileri</h3>
-                        <p><strong>Vaka Numarası:</strong> {case_id}</p>
-                        <p><strong>Müşteri:</strong> {customer_name}</p>
-                        <p><strong>Tamamlayan:</strong> {completed_by or 'Sistem'}</p>
-                        <p><strong>Tamamlanma Tarihi:</strong> {current_time}</p>
-                    </div>
-                    
-                    <p>Vaka tüm aşamaları başarıyla tamamlanmıştır.</p>
-                    
-                    <p>Detaylı bilgi için sistemimize giriş yapabilirsiniz.</p>
-                    
-                    <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
-                    
-                    <p style="color: #7f8c8d; font-size: 12px;">
-                        Saygılarımızla,<br>
-                        <strong>Centa Teknik Servis</strong><br>
-                        ariza.takip@centa.com.tr
-                    </p>
+        params = {
+            "from": "Centa Arıza Takip Sistemi <centa-ariza@centa.com.tr>",
+            "to": user_emails,
+            "subject": f"Centa - Arıza Vakası #{case_id} Tamamlandı",
+            "html": f"""
+            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2 style="color: #2c3e50;">Vaka Tamamlandı</h2>
+                
+                <p>Arıza vakası #{case_id} başarıyla tamamlandı.</p>
+                
+                <div style="background-color: #d4edda; padding: 20px; border-radius: 5px; margin: 20px 0; border-left: 4px solid #28a745;">
+                    <h3 style="margin-top: 0; color: #155724;">Vaka Bilgileri</h3>
+                    <p><strong>Vaka Numarası:</strong> {case_id}</p>
+                    <p><strong>Müşteri:</strong> {customer_name}</p>
+                    <p><strong>Tamamlayan:</strong> {completed_by or 'Sistem'}</p>
+                    <p><strong>Tamamlanma Tarihi:</strong> {current_time}</p>
                 </div>
-                """
-            }
+                
+                <p>Vaka tüm aşamaları başarıyla tamamlanmıştır.</p>
+                
+                <p>Detaylı bilgi için sistemimize giriş yapabilirsiniz.</p>
+                
+                <hr style="border: none; border-top: 1px solid #ecf0f1; margin: 30px 0;">
+                
+                <p style="color: #7f8c8d; font-size: 12px;">
+                    Saygılarımızla,<br>
+                    <strong>Centa Teknik Servis</strong><br>
+                    ariza.takip@centa.com.tr
+                </p>
+            </div>
+            """
+        }
+        return params
+
+    @staticmethod
+    def send_case_completion_notification(case_id, completed_by=None):
+        """Send notification when a case is fully completed"""
+        try:
+            params = CentaEmailService._case_completion_params(case_id, completed_by)
+            if params is None:
+                return False
             
-            email = resend.Emails.send(params)
+            email = email_transport.send(params)
             email_id = email.get("id", "unknown")  # safer than email.id
             logging.info(
-                f"Arıza vakası #{case_id} tamamlama bildirimi {len(user_emails)} kullanıcıya gönderildi. ID: {email_id}"
+                f"Arıza vakası #{case_id} tamamlama bildirimi {len(params['to'])} kullanıcıya gönderildi. ID: {email_id}"
             )
             return True
         except Exception as e:
@@ -479,3 +608,15 @@ class CentaEmailService:
             logging.error(f"Exception type: {type(e)}")
             logging.error(f"Exception args: {e.args}")
             return False
+
+    @staticmethod
+    def queue_case_completion_notification(case_id, completed_by=None):
+        """Non-blocking send_case_completion_notification for request handlers"""
+        params = CentaEmailService._case_completion_params(case_id, completed_by)
+        if params is None:
+            return False
+        return CentaEmailService._send_in_background(
+            params,
+            f"Arıza vakası #{case_id} tamamlama bildirimi {len(params['to'])} kullanıcıya gönderildi.",
+            "Arıza vakası tamamlama bildirimi gönderilemedi",
+        )
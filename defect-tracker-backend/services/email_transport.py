@@ -0,0 +1,89 @@
+# services/email_transport.py
+import asyncio
+import logging
+import os
+import threading
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+class ResendTransport:
+    """
+    Sends emails to the ReSend HTTP API as coroutines on a single background
+    event loop, sharing one pooled HTTP client with a hard timeout.
+
+    A slow email provider no longer holds a request thread for the length
+    of the upstream call: request handlers hand the send off with
+    send_background() (CentaEmailService.queue_*), and the sync send() is
+    bounded by the timeout.
+    """
+
+    def __init__(self, api_url=None, api_key=None, timeout=None, max_connections=None):
+        self.api_url = (api_url or os.getenv("RESEND_API_URL", "https://api.resend.com")).rstrip("/")
+        self.api_key = api_key or os.getenv("RESEND_API_KEY")
+        self.timeout = float(timeout or os.getenv("EMAIL_HTTP_TIMEOUT", "10"))
+        self.max_connections = int(max_connections or os.getenv("EMAIL_HTTP_MAX_CONNECTIONS", "20"))
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client = None
+        self._pid = None
+
+    def _ensure_started(self):
+        # Started lazily (and again after a gunicorn fork) so importing this
+        # module does not spawn threads or open sockets
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+
+            import httpx
+
+            if not self.api_key:
+                logging.error("RESEND_API_KEY environment variable is not set!")
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._client = httpx.AsyncClient(
+                    base_url=self.api_url,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=self.max_connections),
+                    headers={
+                        "Accept": "application/json",
+                        "Authorization": f"Bearer {self.api_key}",
+                    },
+                )
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name="email-transport", daemon=True).start()
+            ready.wait()
+            self._loop = loop
+            self._pid = os.getpid()
+        return self._loop
+
+    async def _post(self, params):
+        response = await self._client.post("/emails", json=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"ReSend API error {response.status_code}: {response.text}")
+        return response.json()
+
+    def send_background(self, params):
+        """Schedule the send and return a concurrent.futures.Future immediately"""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._post(params), loop)
+
+    def send(self, params):
+        """Blocking send, bounded by the transport timeout"""
+        return self.send_background(params).result(timeout=self.timeout + 1)
+
+
+email_transport = ResendTransport()
@@ -0,0 +1,158 @@
+# services/event_bus.py
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+
+from sqlalchemy import func, select as sa_select
+
+from models import db
+
+
+class EventBus:
+    """
+    Small publish/subscribe bus shared by all workers.
+
+    On PostgreSQL, publish() sends NOTIFY on the channel and one listener
+    thread per worker process LISTENs on every subscribed channel, fanning
+    payloads out to that worker's in-memory subscriber queues. On other
+    databases, or when NOTIFY fails, events are delivered in-process only.
+    Payloads are JSON strings and must stay under PostgreSQL's 8000 byte
+    NOTIFY limit.
+    """
+
+    def __init__(self):
+        self.queue_size = 256
+        self._app = None
+        self._subscribers = {}
+        self._channels = set()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._pid = None
+
+    def init_app(self, app):
+        self._app = app
+        self.queue_size = app.config.get('EVENT_QUEUE_SIZE', self.queue_size)
+
+    def _engine(self):
+        with self._app.app_context():
+            return db.engine
+
+    def uses_postgres(self):
+        return self._engine().dialect.name == 'postgresql'
+
+    # --- Publishing --------------------------------------------------------
+
+    def publish(self, channel, payload):
+        data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str)
+        if self.uses_postgres():
+            try:
+                # Own short transaction: the caller has already committed
+                with self._engine().begin() as conn:
+                    conn.execute(sa_select(func.pg_notify(channel, data)))
+                return
+            except Exception as e:
+                logging.error(f"NOTIFY on {channel} failed, delivering locally: {e}")
+        self._dispatch(channel, data)
+
+    def _dispatch(self, channel, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for q in subscribers:
+            try:
+                q.put_nowait(data)
+            except queue.Full:
+                # A stuck consumer must not hold up everyone else
+                pass
+
+    # --- Subscribing -------------------------------------------------------
+
+    def subscribe(self, channel):
+        """Queue receiving the JSON payloads published on `channel`"""
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(q)
+            self._channels.add(channel)
+        if self.uses_postgres():
+            self._ensure_listener()
+        return q
+
+    def unsubscribe(self, channel, q):
+        with self._lock:
+            self._subscribers.get(channel, set()).discard(q)
+
+    def add_handler(self, channel, handler):
+        """Call `handler(payload_dict)` on a daemon thread for every event on `channel`"""
+        q = self.subscribe(channel)
+
+        def run():
+            while True:
+                data = q.get()
+                try:
+                    handler(json.loads(data))
+                except Exception as e:
+                    logging.error(f"Event handler for {channel} failed: {e}")
+
+        threading.Thread(target=run, name=f'event-handler-{channel}', daemon=True).start()
+
+    # --- LISTEN thread -----------------------------------------------------
+
+    def _ensure_listener(self):
+        # One per process; gunicorn workers fork after the module is imported
+        if self._listener is not None and self._listener.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._listener = threading.Thread(target=self._listen_forever, name='event-bus-listener', daemon=True)
+            self._listener.start()
+
+    def _listen_forever(self):
+        backoff = 1
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                logging.error(f"Event bus listener lost its connection: {e}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def _listen(self):
+        raw = self._engine().raw_connection()
+        conn = raw.driver_connection
+        raw.detach()  # long lived; keep it out of the pool
+        conn.autocommit = True
+        listening = set()
+        try:
+            while True:
+                with self._lock:
+                    new_channels = self._channels - listening
+                for channel in new_channels:
+                    cursor = conn.cursor()
+                    cursor.execute(f'LISTEN "{channel}"')
+                    cursor.close()
+                    listening.add(channel)
+                for channel, payload in self._wait(conn, timeout=1.0):
+                    self._dispatch(channel, payload)
+        finally:
+            raw.close()
+
+    @staticmethod
+    def _wait(conn, timeout):
+        if hasattr(conn, 'notifies') and callable(conn.notifies):
+            # psycopg 3
+            return [(n.channel, n.payload) for n in conn.notifies(timeout=timeout)]
+        # psycopg2
+        if select.select([conn], [], [], timeout) == ([], [], []):
+            return []
+        conn.poll()
+        received = [(n.channel, n.payload) for n in conn.notifies]
+        conn.notifies.clear()
+        return received
+
+
+event_bus = EventBus()
@@ -0,0 +1,136 @@
+# services/invalidation.py
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import select
+
+from models import ChangeCounter, db, next_change_seq
+from services.event_bus import event_bus
+
+# change_counters rows holding each cache's version, e.g. "cache:catalog"
+CACHE_COUNTER_PREFIX = 'cache:'
+
+
+class InvalidationBus:
+    """
+    Keeps per-worker caches coherent across gunicorn workers and nodes.
+
+    A cache registers a name and a callback that drops its contents.
+    invalidate(name), called once the write has committed, bumps the cache's
+    version in change_counters, runs the local callback and publishes the
+    new version on the cache's own event bus channel (NOTIFY on PostgreSQL,
+    in-process otherwise); every other worker's handler thread runs its
+    callback in turn.
+
+    Each worker remembers the last version it acted on. A jump of more than
+    one means messages were missed (listener reconnecting, full queue); that
+    is harmless because callbacks drop the whole cache. As a backstop the
+    stored versions are compared at most every INVALIDATION_CHECK_SECONDS
+    before a request, so caches converge even where NOTIFY is unavailable.
+    """
+
+    def __init__(self):
+        self.check_seconds = 30
+        self._callbacks = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._pid = None
+        self._subscribed = set()
+
+    def init_app(self, app):
+        self.check_seconds = app.config.get('INVALIDATION_CHECK_SECONDS', self.check_seconds)
+        app.before_request(self._before_request)
+
+    @staticmethod
+    def channel(name):
+        return f'cache_{name}'
+
+    # --- Registration ------------------------------------------------------
+
+    def register(self, name, on_invalidate):
+        """Call `on_invalidate()` whenever any worker invalidates `name`"""
+        with self._lock:
+            self._callbacks[name] = on_invalidate
+
+    def _ensure_subscribed(self):
+        # Handler threads do not survive gunicorn's fork; start them in each worker
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._subscribed = set()
+            names = [name for name in self._callbacks if name not in self._subscribed]
+            self._subscribed.update(names)
+        for name in names:
+            event_bus.add_handler(self.channel(name), lambda payload, name=name: self._received(name, payload.get('version')))
+
+    # --- Invalidating ------------------------------------------------------
+
+    def invalidate(self, name, local=True):
+        """
+        Drop `name` in every worker. local=False skips this worker's callback,
+        for caches that have already applied the change in place.
+        """
+        try:
+            with db.engine.begin() as conn:
+                version = next_change_seq(conn, CACHE_COUNTER_PREFIX + name)
+        except Exception as e:
+            # Still drop and announce; receivers treat a missing version as "always apply"
+            logging.error(f"Could not bump the version of cache {name}: {e}")
+            version = None
+        if local:
+            self._received(name, version)
+        elif version is not None:
+            with self._lock:
+                # Only when nothing was missed before it; otherwise our own
+                # message comes back as a gap and drops the cache after all
+                if self._versions.get(name) == version - 1:
+                    self._versions[name] = version
+        event_bus.publish(self.channel(name), {'version': version})
+
+    def _received(self, name, version):
+        callback = self._callbacks.get(name)
+        if callback is None:
+            return
+        with self._lock:
+            seen = self._versions.get(name)
+            if version is not None and seen is not None:
+                if version <= seen:
+                    return  # already acted on (our own message, or found by the version check)
+                if version > seen + 1:
+                    logging.info(f"Cache {name} missed {version - seen - 1} invalidation(s), dropping it")
+            if version is not None:
+                self._versions[name] = version
+        try:
+            callback()
+        except Exception as e:
+            logging.error(f"Invalidating cache {name} failed: {e}")
+
+    # --- Version check -----------------------------------------------------
+
+    def _before_request(self):
+        self._ensure_subscribed()
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_seconds
+        self.check_versions()
+
+    def check_versions(self):
+        """Drop every registered cache whose stored version moved past the one last seen"""
+        try:
+            with db.engine.connect() as conn:
+                rows = conn.execute(
+                    select(ChangeCounter.name, ChangeCounter.value)
+                    .where(ChangeCounter.name.startswith(CACHE_COUNTER_PREFIX))
+                ).all()
+        except Exception as e:
+            logging.error(f"Cache version check failed: {e}")
+            return
+        for counter, version in rows:
+            self._received(counter[len(CACHE_COUNTER_PREFIX):], version)
+
+
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,136 @@
+# services/password_service.py
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password, password_hash):
+    return bcrypt.checkpw(password, password_hash)
+
+
+class PasswordService:
+    """
+    bcrypt hashing off the request thread.
+
+    Hashes run in a bounded process pool (BCRYPT_POOL_SIZE, 0 = inline) so a
+    burst of logins cannot use more than that many cores, and the cost factor
+    comes from BCRYPT_LOG_ROUNDS. Hashes stored with a different cost are
+    upgraded transparently on the next successful login (see needs_rehash).
+    """
+
+    def __init__(self):
+        self.rounds = 12
+        self.pool_size = 2
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', self.rounds)
+        self.pool_size = app.config.get('BCRYPT_POOL_SIZE', self.pool_size)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _executor(self):
+        # Created lazily in each gunicorn worker; "spawn" keeps the children
+        # from inheriting the worker's threads and open connections
+        if self._pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.pool_size,
+                        mp_context=multiprocessing.get_context('spawn'),
+                    )
+                    self._pid = os.getpid()
+        return self._pool
+
+    def _run(self, fn, *args):
+        if not self.pool_size:
+            return fn(*args)
+        try:
+            return self._executor().submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A dead pool must not lock everyone out; rebuild it next time
+            self._pool = None
+            return fn(*args)
+
+    def hash_password(self, password):
+        return self._run(_hash, password.encode('utf-8'), self.rounds)
+
+    def check_password(self, password_hash, password):
+        if not password_hash or not password:
+            return False
+        return self._run(_check, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash):
+        """True when the stored hash was made with a different cost factor"""
+        try:
+            # $2b$12$<salt+hash>
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
+
+
+class LoginRateLimiter:
+    """
+    In-memory, per-worker count of failed logins per email. After
+    max_attempts failures inside the window the email is locked out until
+    the window expires, before any bcrypt work is done.
+    """
+
+    def __init__(self, max_attempts=5, window_seconds=300):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_attempts = app.config.get('LOGIN_MAX_FAILED_ATTEMPTS', self.max_attempts)
+        self.window_seconds = app.config.get('LOGIN_LOCKOUT_SECONDS', self.window_seconds)
+
+    def _key(self, email):
+        return email.strip().lower()
+
+    def is_locked(self, email):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._failures.get(self._key(email))
+            if not entry:
+                return False
+            count, first_failure = entry
+            if now - first_failure > self.window_seconds:
+                del self._failures[self._key(email)]
+                return False
+            return count >= self.max_attempts
+
+    def record_failure(self, email):
+        now = time.monotonic()
+        with self._lock:
+            # Drop expired entries so the table stays bounded
+            if len(self._failures) > 10000:
+                self._failures = {
+                    k: v for k, v in self._failures.items()
+                    if now - v[1] <= self.window_seconds
+                }
+            count, first_failure = self._failures.get(self._key(email), (0, now))
+            if now - first_failure > self.window_seconds:
+                count, first_failure = 0, now
+            self._failures[self._key(email)] = (count + 1, first_failure)
+
+    def reset(self, email):
+        with self._lock:
+            self._failures.pop(self._key(email), None)
+
+
+password_service = PasswordService()
+login_rate_limiter = LoginRateLimiter()
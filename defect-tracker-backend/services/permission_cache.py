@@ -0,0 +1,75 @@
+# services/permission_cache.py
+import hashlib
+import threading
+import time
+
+from models import Permission, RolePermission, db
+from services.invalidation import invalidation_bus
+
+ROLE_PERMISSIONS_CACHE = 'role_permissions'
+
+
+class RolePermissionCache:
+    """
+    Per-worker cache of each role's permissions.
+
+    Role permissions only change through seed.py, which invalidates the
+    cache in every worker through the invalidation bus, or by hand in the
+    database, so entries are kept for PERMISSION_CACHE_SECONDS and then
+    reloaded with a single join query.
+    """
+
+    def __init__(self, ttl_seconds=300):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl_seconds = app.config.get('PERMISSION_CACHE_SECONDS', self.ttl_seconds)
+        invalidation_bus.register(ROLE_PERMISSIONS_CACHE, self.clear)
+
+    def _load(self, role_id):
+        rows = (
+            db.session.query(Permission.name)
+            .join(RolePermission, RolePermission.permission_id == Permission.id)
+            .filter(RolePermission.role_id == role_id)
+            .all()
+        )
+        permissions = frozenset(name for (name,) in rows)
+        names = sorted(p.name for p in permissions)
+        version = hashlib.sha1(','.join(names).encode('utf-8')).hexdigest()[:16]
+        return permissions, version
+
+    def _entry(self, role_id):
+        now = time.monotonic()
+        entry = self._entries.get(role_id)
+        if entry is None or entry[0] < now:
+            generation = self._generation
+            permissions, version = self._load(role_id)
+            entry = (now + self.ttl_seconds, permissions, version)
+            with self._lock:
+                # Not kept if invalidated while loading
+                if generation == self._generation:
+                    self._entries[role_id] = entry
+        return entry
+
+    def permissions(self, role_id):
+        """frozenset of AppPermissions granted to the role"""
+        return self._entry(role_id)[1]
+
+    def version(self, role_id):
+        """Short hash of the role's permission set, for ETags"""
+        return self._entry(role_id)[2]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def invalidate(self):
+        """Drop the cache in every worker; call after committing a permission change"""
+        invalidation_bus.invalidate(ROLE_PERMISSIONS_CACHE)
+
+
+role_permission_cache = RolePermissionCache()
@@ -0,0 +1,243 @@
+# services/report_jobs.py
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import g, has_app_context, make_response
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from db_routing import RoutingSession, replica_router
+from models import db
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class ReportJobRunner:
+    """
+    Runs long-range report requests off the request thread.
+
+    A job is the report view itself, executed in a small thread pool inside a
+    request context built from the submitted query string, with a Postgres
+    statement_timeout. Job state and results are JSON files in
+    REPORT_JOB_DIR so every gunicorn worker on the host can answer polls.
+    Identical submissions map to the same job id and share one execution.
+
+    A job records its owner (host and pid), and while it is queued or
+    running the owner touches its file every REPORT_JOB_HEARTBEAT_SECONDS.
+    A job whose owner process is gone, or whose file has not been touched
+    for three heartbeats, was lost with a crashed or restarted worker: polls
+    report it as failed and the next submission runs it again. The default
+    REPORT_JOB_DIR is local to the host; with several hosts, point it at a
+    shared directory or polls only find jobs submitted on the same host.
+    """
+
+    def __init__(self):
+        self.workers = 2
+        self.statement_timeout_ms = 120000
+        self.inline_max_days = 366
+        self.inline_statement_timeout_ms = 30000
+        self.result_ttl = 3600
+        self.heartbeat_seconds = 10
+        self.job_dir = os.path.join(tempfile.gettempdir(), 'centa-report-jobs')
+        self._app = None
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._live = set()
+        self._owner = None
+
+    def init_app(self, app):
+        self._app = app
+        self.workers = app.config.get('REPORT_JOB_WORKERS', self.workers)
+        self.statement_timeout_ms = app.config.get('REPORT_JOB_STATEMENT_TIMEOUT_MS', self.statement_timeout_ms)
+        self.inline_max_days = app.config.get('REPORT_INLINE_MAX_DAYS', self.inline_max_days)
+        self.inline_statement_timeout_ms = app.config.get('REPORT_INLINE_STATEMENT_TIMEOUT_MS', self.inline_statement_timeout_ms)
+        self.result_ttl = app.config.get('REPORT_JOB_TTL_SECONDS', self.result_ttl)
+        self.heartbeat_seconds = app.config.get('REPORT_JOB_HEARTBEAT_SECONDS', self.heartbeat_seconds)
+        self.job_dir = app.config.get('REPORT_JOB_DIR') or self.job_dir
+        os.makedirs(self.job_dir, exist_ok=True)
+
+    def _executor(self):
+        if self._pool is None or self._pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pid != os.getpid():
+                    # Neither the pool nor the heartbeat thread survives gunicorn's fork
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='report-job')
+                    self._pid = os.getpid()
+                    self._owner = f'{socket.gethostname()}:{self._pid}'
+                    self._live = set()
+                    threading.Thread(target=self._heartbeat, name='report-job-heartbeat', daemon=True).start()
+        return self._pool
+
+    def _heartbeat(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.heartbeat_seconds)
+            with self._lock:
+                job_ids = list(self._live)
+            for job_id in job_ids:
+                try:
+                    os.utime(self._path(job_id))
+                except OSError:
+                    pass
+
+    # --- Storage -----------------------------------------------------------
+
+    def _path(self, job_id):
+        return os.path.join(self.job_dir, f'{job_id}.json')
+
+    def _write(self, job):
+        # Write-then-rename so readers never see a half written file
+        tmp_path = f'{self._path(job["id"])}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self._app.json.dumps(job))
+        os.replace(tmp_path, self._path(job['id']))
+
+    def get(self, job_id):
+        if not all(ch in '0123456789abcdef' for ch in job_id):
+            return None
+        try:
+            with open(self._path(job_id), encoding='utf-8') as f:
+                job = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if self._abandoned(job):
+            job['status'] = FAILED
+            job['error'] = 'Rapor işi yarıda kaldı. Lütfen raporu tekrar isteyin.'
+        return job
+
+    def _expired(self, job):
+        return time.time() - job['submitted_at'] > self.result_ttl
+
+    def _abandoned(self, job):
+        """Queued or running, but its owner is gone or stopped touching it"""
+        if job['status'] not in (QUEUED, RUNNING):
+            return False
+        host, _, pid = (job.get('owner') or '').rpartition(':')
+        if host == socket.gethostname() and pid.isdigit():
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                pass
+        try:
+            return time.time() - os.path.getmtime(self._path(job['id'])) > 3 * self.heartbeat_seconds
+        except OSError:
+            return True
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl
+        for name in os.listdir(self.job_dir):
+            path = os.path.join(self.job_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    # --- Jobs --------------------------------------------------------------
+
+    def job_id(self, report, args, version=None):
+        key = json.dumps([report, sorted(args.items()), version])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def limit_statements(timeout_ms):
+        """statement_timeout for the current transaction and every one the request or job opens after it"""
+        g.statement_timeout_ms = timeout_ms
+        # A transaction begun earlier in the request (e.g. by load_user) has
+        # already passed after_begin; this also routes like the report's reads
+        if db.session().in_transaction() and db.session.get_bind().dialect.name == 'postgresql':
+            db.session.execute(text(f'SET LOCAL statement_timeout = {int(timeout_ms)}'))
+
+    def submit(self, report, view, args, version=None):
+        """
+        Queue `view` for the given query args unless the same job is still
+        valid. `version` (the tables' change validator) is part of the job
+        id, so a write to the tables starts a new job instead of serving
+        the old result until it expires.
+        """
+        job_id = self.job_id(report, args, version)
+        job = self.get(job_id)
+        if job and job['status'] != FAILED and not self._expired(job):
+            return job
+
+        self._prune()
+        executor = self._executor()
+        job = {
+            'id': job_id,
+            'report': report,
+            'params': args,
+            'owner': self._owner,
+            'status': QUEUED,
+            'submitted_at': time.time(),
+            'finished_at': None,
+            'result': None,
+            'error': None,
+        }
+        with self._lock:
+            self._live.add(job_id)
+        self._write(job)
+        executor.submit(self._execute, dict(job), view)
+        return job
+
+    def wait(self, job_id, timeout):
+        """Long-poll until the job finishes or `timeout` seconds pass"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in (DONE, FAILED) or time.monotonic() >= deadline:
+                return job
+            time.sleep(0.25)
+
+    def _execute(self, job, view):
+        job['status'] = RUNNING
+        self._write(job)
+        try:
+            with self._app.test_request_context(f"/reports/{job['report']}", query_string=job['params']):
+                try:
+                    # Analytics belong on the replica when there is one
+                    g.db_replica = replica_router.enabled and replica_router.available()
+                    self.limit_statements(self.statement_timeout_ms)
+                    response = make_response(view())
+                    if response.status_code == 200:
+                        job['status'] = DONE
+                        job['result'] = response.get_json()
+                    else:
+                        job['status'] = FAILED
+                        job['error'] = (response.get_json(silent=True) or {}).get('error', 'Rapor oluşturulamadı')
+                except OperationalError:
+                    job['status'] = FAILED
+                    job['error'] = 'Rapor sorgusu zaman aşımına uğradı. Lütfen tarih aralığını daraltın.'
+                finally:
+                    db.session.rollback()
+        except Exception as e:
+            job['status'] = FAILED
+            job['error'] = f'Bir hata oluştu: {str(e)}'
+        job['finished_at'] = time.time()
+        self._write(job)
+        with self._lock:
+            self._live.discard(job['id'])
+
+
+report_job_runner = ReportJobRunner()
+
+
+@event.listens_for(RoutingSession, 'after_begin')
+def _apply_statement_timeout(session, transaction, connection):
+    # SET LOCAL ends with the transaction, so apply it to each one (the
+    # request coalescer commits and rolls back on the request's session)
+    timeout_ms = g.get('statement_timeout_ms') if has_app_context() else None
+    if timeout_ms and connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {int(timeout_ms)}')
@@ -0,0 +1,193 @@
+# services/request_coalescer.py
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app, g, request
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+
+from models import CoalescedResult, db
+
+# Outcome of one request, for the hit-rate counters
+EXECUTED = 'executed'
+LOCAL_HIT = 'local_hits'
+SHARED_HIT = 'shared_hits'
+
+
+class _Flight:
+    """One execution in progress in this worker, and the requests waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution of identical read requests.
+
+    Requests with the same view, normalized query string and table
+    validator (set by conditional_get) share one execution: inside a worker
+    the first request runs the view and the others wait for its response.
+    Across workers on PostgreSQL, the running request holds a transaction
+    advisory lock on the key and stores its response in coalesced_results
+    when it commits; a request in another worker waits on the same lock and
+    then reads the stored body instead of running the view again. All of
+    that happens on the request's own session connection, so a report
+    request never holds one pooled connection while waiting for a second.
+    Requests routed to the read replica, which can neither store results
+    nor see the primary's, only coalesce inside their worker. Waits are
+    bounded by REPORT_COALESCE_WAIT_SECONDS, after which a request simply
+    runs the view itself. Stored bodies are removed after
+    REPORT_COALESCE_RESULT_SECONDS.
+    """
+
+    def __init__(self):
+        self.wait_seconds = 30
+        self.result_seconds = 30
+        self._flights = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.wait_seconds = app.config.get('REPORT_COALESCE_WAIT_SECONDS', self.wait_seconds)
+        self.result_seconds = app.config.get('REPORT_COALESCE_RESULT_SECONDS', self.result_seconds)
+
+    @staticmethod
+    def request_key(name):
+        """view name + query string with sorted keys and empty values dropped + table validator"""
+        args = sorted((k, v.strip()) for k, v in request.args.items(multi=True) if v.strip())
+        raw = f"{name}|{args}|{g.get('table_validator')}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    # --- Metrics -----------------------------------------------------------
+
+    def _count(self, name, outcome):
+        with self._lock:
+            stats = self._stats.setdefault(name, {EXECUTED: 0, LOCAL_HIT: 0, SHARED_HIT: 0})
+            stats[outcome] += 1
+
+    def stats(self):
+        """Per-view counters of this worker, with the share of requests that did not run the view"""
+        with self._lock:
+            snapshot = {name: dict(stats) for name, stats in self._stats.items()}
+        for stats in snapshot.values():
+            total = sum(stats.values())
+            stats['requests'] = total
+            stats['hit_rate'] = round((stats[LOCAL_HIT] + stats[SHARED_HIT]) / total, 4) if total else 0
+        return snapshot
+
+    # --- Execution ---------------------------------------------------------
+
+    def run(self, name, compute):
+        """Response for the current request to view `name`, from `compute()` or an identical request's execution"""
+        key = self.request_key(name)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(self.wait_seconds) and flight.result is not None:
+                self._count(name, LOCAL_HIT)
+                return self._response(flight.result)
+            # The first request failed or is taking too long
+            result, outcome = self._execute(key, compute)
+            self._count(name, outcome)
+            return self._response(result)
+
+        try:
+            result, outcome = self._execute(key, compute)
+            flight.result = result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        self._count(name, outcome)
+        return self._response(result)
+
+    @staticmethod
+    def _capture(response):
+        return response.status_code, response.get_data(), response.mimetype
+
+    @staticmethod
+    def _response(result):
+        status, body, mimetype = result
+        return current_app.response_class(body, status=status, mimetype=mimetype)
+
+    def _execute(self, key, compute):
+        computed = []
+
+        def compute_once():
+            computed.append(True)
+            return self._capture(compute())
+
+        if db.engine.dialect.name != 'postgresql' or g.get('db_replica'):
+            return compute_once(), EXECUTED
+        try:
+            return self._execute_shared(key, compute_once)
+        except (DBAPIError, PoolTimeoutError) as e:
+            if computed:
+                raise  # the view's own error
+            logging.error(f"Coalescing across workers failed, running the request alone: {e}")
+            db.session.rollback()
+            return compute_once(), EXECUTED
+
+    def _execute_shared(self, key, compute):
+        # The session's connection on the primary, already checked out by the
+        # validator query; the lock lasts until the session's transaction ends
+        conn = db.session.connection()
+        stored = self._stored(conn, key)
+        if stored is not None:
+            return stored, SHARED_HIT
+
+        conn.execute(text(f"SET LOCAL lock_timeout = {int(self.wait_seconds * 1000)}"))
+        try:
+            conn.execute(select(func.pg_advisory_xact_lock(int(key[:15], 16))))
+        except DBAPIError:
+            # Another worker has been running it for too long
+            db.session.rollback()
+            return compute(), EXECUTED
+        conn.execute(text("SET LOCAL lock_timeout TO DEFAULT"))
+
+        # The previous holder committed its result before releasing the lock
+        stored = self._stored(conn, key)
+        if stored is not None:
+            db.session.rollback()
+            return stored, SHARED_HIT
+
+        result = compute()
+        # Report views only read: ending their transaction here releases the lock
+        if result[0] == 200:
+            try:
+                self._store(db.session.connection(), key, result)
+                db.session.commit()
+            except DBAPIError as e:
+                logging.error(f"Could not store coalesced result {key}: {e}")
+                db.session.rollback()
+        else:
+            db.session.rollback()
+        return result, EXECUTED
+
+    def _store(self, conn, key, result):
+        status, body, mimetype = result
+        now = datetime.utcnow()
+        conn.execute(delete(CoalescedResult).where(
+            (CoalescedResult.key == key)
+            | (CoalescedResult.created_at < now - timedelta(seconds=self.result_seconds))
+        ))
+        conn.execute(insert(CoalescedResult).values(key=key, body=body, mimetype=mimetype, created_at=now))
+
+    def _stored(self, conn, key):
+        cutoff = datetime.utcnow() - timedelta(seconds=self.result_seconds)
+        row = conn.execute(
+            select(CoalescedResult.body, CoalescedResult.mimetype)
+            .where(CoalescedResult.key == key, CoalescedResult.created_at >= cutoff)
+        ).first()
+        return (200, bytes(row.body), row.mimetype) if row else None
+
+
+request_coalescer = RequestCoalescer()
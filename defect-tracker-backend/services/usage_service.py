@@ -0,0 +1,74 @@
+from sqlalchemy import exists, func
+
+from models import ReturnCase, ReturnCaseItem, ReturnCaseItemService, db
+
+
+class UsageService:
+    """
+    How often catalogue rows (customers, product models, service definitions)
+    are referenced by return cases. Every check is answered from the index on
+    the referencing foreign key: EXISTS for delete guards, and one grouped
+    count per list page instead of a query per row.
+    """
+
+    @staticmethod
+    def _in_use(column, value):
+        return db.session.query(exists().where(column == value)).scalar()
+
+    @staticmethod
+    def _counts(column, values):
+        values = list(values)
+        if not values:
+            return {}
+        rows = (
+            db.session.query(column, func.count())
+            .filter(column.in_(values))
+            .group_by(column)
+            .all()
+        )
+        return {value: count for value, count in rows}
+
+    @staticmethod
+    def _count(column, value):
+        return db.session.query(func.count()).filter(column == value).scalar()
+
+    # --- Customers ---------------------------------------------------------
+
+    @staticmethod
+    def customer_in_use(customer_id):
+        return UsageService._in_use(ReturnCase.customer_id, customer_id)
+
+    @staticmethod
+    def customer_case_count(customer_id):
+        return UsageService._count(ReturnCase.customer_id, customer_id)
+
+    @staticmethod
+    def customer_case_counts(customer_ids):
+        """{customer_id: number of return cases} for the given ids (missing = 0)"""
+        return UsageService._counts(ReturnCase.customer_id, customer_ids)
+
+    # --- Product models ----------------------------------------------------
+
+    @staticmethod
+    def product_in_use(product_id):
+        return UsageService._in_use(ReturnCaseItem.product_model_id, product_id)
+
+    @staticmethod
+    def product_item_count(product_id):
+        return UsageService._count(ReturnCaseItem.product_model_id, product_id)
+
+    @staticmethod
+    def product_item_counts(product_ids):
+        """{product_model_id: number of return case items} for the given ids (missing = 0)"""
+        return UsageService._counts(ReturnCaseItem.product_model_id, product_ids)
+
+    # --- Service definitions -----------------------------------------------
+
+    @staticmethod
+    def service_in_use(service_id):
+        return UsageService._in_use(ReturnCaseItemService.service_definition_id, service_id)
+
+    @staticmethod
+    def service_usage_counts(service_ids):
+        """{service_definition_id: number of item services} for the given ids (missing = 0)"""
+        return UsageService._counts(ReturnCaseItemService.service_definition_id, service_ids)
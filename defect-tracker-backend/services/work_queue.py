@@ -0,0 +1,55 @@
+# services/work_queue.py
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from models import CaseStatusEnum, ReturnCase, UserRole, db
+
+# The stage each role works on; roles not listed (ADMIN, MANAGER) see every open stage
+ROLE_QUEUE_STAGES = {
+    UserRole.SUPPORT.name: (CaseStatusEnum.DELIVERED,),
+    UserRole.TECHNICIAN.name: (CaseStatusEnum.TECHNICAL_REVIEW,),
+    UserRole.SALES.name: (CaseStatusEnum.PAYMENT_COLLECTION,),
+    UserRole.LOGISTICS.name: (CaseStatusEnum.SHIPPING,),
+}
+
+OPEN_STAGES = tuple(stage for stage in CaseStatusEnum if stage != CaseStatusEnum.COMPLETED)
+
+
+class WorkQueueService:
+    """
+    Open cases per workflow stage. Every query carries the
+    `workflow_status <> 'COMPLETED'` predicate of the partial indexes on
+    return_cases, so it only reads the open working set no matter how much
+    completed history accumulates.
+    """
+
+    @staticmethod
+    def _open():
+        return ReturnCase.workflow_status != CaseStatusEnum.COMPLETED
+
+    @staticmethod
+    def stages_for(role_name):
+        return ROLE_QUEUE_STAGES.get(role_name, OPEN_STAGES)
+
+    @staticmethod
+    def queue(stages, page, limit):
+        """Open cases in `stages`, the longest waiting first"""
+        return (
+            ReturnCase.query.options(joinedload(ReturnCase.customer))
+            .filter(WorkQueueService._open(), ReturnCase.workflow_status.in_(stages))
+            .order_by(ReturnCase.stage_changed_at, ReturnCase.id)
+            .paginate(page=page, per_page=limit, error_out=False)
+        )
+
+    @staticmethod
+    def stage_counts():
+        """{stage name: open case count}, zeros included"""
+        rows = (
+            db.session.query(ReturnCase.workflow_status, func.count())
+            .filter(WorkQueueService._open())
+            .group_by(ReturnCase.workflow_status)
+            .all()
+        )
+        counts = {stage.name: 0 for stage in OPEN_STAGES}
+        counts.update({stage.name: count for stage, count in rows})
+        return counts
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("JWT_SECRET_KEY", "test-secret-key-0123456789abcdef0123456789")
+    monkeypatch.setenv("JWT_COOKIE_SECURE", "False")
+    monkeypatch.setenv("BCRYPT_LOG_ROUNDS", "4")
+    monkeypatch.setenv("BCRYPT_POOL_SIZE", "0")
+
+    import app as app_module
+    from models import db
+
+    app = app_module.create_app()
+    with app.app_context():
+        db.create_all()
+    app_module.seed_database(app)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    def login(email="erinsarlak003@gmail.com", password="ErinSarlak123!"):
+        response = client.post("/auth/login", json={"email": email, "password": password})
+        assert response.status_code == 200, response.get_json()
+    return login
@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+
+from models import Customers, ReceiptMethodEnum, ReturnCase, Role, User, UserRole, db
+
+
+@pytest.fixture
+def case_id(app):
+    with app.app_context():
+        role = Role.query.filter_by(name=UserRole.SUPPORT).one()
+        user = User(email="support@example.com", role_id=role.id, first_name="Destek", last_name="Test")
+        user.set_password("Test12345!")
+        customer = Customers(name="Öztürk Asansör", contact_info="info@example.com")
+        db.session.add_all([user, customer])
+        db.session.flush()
+        return_case = ReturnCase(customer_id=customer.id, arrival_date=date(2025, 1, 5), receipt_method=ReceiptMethodEnum.shipment)
+        db.session.add(return_case)
+        db.session.commit()
+        return return_case.id
+
+
+def test_detail_etag_round_trips_as_if_match(client, login, case_id):
+    login("support@example.com", "Test12345!")
+
+    detail = client.get(f"/returns/{case_id}")
+    assert detail.status_code == 200
+    etag = detail.headers["ETag"]
+    assert client.get(f"/returns/{case_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    updated = client.put(f"/returns/{case_id}/teslim-alindi", json={"notes": "güncellendi"}, headers={"If-Match": etag})
+    assert updated.status_code == 200, updated.get_json()
+
+    # The tag from before the edit now names an older version
+    stale = client.put(f"/returns/{case_id}/teslim-alindi", json={"notes": "tekrar"}, headers={"If-Match": etag})
+    assert stale.status_code == 409
+
+    fresh = client.get(f"/returns/{case_id}")
+    assert fresh.headers["ETag"] != etag
+    assert fresh.get_json()["notes"] == "güncellendi"
+
+
+def test_case_etag_still_accepted_as_if_match(client, login, case_id):
+    login("support@example.com", "Test12345!")
+    version = client.get(f"/returns/{case_id}").get_json()["version"]
+    response = client.put(f"/returns/{case_id}/teslim-alindi", json={"notes": "x"}, headers={"If-Match": f'"{case_id}-{version}"'})
+    assert response.status_code == 200, response.get_json()
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta, timezone
+
+from date_format import format_iso_utc, format_tr_datetime
+
+
+def test_format_iso_utc_naive():
+    assert format_iso_utc(datetime(2025, 2, 5, 14, 30)) == '2025-02-05T14:30:00Z'
+
+
+def test_format_iso_utc_aware_utc():
+    assert format_iso_utc(datetime(2025, 2, 5, 14, 30, tzinfo=timezone.utc)) == '2025-02-05T14:30:00Z'
+
+
+def test_format_iso_utc_aware_other_offset():
+    value = datetime(2025, 2, 5, 17, 30, tzinfo=timezone(timedelta(hours=3)))
+    assert format_iso_utc(value) == '2025-02-05T14:30:00Z'
+
+
+def test_format_iso_utc_empty():
+    assert format_iso_utc(None) is None
+
+
+def test_format_tr_datetime():
+    assert format_tr_datetime(datetime(2025, 2, 5, 14, 30)) == '05 Şub 2025 14:30'
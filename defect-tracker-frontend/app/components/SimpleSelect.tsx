@@ -13,6 +13,8 @@ interface SimpleSelectProps {
   onChange: (value: number | string) => void;
   placeholder?: string;
   label?: string;
+  // Called on every keystroke instead of filtering locally; `options` then holds the server's matches
+  onSearch?: (term: string) => void;
 }
 
 export default function SimpleSelect({
@@ -20,12 +22,13 @@ export default function SimpleSelect({
   value,
   onChange,
   placeholder = "Seçiniz...",
-  label
+  label,
+  onSearch
 }: SimpleSelectProps) {
   const [isOpen, setIsOpen] = useState(false);
   const [searchTerm, setSearchTerm] = useState("");
 
-  const filteredOptions = options.filter(option => 
+  const filteredOptions = onSearch ? options : options.filter(option => 
     option.name.toLowerCase().includes(searchTerm.toLowerCase())
   );
 
@@ -57,7 +60,10 @@ export default function SimpleSelect({
               type="text"
               placeholder="Ara..."
               value={searchTerm}
-              onChange={(e) => setSearchTerm(e.target.value)}
+              onChange={(e) => {
+                setSearchTerm(e.target.value);
+                onSearch?.(e.target.value);
+              }}
               className="w-full px-3 py-2 border-b border-gray-200 text-sm focus:outline-none"
               autoFocus
             />
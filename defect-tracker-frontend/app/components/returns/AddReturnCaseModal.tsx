@@ -4,9 +4,9 @@ import DatePicker from 'react-datepicker';
 import 'react-datepicker/dist/react-datepicker.css';
 import { tr } from 'date-fns/locale';
 
-import { useState, useEffect, FormEvent, use } from 'react';
+import { useState, useEffect, useRef, FormEvent, use } from 'react';
 import { X, PlusCircle, Trash2 } from 'lucide-react';
-import { Customer, User, ProductModel } from '@/lib/types';
+import { User, ProductModel } from '@/lib/types';
 import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
 import SimpleSelect from '../SimpleSelect';
 
@@ -15,6 +15,11 @@ interface AddReturnCaseModalProps {
   onSuccess: () => void;
 }
 
+interface CustomerOption {
+    id: number;
+    name: string;
+}
+
 interface CaseDetails {
     customerId: number;
     arrivalDate: string;
@@ -24,8 +29,10 @@ interface CaseDetails {
   
 export default function AddReturnCaseModal({ onClose, onSuccess }: AddReturnCaseModalProps) {
 
-    // Dropdown data states
-    const [customers, setCustomers] = useState<Customer[]>([]);
+    // Dropdown data states: the latest suggestions plus the chosen customer
+    const [customers, setCustomers] = useState<CustomerOption[]>([]);
+    const [selectedCustomer, setSelectedCustomer] = useState<CustomerOption | null>(null);
+    const searchSeq = useRef(0);
 
     // Form state for case details
     const [caseDetails, setCaseDetails] = useState<CaseDetails>({
@@ -39,23 +46,31 @@ export default function AddReturnCaseModal({ onClose, onSuccess }: AddReturnCase
     const [isSubmitting, setIsSubmitting] = useState(false);
     const [error, setError] = useState<string | null>(null);
 
-    // Fetch data for all dropdowns when the modal mounts
-    useEffect(() => {
-        const fetchDropdownData = async () => {
-            try {
-                // Fetch all data in parallel
-                const custRes = await fetch(buildApiUrl(API_ENDPOINTS.CUSTOMERS) + '?limit=1000', { method: 'GET', credentials: 'include' });
-                const custData = await custRes.json();
-
+    // Customers matching what is typed in the picker (server-side autocomplete)
+    const searchCustomers = async (term: string) => {
+        const seq = ++searchSeq.current;
+        try {
+            const params = new URLSearchParams({ q: term, limit: '20' });
+            const custRes = await fetch(`${buildApiUrl(API_ENDPOINTS.CUSTOMER_SUGGEST)}?${params}`, { method: 'GET', credentials: 'include' });
+            const custData = await custRes.json();
+            // Ignore answers to older keystrokes that arrive late
+            if (seq === searchSeq.current) {
                 setCustomers(custData.customers || []);
-
-            } catch (err) {
-                setError("Dropdown verileri yüklenemedi.");
             }
-        };
-        fetchDropdownData();
+        } catch (err) {
+            setError("Dropdown verileri yüklenemedi.");
+        }
+    };
+
+    // First suggestions when the modal mounts
+    useEffect(() => {
+        searchCustomers('');
     }, []);
 
+    const customerOptions = selectedCustomer && !customers.some(c => c.id === selectedCustomer.id)
+        ? [selectedCustomer, ...customers]
+        : customers;
+
     const handleCaseDetailChange = (field: keyof typeof caseDetails, value: string | number) => {
         setCaseDetails(prev => ({
             ...prev, 
@@ -115,9 +130,13 @@ export default function AddReturnCaseModal({ onClose, onSuccess }: AddReturnCase
             <div className="flex flex-col gap-4">
                 <div>
                     <SimpleSelect
-                        options={customers}
+                        options={customerOptions}
                         value={caseDetails.customerId}
-                        onChange={(value) => handleCaseDetailChange('customerId', Number(value))} // Convert to number
+                        onChange={(value) => {
+                            setSelectedCustomer(customerOptions.find(c => c.id === Number(value)) || null);
+                            handleCaseDetailChange('customerId', Number(value)); // Convert to number
+                        }}
+                        onSearch={searchCustomers}
                         placeholder="Müşteri Seçin..."
                         label="Müşteri"
                     />
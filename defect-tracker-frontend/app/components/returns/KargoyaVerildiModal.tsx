@@ -6,7 +6,7 @@ import { FullReturnCase } from '@/lib/types';
 import DatePicker from 'react-datepicker';
 import { tr } from 'date-fns/locale';
 import 'react-datepicker/dist/react-datepicker.css';
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, caseIfMatchHeader } from '@/lib/api';
 
 interface KargoyaVerildiModalProps {
   returnCase: FullReturnCase;
@@ -46,7 +46,7 @@ export default function KargoyaVerildiModal({ returnCase, onClose, onSuccess }:
     try {
       const response = await fetch(buildApiUrl(API_ENDPOINTS.RETURNS.KARGOYA_VERILDI(returnCase.id.toString())), {
         method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...caseIfMatchHeader(returnCase) },
         credentials: 'include',
         body: JSON.stringify({
           shippingInfo: formData.shippingInfo,
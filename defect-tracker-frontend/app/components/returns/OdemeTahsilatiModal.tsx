@@ -3,7 +3,7 @@
 import { useState, FormEvent } from 'react';
 import { X } from 'lucide-react';
 import { FullReturnCase } from '@/lib/types';
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, caseIfMatchHeader } from '@/lib/api';
 
 interface OdemeTahsilatiModalProps {
   returnCase: FullReturnCase;
@@ -29,7 +29,7 @@ export default function OdemeTahsilatiModal({ returnCase, onClose, onSuccess }:
     try {
       const response = await fetch(buildApiUrl(API_ENDPOINTS.RETURNS.BASE) + '/' + returnCase.id + '/odeme-tahsilati', {
         method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...caseIfMatchHeader(returnCase) },
         credentials: 'include',
         body: JSON.stringify({
           payment_status: formData.payment_status,
@@ -3,7 +3,7 @@
 import { useState, FormEvent } from 'react';
 import { X } from 'lucide-react';
 import { FullReturnCase } from '@/lib/types';
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, caseIfMatchHeader } from '@/lib/api';
 
 interface TamamlandiModalProps {
   returnCase: FullReturnCase;
@@ -45,7 +45,7 @@ export default function TamamlandiModal({ returnCase, onClose, onSuccess }: Tama
     try {
       const response = await fetch(buildApiUrl(API_ENDPOINTS.RETURNS.TAMAMLANDI(returnCase.id.toString())), {
         method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...caseIfMatchHeader(returnCase) },
         credentials: 'include',
         body: JSON.stringify({
           paymentStatus: formData.paymentStatus,
@@ -5,7 +5,7 @@ import trTR from 'antd/locale/tr_TR';
 import { useState, useEffect, FormEvent } from 'react';
 import { X, PlusCircle, Trash2 } from 'lucide-react';
 import { EditableProduct, FullReturnCase, FullReturnCaseItem, ProductModel, ProductType, ServiceDefinition, ServiceSelection } from '@/lib/types';
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, caseIfMatchHeader } from '@/lib/api';
 import SimpleSelect from '../SimpleSelect';
 
 interface TeknikIncelemeModalProps {
@@ -279,7 +279,7 @@ export default function TeknikIncelemeModal({ returnCase, onClose, onSuccess }:
       
       const response = await fetch(buildApiUrl(API_ENDPOINTS.RETURNS.BASE) + '/' + returnCase.id + '/teknik-inceleme', {
         method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...caseIfMatchHeader(returnCase) },
         credentials: 'include',
         body: JSON.stringify(requestBody)
       });
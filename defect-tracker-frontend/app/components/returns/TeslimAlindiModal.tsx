@@ -7,7 +7,7 @@ import DatePicker from 'react-datepicker';
 import { format } from 'date-fns';
 import { tr } from 'date-fns/locale';
 import 'react-datepicker/dist/react-datepicker.css';
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, caseIfMatchHeader } from '@/lib/api';
 import SimpleSelect from '../SimpleSelect';
 
 interface TeslimAlindiModalProps {
@@ -55,7 +55,7 @@ export default function TeslimAlindiModal({ returnCase, onClose, onSuccess }: Te
     try {
       const response = await fetch(buildApiUrl(API_ENDPOINTS.RETURNS.BASE) + '/' + returnCase.id + '/teslim-alindi', {
         method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...caseIfMatchHeader(returnCase) },
         credentials: 'include',
         body: JSON.stringify({
           customerId: formData.customerId,
@@ -1,6 +1,8 @@
 "use client";
 
-import { FullReturnCase } from "@/lib/types";
+import { useEffect, useState } from "react";
+import { API_ENDPOINTS, buildApiUrl } from "@/lib/api";
+import { FullReturnCase, ReturnCaseDetail } from "@/lib/types";
 import { X } from "lucide-react";
 
 interface ViewReturnCaseModalProps {
@@ -8,7 +10,27 @@ interface ViewReturnCaseModalProps {
   onClose: () => void;
 }
 
-export default function ViewReturnCaseModal({ returnCase, onClose }: ViewReturnCaseModalProps) {
+export default function ViewReturnCaseModal({ returnCase: listCase, onClose }: ViewReturnCaseModalProps) {
+  // The list row is shown right away and replaced by the case detail, which
+  // also carries the newest actions, as soon as it arrives
+  const [detail, setDetail] = useState<ReturnCaseDetail | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    setDetail(null);
+    fetch(buildApiUrl(API_ENDPOINTS.RETURNS.DETAIL(listCase.id)), { method: 'GET', credentials: 'include' })
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data: ReturnCaseDetail | null) => {
+        if (!cancelled && data) setDetail(data);
+      })
+      .catch((err) => console.error('Failed to fetch case detail:', err));
+    return () => {
+      cancelled = true;
+    };
+  }, [listCase.id, listCase.version]);
+
+  const returnCase: ReturnCaseDetail = detail ?? listCase;
+
   return (
     <div className="fixed inset-0 z-50 flex items-center justify-center p-2 sm:p-4">
       <div className="absolute inset-0 bg-gray-900/50" onClick={onClose} />
@@ -221,6 +243,26 @@ export default function ViewReturnCaseModal({ returnCase, onClose }: ViewReturnC
               </div>
             </div>
           )}
+
+          {/* Recent Actions Section */}
+          {returnCase.recent_actions && returnCase.recent_actions.length > 0 && (
+            <div className="bg-gray-50 rounded-lg p-3 sm:p-6">
+              <h3 className="text-lg font-semibold text-gray-800 mb-4">Son İşlemler</h3>
+              <ul className="space-y-2">
+                {returnCase.recent_actions.map((action) => (
+                  <li key={action.id} className="flex flex-col sm:flex-row sm:items-center sm:justify-between text-sm">
+                    <span className="text-gray-900">
+                      {action.action_type}
+                      {action.additional_info && <span className="text-gray-500"> — {action.additional_info}</span>}
+                    </span>
+                    <span className="text-gray-500">
+                      {action.user_name} · {new Date(action.created_at).toLocaleString('tr-TR')}
+                    </span>
+                  </li>
+                ))}
+              </ul>
+            </div>
+          )}
         </div>
       </div>
     </div>
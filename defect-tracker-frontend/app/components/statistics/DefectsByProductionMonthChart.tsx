@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, LabelList } from "recharts";
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, fetchReport } from '@/lib/api';
 import { ChevronDown, Calendar, RefreshCw } from 'lucide-react';
 
 type Props = Record<string, never>;
@@ -184,7 +184,7 @@ export default function DefectsByProductionMonthChart({}: Props) {
         params.append('service_id', serviceId);
       }
 
-      const res = await fetch(
+      const res = await fetchReport(
         buildApiUrl(API_ENDPOINTS.REPORTS.DEFECTS_BY_PRODUCTION_MONTH) + `?${params.toString()}`,
         {
           credentials: 'include',
@@ -1,6 +1,6 @@
 'use client';
 
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, fetchReport } from '@/lib/api';
 import { useState, useEffect } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, Cell } from 'recharts';
 import { ChevronDown } from 'lucide-react';
@@ -106,7 +106,7 @@ export default function ItemsByCustomerChart({
           params.append('customer_id', customerId);
         }
 
-        const response = await fetch(
+        const response = await fetchReport(
           buildApiUrl(API_ENDPOINTS.REPORTS.ITEMS_BY_CUSTOMER) + `?${params.toString()}`,
           {
             credentials: 'include',
@@ -1,6 +1,6 @@
 'use client';
 
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, fetchReport } from '@/lib/api';
 import { useState, useEffect } from 'react';
 import { PieChart, Pie, Cell, ResponsiveContainer, Tooltip, Legend } from 'recharts';
 
@@ -44,7 +44,7 @@ export default function ProductTypeChart({
         const startDateStr = startDate.toISOString().split('T')[0];
         const endDateStr = endDate.toISOString().split('T')[0];
 
-        const response = await fetch(
+        const response = await fetchReport(
           buildApiUrl(API_ENDPOINTS.REPORTS.PRODUCT_TYPE_STATS) + `?start_date=${startDateStr}&end_date=${endDateStr}`,
           {
             credentials: 'include',
@@ -1,6 +1,6 @@
 'use client';
 
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, fetchReport } from '@/lib/api';
 import { useState, useEffect } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, Cell } from 'recharts';
 import { ChevronDown } from 'lucide-react';
@@ -162,7 +162,7 @@ export default function ProductionDateDistributionChart({
           params.append('service_id', serviceId);
         }
 
-        const response = await fetch(
+        const response = await fetchReport(
           buildApiUrl(API_ENDPOINTS.REPORTS.PRODUCTION_DATE_DISTRIBUTION) + `?${params.toString()}`,
           {
             credentials: 'include',
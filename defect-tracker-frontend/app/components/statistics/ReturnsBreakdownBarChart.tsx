@@ -1,6 +1,6 @@
 'use client';
 
-import { API_ENDPOINTS, buildApiUrl } from '@/lib/api';
+import { API_ENDPOINTS, buildApiUrl, fetchReport } from '@/lib/api';
 import React, { useEffect, useState } from 'react';
 import {
   BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, LabelList, ReferenceLine
@@ -37,7 +37,7 @@ const ReturnsBreakdownBarChart: React.FC<ReturnsBreakdownBarChartProps> = ({
           start_date: startDate ?  startDate.toISOString().split("T")[0] : "",
           end_date: endDate? endDate.toISOString().split("T")[0] : "",
         });
-        const res = await fetch(buildApiUrl(API_ENDPOINTS.REPORTS.RETURNS_BREAKDOWN) + `?${params.toString()}`);
+        const res = await fetchReport(buildApiUrl(API_ENDPOINTS.REPORTS.RETURNS_BREAKDOWN) + `?${params.toString()}`);
         const json = await res.json();
 
         setData(json.data);
@@ -8,6 +8,37 @@ export const buildApiUrl = (endpoint: string): string => {
   return `${API_BASE_URL}/${cleanEndpoint}`;
 };
 
+// If-Match header for editing a return case; the backend answers 409 if the
+// case was changed by someone else since `version` was loaded
+export const caseIfMatchHeader = (returnCase: { id: number; version: number }): Record<string, string> => ({
+  'If-Match': `"${returnCase.id}-${returnCase.version}"`,
+});
+
+// fetch for GET /reports/*: long date ranges are answered with 202 and a job
+// Location, which is long-polled here until the report is ready. The returned
+// Response carries the report itself, as an inline answer would.
+export const fetchReport = async (url: string, init?: RequestInit): Promise<Response> => {
+  const response = await fetch(url, init);
+  if (response.status !== 202) {
+    return response;
+  }
+  const statusUrl = buildApiUrl((await response.json()).status_url);
+  for (;;) {
+    const poll = await fetch(`${statusUrl}?wait=25`, { credentials: init?.credentials });
+    if (poll.status === 202) {
+      continue;
+    }
+    const job = await poll.json();
+    if (!poll.ok || job.status !== 'done') {
+      return new Response(JSON.stringify({ error: job.error || 'Rapor oluşturulamadı' }), {
+        status: poll.ok ? 500 : poll.status,
+        headers: { 'Content-Type': 'application/json' },
+      });
+    }
+    return new Response(JSON.stringify(job.result), { status: 200, headers: { 'Content-Type': 'application/json' } });
+  }
+};
+
 // Common API endpoints
 export const API_ENDPOINTS = {
   AUTH: {
@@ -25,11 +56,13 @@ export const API_ENDPOINTS = {
     TOGGLE_EMAIL_NOTIFICATIONS: '/admin/toggle-email-notifications',
   },
   CUSTOMERS: '/customers',
+  CUSTOMER_SUGGEST: '/customers/suggest',
   PRODUCTS: '/products',
   SERVICES: '/services',
   RETURNS: {
     BASE: '/returns',
     SIMPLE: '/returns/simple',
+    DETAIL: (id: number | string) => `/returns/${id}`,
     TAMAMLANDI: (id: string) => `/returns/${id}/tamamlandi`,
     KARGOYA_VERILDI: (id: string) => `/returns/${id}/kargoya-verildi`,
     TEKNIK_INCELEME: (id: string) => `/returns/${id}/teknik-inceleme`,
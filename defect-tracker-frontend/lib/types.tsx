@@ -84,6 +84,7 @@ export interface FullReturnCaseItem {
 
 export interface FullReturnCase {
     id: number;
+    version: number;
     status: string;
     arrival_date: string;
     receipt_method: string;
@@ -107,6 +108,12 @@ export interface FullReturnCase {
     shipping_date: string | null;
 }
 
+// GET /returns/<id>: the full case plus its newest action log entries
+// (omitted for roles that cannot see the action log)
+export interface ReturnCaseDetail extends FullReturnCase {
+    recent_actions?: UserActionLog[];
+}
+
 export type ProductType = 'Aşırı Yük Sensörü' | 'Fotosel' | 'Kontrol Ünitesi';
 
 export interface ProductModel {